@@ -1,17 +1,30 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Awaitable
+import asyncio
+import functools
+import json
+import logging
 import httpx
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
 
 from .base import BaseAgent, AgentResponse
-from ..services.openapi import OpenAPIService
+from ..services.http_cache import HTTPResponseCache
+from ..services.param_binder import ParameterBinder
+from ..services.response_compactor import ResponseCompactor
 from ..config.settings import settings
+from ..core import deadline
+from ..core.registry import get_endpoint_catalogue
+
+logger = logging.getLogger(__name__)
 
 class APIAgent(BaseAgent):
     def __init__(self):
         super().__init__()
-        self.openapi_service = OpenAPIService()
-        self.client = httpx.Client(timeout=30.0)
+        self.timeout = 30.0
+        self.client = httpx.Client(timeout=self.timeout)
+        self.response_cache = HTTPResponseCache()
+        self.param_binder = ParameterBinder()
+        self.response_compactor = ResponseCompactor()
         
         # Create specialized prompts
         self.api_prompt = self._create_prompt(
@@ -23,18 +36,30 @@ class APIAgent(BaseAgent):
         )
         
         self.param_prompt = self._create_prompt(
-            "Extract the necessary parameters for this API call from the query:"
+            "Extract the parameters for each of these API endpoints from the query."
+            " Leave out parameters the query does not provide."
             "\n\nQuery: {query}"
-            "\n\nEndpoint: {endpoint}"
-            "\n\nRequired parameters: {parameters}"
-            "\n\nReturn a JSON object with the extracted parameters."
+            "\n\nEndpoints: {endpoints}"
         )
     
-    async def process(self, query: str, context: Dict[str, Any] = None) -> AgentResponse:
+    @property
+    def openapi_service(self):
+        """Shared parsed endpoint catalogue."""
+        return get_endpoint_catalogue()
+    
+    async def process(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        prefetched: Optional[Dict[str, Awaitable]] = None
+    ) -> AgentResponse:
         """Process the query and interact with relevant APIs."""
         try:
-            # Search for relevant endpoints
-            endpoints = self.openapi_service.search_endpoints(query)
+            # Search for relevant endpoints, unless the orchestrator already did
+            endpoints = await self._prefetched(prefetched, "endpoints")
+            if endpoints is None:
+                endpoints = self.openapi_service.search_endpoints(query)
+            endpoints = endpoints[:settings.API_MAX_CANDIDATE_ENDPOINTS]
             
             if not endpoints:
                 return AgentResponse(
@@ -43,33 +68,32 @@ class APIAgent(BaseAgent):
                     confidence=1.0
                 )
             
+            # Extract parameters for all endpoints in one call
+            bound_params = await self._extract_parameters(query, endpoints)
+            
             # Process each endpoint
             api_responses = []
-            for endpoint_info in endpoints:
+            for endpoint_info, params in zip(endpoints, bound_params):
                 endpoint = endpoint_info["endpoint"]
                 
-                # Extract parameters
-                param_chain = LLMChain(llm=self.llm, prompt=self.param_prompt)
-                params = param_chain.invoke({
-                    "query": query,
-                    "endpoint": endpoint,
-                    "parameters": endpoint.get("parameters", [])
-                })
+                if params is None:
+                    continue
                 
                 try:
-                    # Make API call
-                    response = self._make_api_call(
+                    # Make API call off the event loop, bounded by the request deadline
+                    response = await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                        self._make_api_call,
                         endpoint["url"],
                         endpoint["method"],
-                        params
-                    )
+                        params,
+                        ttl=self.response_cache.ttl_for(endpoint_info),
+                        endpoint=endpoint,
+                        timeout=deadline.timeout(self.timeout)
+                    ))
                     
-                    api_responses.append({
-                        "endpoint": endpoint,
-                        "response": response
-                    })
+                    api_responses.append(self._compact_response(query, endpoint, response))
                 except Exception as e:
-                    print(f"Error calling API {endpoint['url']}: {e}")
+                    logger.error(f"Error calling API {endpoint['url']}: {e}")
                     continue
             
             if not api_responses:
@@ -81,17 +105,17 @@ class APIAgent(BaseAgent):
             
             # Generate response using LLM
             api_chain = LLMChain(llm=self.llm, prompt=self.api_prompt)
-            response = api_chain.invoke({
+            response = await api_chain.ainvoke({
                 "query": query,
                 "context": context or {},
                 "endpoints": api_responses
             })
             
             # Calculate confidence
-            confidence = self._calculate_confidence(response["text"], context or {})
+            confidence = await self._calculate_confidence(response["text"], context or {})
             
             # Mask PII
-            masked_response = self._mask_pii(response["text"])
+            masked_response = await self._mask_pii(response["text"])
             
             return AgentResponse(
                 success=True,
@@ -111,9 +135,125 @@ class APIAgent(BaseAgent):
                 error=str(e)
             )
     
-    def _make_api_call(self, url: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make an API call with the given parameters."""
+    def _compact_response(self, query: str, endpoint: Dict[str, Any], response: Any) -> Dict[str, Any]:
+        """An API result as it goes into prompts: the endpoint in brief and the response compacted."""
+        brief = {"method": endpoint["method"], "url": endpoint["url"], "summary": endpoint["summary"]}
+        if not settings.API_COMPACT_RESPONSES:
+            return {"endpoint": brief, "response": response}
+        
+        text, report = self.response_compactor.compact(query, response, self.openapi_service.response_schema(endpoint))
+        logger.info(
+            f"Compacted {endpoint['method']} {endpoint['path']} response from {report['tokens_before']} "
+            f"to {report['tokens_after']} tokens"
+        )
+        return {"endpoint": brief, "response": text, "compaction": report}
+    
+    async def _extract_parameters(self, query: str, endpoints: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Extract parameters for all candidate endpoints.
+        
+        Parameters are bound locally from their schemas first; endpoints with
+        required parameters still unbound share a single LLM extraction call.
+        Returns validated parameters per endpoint, or None where the extracted
+        parameters do not satisfy the endpoint's schema.
+        """
+        schemas = [
+            self.openapi_service.build_parameter_schema(endpoint_info["endpoint"])
+            for endpoint_info in endpoints
+        ]
+        
+        # Fast path: bind simple parameters without the LLM
+        local_params = []
+        pending = []
+        for i, schema in enumerate(schemas):
+            bound, unbound = self.param_binder.bind(query, schema)
+            local_params.append(bound)
+            if unbound:
+                pending.append(i)
+        
+        arguments = await self._extract_parameters_with_llm(query, endpoints, schemas, pending) if pending else {}
+        if not isinstance(arguments, dict):
+            logger.error(f"Expected an object of extracted parameters, got {arguments!r}")
+            arguments = {}
+        
+        # Validate locally against each endpoint's schema
+        bound_params = []
+        for i, (endpoint_info, schema) in enumerate(zip(endpoints, schemas)):
+            # Where the LLM was asked, its values win over local guesses
+            extracted = arguments.get(f"endpoint_{i}", {})
+            # A malformed value fails validation for this endpoint only
+            params = {**local_params[i], **extracted} if isinstance(extracted, dict) else extracted
+            params, errors = self.openapi_service.validate_parameters(schema, params)
+            if errors:
+                logger.warning(f"Skipping API {endpoint_info['endpoint']['url']}: {'; '.join(errors)}")
+                bound_params.append(None)
+            else:
+                bound_params.append(params)
+        
+        return bound_params
+    
+    async def _extract_parameters_with_llm(
+        self,
+        query: str,
+        endpoints: List[Dict[str, Any]],
+        schemas: List[Dict[str, Any]],
+        pending: List[int]
+    ) -> Dict[str, Any]:
+        """Extract parameters for the pending endpoints with a single structured LLM call."""
+        # One function argument per endpoint, each typed by its OpenAPI schema
+        properties = {}
+        summaries = []
+        for i in pending:
+            endpoint = endpoints[i]["endpoint"]
+            description = f"{endpoint['method']} {endpoint['path']}: {endpoint['summary'] or endpoint['description']}"
+            properties[f"endpoint_{i}"] = {**schemas[i], "description": description}
+            summaries.append(f"endpoint_{i}: {description}")
+        
+        function = {
+            "name": "bind_parameters",
+            "description": "Bind query values to the parameters of each candidate API endpoint.",
+            "parameters": {
+                "type": "object",
+                "properties": properties
+            }
+        }
+        
+        param_chain = self.param_prompt | self.llm.bind(
+            functions=[function],
+            function_call={"name": function["name"]}
+        )
+        extraction = await param_chain.ainvoke({
+            "query": query,
+            "endpoints": "\n".join(summaries)
+        })
+        
+        try:
+            return json.loads(extraction.additional_kwargs["function_call"]["arguments"])
+        except (KeyError, json.JSONDecodeError) as e:
+            logger.error(f"Error parsing extracted parameters: {e}")
+            return {}
+    
+    def _make_api_call(
+        self,
+        url: str,
+        method: str,
+        params: Dict[str, Any],
+        ttl: int = None,
+        endpoint: Dict[str, Any] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Make an API call with the given parameters, served from cache when possible."""
         headers = {}
+        params = dict(params)
+        body = params.pop("body", None)
+        
+        # Route path and header parameters to where the endpoint expects them
+        for param in (endpoint or {}).get("parameters", []):
+            if param.get("name") not in params:
+                continue
+            if param.get("in") == "path":
+                url = url.replace(f"{{{param['name']}}}", str(params.pop(param["name"])))
+            elif param.get("in") == "header":
+                headers[param["name"]] = str(params.pop(param["name"]))
         
         # Add API keys if needed
         if "weather" in url and settings.WEATHER_API_KEY:
@@ -121,13 +261,14 @@ class APIAgent(BaseAgent):
         elif "maps" in url and settings.MAPS_API_KEY:
             headers["Authorization"] = f"Bearer {settings.MAPS_API_KEY}"
         
-        # Make request
-        response = self.client.request(
+        # Make request through the response cache
+        return self.response_cache.request(
+            self.client,
             method=method,
             url=url,
             params=params,
-            headers=headers
-        )
-        response.raise_for_status()
-        
-        return response.json() 
\ No newline at end of file
+            headers=headers,
+            json_body=body,
+            default_ttl=ttl,
+            timeout=timeout
+        ) 
\ No newline at end of file
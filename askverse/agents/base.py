@@ -1,11 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-from langchain.chat_models import ChatOpenAI
+from typing import Dict, Any, List, Optional, Awaitable
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel
 
 from ..config.settings import settings
+from ..core.registry import get_llm
 
 class AgentResponse(BaseModel):
     """Base response model for all agents."""
@@ -16,18 +16,37 @@ class AgentResponse(BaseModel):
 
 class BaseAgent(ABC):
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=0.0,
-            api_key=settings.OPENAI_API_KEY
-        )
         self.output_parser = PydanticOutputParser(pydantic_object=AgentResponse)
     
+    @property
+    def llm(self):
+        """Shared LLM client, built on first use."""
+        return get_llm()
+    
     @abstractmethod
-    async def process(self, query: str, context: Dict[str, Any] = None) -> AgentResponse:
-        """Process the query and return a response."""
+    async def process(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        prefetched: Optional[Dict[str, Awaitable]] = None
+    ) -> AgentResponse:
+        """Process the query and return a response.
+        
+        ``prefetched`` holds lookups on the raw query that the orchestrator
+        started speculatively; agents use them instead of repeating the work.
+        """
         pass
     
+    async def _prefetched(self, prefetched: Optional[Dict[str, Awaitable]], key: str) -> Any:
+        """Result of a speculative lookup, or None if it was not started or failed."""
+        future = (prefetched or {}).get(key)
+        if future is None:
+            return None
+        try:
+            return await future
+        except Exception:
+            return None
+    
     def _create_prompt(self, template: str) -> ChatPromptTemplate:
         """Create a chat prompt template."""
         return ChatPromptTemplate.from_messages([
@@ -35,7 +54,7 @@ class BaseAgent(ABC):
             ("user", template)
         ])
     
-    def _calculate_confidence(self, response: str, context: Dict[str, Any]) -> float:
+    async def _calculate_confidence(self, response: str, context: Dict[str, Any]) -> float:
         """Calculate confidence score for the response."""
         # This is a simple implementation - can be enhanced with more sophisticated methods
         confidence_prompt = self._create_prompt(
@@ -43,7 +62,7 @@ class BaseAgent(ABC):
         )
         
         confidence_chain = confidence_prompt | self.llm
-        confidence_response = confidence_chain.invoke({"response": response})
+        confidence_response = await confidence_chain.ainvoke({"response": response})
         
         try:
             # Extract numeric value from response
@@ -52,13 +71,13 @@ class BaseAgent(ABC):
         except ValueError:
             return 0.5  # Default confidence if parsing fails
     
-    def _mask_pii(self, text: str) -> str:
+    async def _mask_pii(self, text: str) -> str:
         """Mask Personally Identifiable Information in the text."""
         pii_prompt = self._create_prompt(
             "Mask any Personally Identifiable Information (PII) in this text: {text}"
         )
         
         pii_chain = pii_prompt | self.llm
-        masked_text = pii_chain.invoke({"text": text})
+        masked_text = await pii_chain.ainvoke({"text": text})
         
         return masked_text.content.strip() 
\ No newline at end of file
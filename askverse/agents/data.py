@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Awaitable
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
 
@@ -24,7 +24,12 @@ class DataAgent(BaseAgent):
             "\n\nProvide a comprehensive answer that combines all relevant information."
         )
     
-    async def process(self, query: str, context: Dict[str, Any] = None) -> AgentResponse:
+    async def process(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        prefetched: Optional[Dict[str, Awaitable]] = None
+    ) -> AgentResponse:
         """Process and transform data from various sources."""
         try:
             # Get data sources from context
@@ -43,7 +48,7 @@ class DataAgent(BaseAgent):
                 # Transform data if needed
                 if source.get("needs_transform", False):
                     transform_chain = LLMChain(llm=self.llm, prompt=self.transform_prompt)
-                    transformed_data = transform_chain.invoke({
+                    transformed_data = await transform_chain.ainvoke({
                         "data": source["data"],
                         "requirements": source.get("requirements", {})
                     })
@@ -52,18 +57,19 @@ class DataAgent(BaseAgent):
                 processed_sources.append(source)
             
             # Aggregate results
+            # The sources are in the prompt already; don't repeat them as context
             aggregate_chain = LLMChain(llm=self.llm, prompt=self.aggregate_prompt)
-            response = aggregate_chain.invoke({
+            response = await aggregate_chain.ainvoke({
                 "sources": processed_sources,
                 "query": query,
-                "context": context or {}
+                "context": {key: value for key, value in context.items() if key != "data_sources"}
             })
             
             # Calculate confidence
-            confidence = self._calculate_confidence(response["text"], context or {})
+            confidence = await self._calculate_confidence(response["text"], context or {})
             
             # Mask PII
-            masked_response = self._mask_pii(response["text"])
+            masked_response = await self._mask_pii(response["text"])
             
             return AgentResponse(
                 success=True,
@@ -1,10 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Awaitable, Tuple
+import asyncio
+import logging
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
 
 from .base import BaseAgent, AgentResponse
+from ..config.settings import settings
 from ..services.vector_store import VectorStore
 from ..services.confluence import ConfluenceService
+from ..core import deadline
+
+logger = logging.getLogger(__name__)
 
 class DocumentAgent(BaseAgent):
     def __init__(self):
@@ -21,14 +27,26 @@ class DocumentAgent(BaseAgent):
             "\n\nProvide a comprehensive answer based on the documents."
         )
     
-    async def process(self, query: str, context: Dict[str, Any] = None) -> AgentResponse:
+    async def process(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        prefetched: Optional[Dict[str, Awaitable]] = None
+    ) -> AgentResponse:
         """Process the query and search for relevant documents."""
         try:
-            # Search in vector store
-            vector_results = self.vector_store.search(query, top_k=5)
-            
-            # Search in Confluence
-            confluence_results = await self.confluence.search_pages(query)
+            # A follow-up in a session may be answerable from documents retrieved earlier
+            session_documents = await self._prefetched(prefetched, "session_documents")
+            if session_documents:
+                sources, skipped_sources = {"vector_store": session_documents}, {}
+            else:
+                # Search both sources concurrently; answer from whichever return in time
+                sources, skipped_sources = await self._retrieve({
+                    "vector_store": (self._search_vectors(query, prefetched), settings.DOCUMENT_VECTOR_TIMEOUT),
+                    "confluence": (self.confluence.search_pages(query), settings.DOCUMENT_CONFLUENCE_TIMEOUT),
+                })
+            vector_results = sources.get("vector_store", [])
+            confluence_results = sources.get("confluence", [])
             
             # Combine results
             all_documents = []
@@ -36,8 +54,9 @@ class DocumentAgent(BaseAgent):
             # Process vector store results
             for result in vector_results:
                 doc = {
+                    "id": result["id"],
                     "source": "vector_store",
-                    "content": result["metadata"]["content"],
+                    "content": None,  # fetched below for the hits we keep
                     "title": result["metadata"].get("title", ""),
                     "url": result["metadata"].get("url", ""),
                     "relevance_score": result["score"]
@@ -57,26 +76,36 @@ class DocumentAgent(BaseAgent):
             
             # Sort by relevance score
             all_documents.sort(key=lambda x: x["relevance_score"], reverse=True)
+            all_documents = all_documents[:settings.DOCUMENT_CONTEXT_LIMIT]
+            
+            # Fetch text only for the vector hits that made the cut
+            kept = [result for result in vector_results if any(doc.get("id") == result["id"] for doc in all_documents)]
+            contents = self.vector_store.fetch_contents(kept)
+            for doc in all_documents:
+                if doc["source"] == "vector_store":
+                    doc["content"] = contents.get(doc["id"], "")
             
             # Generate response using LLM
             search_chain = LLMChain(llm=self.llm, prompt=self.search_prompt)
-            response = search_chain.invoke({
+            response = await search_chain.ainvoke({
                 "query": query,
                 "context": context or {},
                 "documents": all_documents
             })
             
             # Calculate confidence
-            confidence = self._calculate_confidence(response["text"], context or {})
+            confidence = await self._calculate_confidence(response["text"], context or {})
             
             # Mask PII
-            masked_response = self._mask_pii(response["text"])
+            masked_response = await self._mask_pii(response["text"])
             
             return AgentResponse(
                 success=True,
                 data={
                     "response": masked_response,
                     "documents": all_documents,
+                    "skipped_sources": skipped_sources,
+                    "reused_session_documents": bool(session_documents),
                     "confidence": confidence
                 },
                 confidence=confidence
@@ -88,4 +117,44 @@ class DocumentAgent(BaseAgent):
                 data={},
                 confidence=0.0,
                 error=str(e)
-            ) 
\ No newline at end of file
+            ) 
+    
+    async def _search_vectors(self, query: str, prefetched: Optional[Dict[str, Awaitable]]) -> List[Dict[str, Any]]:
+        """Vector search, reusing the orchestrator's speculative search when it ran one."""
+        vector_results = await self._prefetched(prefetched, "vector_results")
+        if vector_results is None:
+            vector_results = await self.vector_store.asearch(query, top_k=5)
+        return vector_results
+    
+    async def _retrieve(self, sources: Dict[str, Tuple[Awaitable, float]]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Run retrievals concurrently, each within its own timeout and the request deadline.
+        
+        Returns the results of the sources that succeeded and, for the others,
+        why they were skipped.
+        """
+        async def run(search: Awaitable, timeout: float) -> Any:
+            try:
+                return await asyncio.wait_for(search, deadline.timeout(timeout))
+            except deadline.DeadlineExceeded:
+                if asyncio.iscoroutine(search):
+                    search.close()
+                raise
+        
+        names = list(sources)
+        outcomes = await asyncio.gather(
+            *(run(search, timeout) for search, timeout in sources.values()),
+            return_exceptions=True
+        )
+        
+        results, skipped = {}, {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, (asyncio.TimeoutError, deadline.DeadlineExceeded)):
+                skipped[name] = "timeout"
+            elif isinstance(outcome, Exception):
+                skipped[name] = f"error: {outcome}"
+            else:
+                results[name] = outcome
+                continue
+            logger.warning(f"Skipping {name} results: {skipped[name]}")
+        
+        return results, skipped
\ No newline at end of file
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+
+from ..config.settings import settings
+from ..core.auth import get_current_active_user
+from ..core.registry import get_job_queue
+from ..models.user import User
+from ..services.job_queue import JobQueueFull, COMPLETED, FAILED
+from .query import QueryRequest, QueryResponse
+from .responses import FastJSONResponse, shape_result
+
+router = APIRouter()
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    wait_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+async def _get_job(job_id: str, current_user: User) -> Dict[str, Any]:
+    """The current user's job, or 404 when unknown, expired or someone else's."""
+    job = await get_job_queue().get(job_id)
+    if job is None or job.get("user_id") != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found or expired")
+    return job
+
+
+def _job_response(job: Dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        submitted_at=job["submitted_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        wait_seconds=job.get("wait_seconds"),
+        run_seconds=job.get("run_seconds"),
+        error=job.get("error")
+    )
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    request: QueryRequest,
+    current_user: User = Depends(get_current_active_user)
+) -> JobResponse:
+    """Queue a query for a worker; poll the job, then fetch its result."""
+    if request.session_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sessions are not supported for jobs")
+    timeout = min(request.timeout or settings.QUERY_DEFAULT_TIMEOUT, settings.QUERY_MAX_TIMEOUT)
+    queue = get_job_queue()
+    try:
+        job_id = await queue.submit(request.query, request.context, timeout=timeout, user_id=current_user.id)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(settings.JOB_RETRY_AFTER)}
+        )
+    return _job_response(await queue.get(job_id))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> JobResponse:
+    """State and timings of a job."""
+    return _job_response(await _get_job(job_id, current_user))
+
+
+@router.get("/{job_id}/result")
+async def job_result(
+    job_id: str,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+) -> FastJSONResponse:
+    """The orchestrator's result of a finished job; 409 while it is still queued or running.
+    
+    ``view`` and ``fields`` shape the result as for ``POST /query``.
+    """
+    job = await _get_job(job_id, current_user)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=job.get("error"))
+    if job["status"] != COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job['status']}",
+            headers={"Retry-After": str(settings.JOB_RETRY_AFTER)}
+        )
+    return FastJSONResponse(shape_result(
+        {"job_id": job["id"], **job["result"]},
+        view,
+        fields,
+        allowed={"job_id", *QueryResponse.model_fields}
+    ))
\ No newline at end of file
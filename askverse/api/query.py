@@ -0,0 +1,199 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..core.auth import get_current_active_user
+from ..core.batch import BatchQueryRunner
+from ..core.registry import get_orchestrator, get_session_store
+from ..db.session import get_db
+from ..models.query import Query
+from ..models.user import User
+from ..services.query_log import query_metadata
+from .responses import FastJSONResponse, dumps, shape_result
+from .sessions import get_user_session
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class QueryRequest(BaseModel):
+    query: str
+    context: Dict[str, Any] = {}
+    timeout: Optional[float] = Field(None, gt=0, description="Time budget in seconds")
+    session_id: Optional[str] = None  # from POST /sessions, for follow-up questions
+
+
+class BatchQueryItem(BaseModel):
+    query: str
+    id: Optional[str] = None  # echoed back to match results to queries
+
+
+class BatchQueryRequest(BaseModel):
+    queries: List[BatchQueryItem] = Field(..., min_length=1)
+    context: Dict[str, Any] = {}
+    timeout: Optional[float] = Field(None, gt=0, description="Time budget per query in seconds")
+
+
+class QueryResponse(BaseModel):
+    query_id: Optional[int] = None
+    session_id: Optional[str] = None
+    success: bool
+    response: Optional[str] = None
+    confidence: float = 0.0
+    sub_tasks: List[Dict[str, Any]] = []
+    sources: List[Dict[str, Any]] = []  # documents and endpoints behind the answer
+    routing: Dict[str, Any] = {}
+    partial: bool = False
+    timed_out: List[str] = []
+    processing_time: float
+    error: Optional[str] = None
+
+
+@router.post("/query", response_model=QueryResponse)
+async def process_query(
+    request: QueryRequest,
+    background_tasks: BackgroundTasks,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> FastJSONResponse:
+    """Process a natural language query within the client's (or the default) time budget.
+    
+    With a session_id, the conversation so far is passed along as context and
+    the follow-up may be answered from documents retrieved earlier.
+    
+    ``view`` is ``lean`` (sub-task answers with source references) or
+    ``full`` (each agent's data); ``fields`` selects dotted paths, e.g.
+    ``response,confidence,sources.url``.
+    """
+    timeout = min(request.timeout or settings.QUERY_DEFAULT_TIMEOUT, settings.QUERY_MAX_TIMEOUT)
+
+    started = time.perf_counter()
+    context, prefetched = request.context, None
+    if request.session_id:
+        sessions = get_session_store()
+        session = await get_user_session(request.session_id, current_user)
+        context = {**request.context, **sessions.context(session)}
+        reused = await sessions.reuse(session, request.query)
+        if reused is not None:
+            prefetched = {"session_documents": asyncio.get_running_loop().create_future()}
+            prefetched["session_documents"].set_result(reused)
+    
+    result = await get_orchestrator().process_query(request.query, context, timeout=timeout, prefetched=prefetched)
+    processing_time = time.perf_counter() - started
+    
+    # Update the session after responding; summarising older turns may call the LLM
+    if request.session_id:
+        background_tasks.add_task(get_session_store().record_turn, request.session_id, request.query, result)
+
+    query = Query(
+        query_text=request.query,
+        response_text=result.get("response"),
+        confidence_score=result.get("confidence", 0.0),
+        processing_time=processing_time,
+        user_id=current_user.id,
+        query_metadata=query_metadata(result, timeout)
+    )
+    db.add(query)
+    db.commit()
+
+    # Built as a plain dict: validating large agent data through the model costs more than encoding it
+    content = {
+        "query_id": query.id,
+        "session_id": request.session_id,
+        "success": result["success"],
+        "response": result.get("response"),
+        "confidence": result.get("confidence", 0.0),
+        "sub_tasks": result.get("sub_tasks", []),
+        "routing": result.get("routing", {}),
+        "partial": result.get("partial", False),
+        "timed_out": result.get("timed_out", []),
+        "processing_time": round(processing_time, 3),
+        "error": result.get("error")
+    }
+    return FastJSONResponse(shape_result(content, view, fields, allowed=QueryResponse.model_fields))
+
+
+@router.post("/query/batch")
+async def process_query_batch(
+    request: BatchQueryRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """Process many queries with shared embedding and retrieval, streaming NDJSON in completion order.
+    
+    Each line is a result for one submitted query (duplicates included, marked
+    as such); the last line is a summary of the batch.
+    """
+    if len(request.queries) > settings.BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BATCH_MAX_QUERIES} queries per batch"
+        )
+    
+    timeout = min(request.timeout or settings.QUERY_DEFAULT_TIMEOUT, settings.QUERY_MAX_TIMEOUT)
+    runner = BatchQueryRunner(get_orchestrator())
+    items = [item.model_dump() for item in request.queries]
+    
+    async def stream() -> AsyncIterator[str]:
+        try:
+            async for line in runner.run(items, request.context, timeout=timeout):
+                result = line.pop("result", None)
+                if result is not None and not line["duplicate"]:
+                    db.add(Query(
+                        query_text=line["query"],
+                        response_text=line["response"],
+                        confidence_score=line["confidence"],
+                        processing_time=line["processing_time"],
+                        user_id=current_user.id,
+                        query_metadata={**query_metadata(result, timeout), "batch": True}
+                    ))
+                yield dumps(line) + b"\n"
+        finally:
+            # Log the queries answered so far even if the client disconnected or the batch failed
+            try:
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error logging batch queries: {str(e)}")
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/queries")
+async def query_history(
+    limit: int = 20,
+    offset: int = 0,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """The current user's queries, most recent first."""
+    queries = (
+        db.query(Query)
+        .filter(Query.user_id == current_user.id)
+        .order_by(Query.id.desc())
+        .offset(offset)
+        .limit(min(limit, 100))
+        .all()
+    )
+    return [
+        {
+            "id": query.id,
+            "query": query.query_text,
+            "response": query.response_text,
+            "confidence": query.confidence_score,
+            "processing_time": query.processing_time,
+            "created_at": query.created_at,
+            "partial": (query.query_metadata or {}).get("partial", False)
+        }
+        for query in queries
+    ]
\ No newline at end of file
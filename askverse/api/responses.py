@@ -0,0 +1,135 @@
+from typing import Any, Dict, Iterable, List, Optional
+import json
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+from ..config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library encoder is the fallback
+    orjson = None
+
+VIEWS = ("lean", "full")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON, encoded with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=str, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with ``dumps``.
+
+    Endpoints returning one directly also skip FastAPI's response model
+    validation and ``jsonable_encoder`` pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _sources(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """References to the documents and API endpoints an agent's answer used."""
+    sources = [
+        {key: document[key] for key in ("id", "source", "title", "url", "relevance_score") if document.get(key) is not None}
+        for document in response.get("documents", [])
+    ]
+    sources.extend(
+        {
+            "source": "api",
+            "title": api_response["endpoint"].get("summary"),
+            "url": f"{api_response['endpoint']['method']} {api_response['endpoint']['url']}"
+        }
+        for api_response in response.get("api_responses", [])
+    )
+    return sources
+
+
+def parse_fields(fields: str, allowed: Iterable[str]) -> Dict[str, Any]:
+    """A projection tree from dotted paths, e.g. ``response,confidence,sources.url``.
+
+    Leaves are None, meaning the whole value; paths under a leaf are ignored.
+    """
+    tree: Dict[str, Any] = {}
+    for path in fields.split(","):
+        names = [name for name in path.strip().split(".") if name]
+        if not names:
+            continue
+        node = tree
+        for name in names[:-1]:
+            child = node.setdefault(name, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[names[-1]] = None
+
+    unknown = set(tree) - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return tree
+
+
+def project(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    """The parts of a value selected by a projection tree; lists are projected item by item."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: project(value[name], subtree) for name, subtree in tree.items() if name in value}
+    return value
+
+
+def shape_result(
+    result: Dict[str, Any],
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    allowed: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Shape a query result for the client.
+
+    Every view gets ``sources``: references to the documents and endpoints
+    behind the answer, deduplicated across sub-tasks. The ``lean`` view
+    reduces each sub-task to its answer and sources; ``full`` keeps each
+    agent's data, with document bodies and raw API responses. ``fields``
+    then selects dotted paths out of the result, checked against ``allowed``
+    top-level names.
+    """
+    view = view or settings.QUERY_RESPONSE_VIEW
+    if view not in VIEWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"view must be one of: {', '.join(VIEWS)}"
+        )
+
+    sub_tasks, sources, seen = [], [], set()
+    for sub_task in result.get("sub_tasks", []):
+        task_sources = _sources(sub_task["response"])
+        for source in task_sources:
+            key = source.get("url") or source.get("id")
+            if key not in seen:
+                seen.add(key)
+                sources.append(source)
+        if view == "lean":
+            sub_tasks.append({
+                "task": sub_task["task"],
+                "agent": sub_task["agent"],
+                "response": sub_task["response"].get("response"),
+                "confidence": sub_task["confidence"],
+                "sources": task_sources
+            })
+        else:
+            sub_tasks.append(sub_task)
+
+    shaped = {**result, "sub_tasks": sub_tasks, "sources": sources}
+    if fields:
+        return project(shaped, parse_fields(fields, allowed if allowed is not None else shaped))
+    return shaped
\ No newline at end of file
@@ -1 +1,11 @@
- 
\ No newline at end of file
+from fastapi import APIRouter
+
+from . import jobs, query, sessions, status, webhooks
+
+router = APIRouter()
+
+router.include_router(query.router, tags=["queries"])
+router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
+router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+router.include_router(status.router, prefix="/status", tags=["status"])
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ..core.auth import get_current_active_user
+from ..core.registry import get_session_store
+from ..models.user import User
+
+router = APIRouter()
+
+
+async def get_user_session(session_id: str, current_user: User) -> Dict[str, Any]:
+    """The current user's session, or 404 when unknown, expired or someone else's."""
+    session = await get_session_store().get(session_id)
+    if session is None or session["user_id"] != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found or expired")
+    return session
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_session(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Start a conversation; pass its id as session_id with each query."""
+    session = await get_session_store().create(current_user.id)
+    return {"session_id": session["id"], "created_at": session["created_at"]}
+
+
+@router.get("/{session_id}")
+async def get_session(session_id: str, current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """A session's summary, recent turns and cached retrieval counts."""
+    session = await get_user_session(session_id, current_user)
+    return {
+        "session_id": session["id"],
+        "created_at": session["created_at"],
+        "updated_at": session["updated_at"],
+        "summary": session["summary"],
+        "turns": session["turns"],
+        "cached_documents": len(session["candidates"]),
+        "cached_api_results": len(session["api_results"])
+    }
+
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_session(session_id: str, current_user: User = Depends(get_current_active_user)) -> None:
+    """End a conversation and forget its state."""
+    await get_user_session(session_id, current_user)
+    await get_session_store().delete(session_id)
\ No newline at end of file
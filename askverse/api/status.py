@@ -0,0 +1,75 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..core.auth import get_current_active_user, get_profiling_user
+from ..core.profiling import get_loop_block_detector
+from ..core.registry import get_job_queue, get_orchestrator, get_profile_store, get_query_router, get_retrieval_cache, get_session_store
+from ..models.user import User
+
+router = APIRouter()
+
+
+@router.get("/routing")
+async def routing_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Query router counters, accuracy against LLM decompositions and latency saved."""
+    return get_query_router().status()
+
+@router.get("/parameters")
+async def parameter_binding_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """How often API parameters were bound from the query without the LLM in this server worker."""
+    return get_orchestrator().api_agent.param_binder.status()
+
+@router.get("/compaction")
+async def compaction_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Tokens saved by compacting API responses in this server worker."""
+    return get_orchestrator().api_agent.response_compactor.status()
+
+
+@router.get("/sessions")
+async def session_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """How often follow-ups reused cached documents, and summaries written, in this server worker."""
+    return get_session_store().status()
+
+
+@router.get("/cache")
+async def retrieval_cache_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Retrieval cache hits in this server worker, the index generation and the latest warm-up report."""
+    return await get_retrieval_cache().status()
+
+
+@router.get("/jobs")
+async def job_queue_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Job queue depth, running jobs, recent wait times and totals."""
+    return await get_job_queue().stats()
+
+@router.get("/profiles")
+async def list_profiles(current_user: User = Depends(get_profiling_user)) -> List[str]:
+    """Ids of stored request profiles, newest first."""
+    return get_profile_store().list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, current_user: User = Depends(get_profiling_user)) -> str:
+    """A request profile as collapsed stacks, ready for flamegraph.pl or speedscope."""
+    collapsed = get_profile_store().get(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return collapsed
+
+
+@router.get("/loop")
+async def loop_blocking_status(current_user: User = Depends(get_profiling_user)) -> Dict[str, Any]:
+    """Event loop stalls seen by this server worker, with recent blocking stacks."""
+    detector = get_loop_block_detector()
+    if detector is None:
+        return {"running": False}
+    return detector.status()
+
+
+@router.get("/loop/collapsed", response_class=PlainTextResponse)
+async def loop_blocking_stacks(current_user: User = Depends(get_profiling_user)) -> str:
+    """Stacks that blocked this server worker's event loop, as collapsed stacks."""
+    detector = get_loop_block_detector()
+    return detector.collapsed() if detector is not None else ""
\ No newline at end of file
@@ -0,0 +1,88 @@
+from typing import Any, Dict, Optional, Union
+import hashlib
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from pydantic import BaseModel
+
+from ..config.settings import settings
+from ..core.auth import get_current_active_user
+from ..core.registry import get_reindex_queue
+from ..models.user import User
+from ..services.reindex_queue import UPDATE, REMOVE
+
+router = APIRouter()
+
+# Confluence webhook events and the reindex action they trigger
+PAGE_EVENTS = {
+    "page_created": UPDATE,
+    "page_updated": UPDATE,
+    "page_restored": UPDATE,
+    "page_moved": UPDATE,
+    "page_removed": REMOVE,
+    "page_trashed": REMOVE,
+}
+
+
+class WebhookPage(BaseModel):
+    id: Union[int, str]
+    spaceKey: Optional[str] = None
+    title: Optional[str] = None
+
+
+class PageEvent(BaseModel):
+    event: Optional[str] = None
+    webhookEvent: Optional[str] = None  # Confluence Server naming
+    timestamp: Optional[int] = None
+    page: WebhookPage
+
+
+async def verify_webhook_secret(
+    request: Request,
+    x_hub_signature: Optional[str] = Header(None),
+    x_webhook_secret: Optional[str] = Header(None)
+) -> None:
+    """Check the body's HMAC signature, or the shared secret in a header.
+
+    Confluence signs webhook bodies with the secret as
+    ``X-Hub-Signature: sha256=<hex digest>``. The secret is never accepted in
+    the URL, where it would end up in access logs.
+    """
+    secret = settings.CONFLUENCE_WEBHOOK_SECRET
+    if not secret:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook ingestion is not configured")
+
+    if x_hub_signature:
+        digest = hmac.new(secret.encode(), await request.body(), hashlib.sha256).hexdigest()
+        valid = hmac.compare_digest(x_hub_signature.encode(), f"sha256={digest}".encode())
+    else:
+        valid = hmac.compare_digest((x_webhook_secret or "").encode(), secret.encode())
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
+
+
+@router.post("/confluence", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(verify_webhook_secret)])
+async def confluence_page_event(event: PageEvent) -> Dict[str, Any]:
+    """Accept a Confluence page event and queue the page for reindexing."""
+    name = event.event or event.webhookEvent
+    action = PAGE_EVENTS.get(name)
+    page_id = str(event.page.id)
+
+    spaces = settings.CONFLUENCE_SPACES or [settings.CONFLUENCE_SPACE]
+    if action is None or (event.page.spaceKey and event.page.spaceKey not in spaces):
+        return {"status": "ignored", "event": name, "page_id": page_id}
+
+    if not get_reindex_queue().submit(page_id, action):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Reindex queue is full",
+            headers={"Retry-After": str(int(settings.REINDEX_COALESCE_SECONDS) + 1)}
+        )
+
+    return {"status": "queued", "event": name, "page_id": page_id, "action": action}
+
+
+@router.get("/confluence/status")
+async def reindex_status(current_user: User = Depends(get_current_active_user)) -> Dict[str, Any]:
+    """Reindex queue depth and counters."""
+    return get_reindex_queue().status()
\ No newline at end of file
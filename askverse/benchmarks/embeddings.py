@@ -0,0 +1,93 @@
+import argparse
+import logging
+import sys
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from ..config.settings import settings
+from ..services.embeddings import ONNXEmbeddingModel
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SAMPLE_SENTENCES = [
+    "How do I configure the staging cluster?",
+    "What is the weather in New York tomorrow?",
+    "Steps to rotate the database credentials used by the sync job.",
+    "Confluence page describing the release process for the mobile app.",
+    "Which team owns the payments API and where is its runbook?",
+    "Troubleshooting guide for failed deployments caused by missing environment variables.",
+    "Quarterly planning notes with action items and owners for each initiative.",
+    "The vector index stores one embedding per document chunk alongside its metadata.",
+]
+
+def check_parity(reference, candidate, sentences: List[str]) -> Dict[str, float]:
+    """Compare embeddings of two backends by cosine similarity."""
+    expected = reference.encode(sentences, batch_size=32)
+    actual = candidate.encode(sentences, batch_size=32)
+    
+    expected = expected / np.linalg.norm(expected, axis=1, keepdims=True)
+    actual = actual / np.linalg.norm(actual, axis=1, keepdims=True)
+    cosine = (expected * actual).sum(axis=1)
+    
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_drift": float(1.0 - cosine.min())
+    }
+
+def measure_throughput(model, sentences: List[str], batch_size: int, rounds: int) -> float:
+    """Sentences encoded per second."""
+    model.encode(sentences[:batch_size], batch_size=batch_size)  # warm up
+    
+    started = time.perf_counter()
+    for _ in range(rounds):
+        model.encode(sentences, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    
+    return len(sentences) * rounds / elapsed
+
+def main():
+    """Check ONNX parity against the PyTorch model and benchmark throughput per core."""
+    parser = argparse.ArgumentParser(description="Embedding backend parity check and benchmark")
+    parser.add_argument("--onnx-path", default=settings.EMBEDDING_ONNX_PATH, help="Exported ONNX model directory")
+    parser.add_argument("--max-drift", type=float, default=0.02, help="Maximum allowed 1 - cosine similarity")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    # Pin both backends to a single core so numbers are per core
+    torch.set_num_threads(1)
+    reference = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+    candidate = ONNXEmbeddingModel(args.onnx_path, num_threads=1)
+    
+    sentences = SAMPLE_SENTENCES * 16
+    
+    parity = check_parity(reference, candidate, SAMPLE_SENTENCES)
+    logger.info(f"Parity: {parity}")
+    
+    results: Dict[str, Any] = {
+        "torch_per_core": measure_throughput(reference, sentences, args.batch_size, args.rounds),
+        "onnx_per_core": measure_throughput(candidate, sentences, args.batch_size, args.rounds),
+    }
+    results["speedup"] = results["onnx_per_core"] / results["torch_per_core"]
+    logger.info(
+        f"Throughput (sentences/s/core): torch={results['torch_per_core']:.1f} "
+        f"onnx={results['onnx_per_core']:.1f} speedup={results['speedup']:.2f}x"
+    )
+    
+    if parity["max_drift"] > args.max_drift:
+        logger.error(f"Cosine drift {parity['max_drift']:.4f} exceeds {args.max_drift}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
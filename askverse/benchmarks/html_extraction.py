@@ -0,0 +1,117 @@
+import argparse
+import logging
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+from ..services.storage_format import storage_to_text, extract_texts
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Storage-format snippets with the text they must extract to
+FIXTURES = [
+    # Confluence wraps cell text in paragraphs; they must not run together
+    ("<table><tr><td><p>first</p><p>second</p></td><td>line one<br/>line two</td></tr></table>",
+     "first second | line one line two"),
+    # A nested table keeps the outer row and its cells intact
+    ("<table><tr><td><p>outer</p><table><tr><td>inner a</td><td>inner b</td></tr></table></td><td>last</td></tr></table>",
+     "inner a | inner b\nouter | last"),
+]
+
+def check_fixtures() -> None:
+    """Fail fast if extraction breaks on a known case."""
+    for html, expected in FIXTURES:
+        text = storage_to_text(html)
+        if text != expected:
+            raise AssertionError(f"storage_to_text({html!r}) returned {text!r}, expected {expected!r}")
+
+def legacy_clean_html(html: str) -> str:
+    """The BeautifulSoup-based cleaner ConfluenceService used before storage_to_text."""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    # Get text
+    text = soup.get_text()
+    # Break into lines and remove leading/trailing space
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    return text
+
+def sample_page(rng: random.Random, sections: int) -> str:
+    """Build a storage-format page with headings, macros, lists and tables."""
+    words = "deploy cluster staging release runbook owner service config token rotate alert database index".split()
+    sentence = lambda: " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize() + "."
+    
+    parts = ['<ac:structured-macro ac:name="toc"><ac:parameter ac:name="maxLevel">3</ac:parameter></ac:structured-macro>']
+    for i in range(sections):
+        parts.append(f"<h2>Section {i}</h2>")
+        parts.append("<p>" + " ".join(sentence() for _ in range(4)) + " <strong>Important</strong> detail.</p>")
+        parts.append("<ul>" + "".join(f"<li><p>{sentence()}</p></li>" for _ in range(3)) + "</ul>")
+        rows = "".join(f"<tr><td><p>{rng.choice(words)}</p></td><td>{sentence()}</td><td>{rng.randint(1, 99)}</td></tr>" for _ in range(6))
+        # Multi-paragraph cells and a nested table, as Confluence writes them
+        rows += f"<tr><td><p>{rng.choice(words)}</p><p>{rng.choice(words)}</p></td><td>{sentence()}<br/>{sentence()}</td><td>1</td></tr>"
+        rows += f"<tr><td><p>{rng.choice(words)}</p></td><td><table><tr><td>{rng.choice(words)}</td><td>{sentence()}</td></tr></table></td><td>2</td></tr>"
+        parts.append(f"<table><tbody><tr><th>Name</th><th>Description</th><th>Value</th></tr>{rows}</tbody></table>")
+        parts.append(
+            '<ac:structured-macro ac:name="code"><ac:parameter ac:name="language">bash</ac:parameter>'
+            f"<ac:plain-text-body><![CDATA[kubectl rollout restart deploy/{rng.choice(words)}]]></ac:plain-text-body>"
+            "</ac:structured-macro>"
+        )
+        parts.append('<ac:structured-macro ac:name="jira"><ac:parameter ac:name="key">OPS-1</ac:parameter></ac:structured-macro>')
+    return "".join(parts)
+
+def load_corpus(corpus_dir: str, pages: int, sections: int) -> List[str]:
+    """Load sample pages from a directory, or generate them."""
+    if corpus_dir:
+        paths = sorted(Path(corpus_dir).glob("*.htm*")) + sorted(Path(corpus_dir).glob("*.xml"))
+        return [path.read_text() for path in paths]
+    
+    rng = random.Random(42)
+    return [sample_page(rng, rng.randint(1, sections)) for _ in range(pages)]
+
+def measure(name: str, func: Callable[[List[str]], List[str]], corpus: List[str]) -> float:
+    """Time one pass over the corpus and log pages per second."""
+    total_bytes = sum(len(page) for page in corpus)
+    started = time.perf_counter()
+    func(corpus)
+    elapsed = time.perf_counter() - started
+    logger.info(f"{name}: {len(corpus) / elapsed:.1f} pages/s, {total_bytes / elapsed / 1e6:.2f} MB/s")
+    return elapsed
+
+def main():
+    """Benchmark storage-format extraction against the previous BeautifulSoup cleaner."""
+    parser = argparse.ArgumentParser(description="HTML extraction benchmark")
+    parser.add_argument("--corpus", help="Directory of storage-format pages (*.html, *.xml); generated if omitted")
+    parser.add_argument("--pages", type=int, default=200, help="Generated pages")
+    parser.add_argument("--sections", type=int, default=20, help="Max sections per generated page")
+    parser.add_argument("--processes", type=int, default=4, help="Process pool size for the parallel run")
+    args = parser.parse_args()
+    
+    check_fixtures()
+    corpus = load_corpus(args.corpus, args.pages, args.sections)
+    logger.info(f"Corpus: {len(corpus)} pages, {sum(len(page) for page in corpus) / 1e6:.2f} MB")
+    
+    legacy = measure("beautifulsoup (legacy)", lambda pages: [legacy_clean_html(page) for page in pages], corpus)
+    streaming = measure("storage_to_text", lambda pages: [storage_to_text(page) for page in pages], corpus)
+    
+    with ProcessPoolExecutor(args.processes) as executor:
+        extract_texts(corpus[:args.processes], executor)  # start workers
+        parallel = measure(f"storage_to_text x{args.processes} processes", lambda pages: extract_texts(pages, executor), corpus)
+    
+    logger.info(f"Speedup: {legacy / streaming:.2f}x single process, {legacy / parallel:.2f}x with process pool")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn, RedisDsn, HttpUrl
 
@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    CORS_ORIGINS: List[str] = ["http://localhost:3000"]
 
     # Database
     POSTGRES_URL: PostgresDsn
@@ -21,6 +22,19 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str
     PINECONE_ENVIRONMENT: str
     PINECONE_INDEX: str = "askverse"
+    VECTOR_DELETE_BATCH_SIZE: int = 1000  # Pinecone accepts at most 1000 ids per delete
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "torch"  # "torch" or "onnx"
+    EMBEDDING_ONNX_PATH: str = "models/all-MiniLM-L6-v2-onnx"
+    EMBEDDING_ONNX_THREADS: int = 0  # 0 lets ONNX Runtime use all cores
+    QUERY_EMBED_MAX_BATCH: int = 32  # query encodes per batched forward pass
+    QUERY_EMBED_MAX_WAIT_MS: float = 5.0  # how long a query waits for others to batch with
+    QUERY_EMBED_CACHE_SIZE: int = 1024  # recent query embeddings kept in memory
+
+    # Document content
+    CONTENT_STORE_PATH: str = "data/content"
+    CONTENT_STORE_CODEC: str = "zstd"  # falls back to zlib when zstandard is missing
+    DOCUMENT_CONTEXT_LIMIT: int = 5  # documents passed to the answer prompt
 
     # OpenAI
     OPENAI_API_KEY: str
@@ -29,10 +43,165 @@ class Settings(BaseSettings):
     # Confluence
     CONFLUENCE_URL: HttpUrl = "https://cwiki.apache.org"
     CONFLUENCE_SPACE: str = "CONF"
+    CONFLUENCE_SPACES: List[str] = []  # spaces to sync; defaults to CONFLUENCE_SPACE
+
+    # Document Sync
+    CLEANUP_OLD_DOCUMENTS: bool = False
+    DOCUMENT_RETENTION_DAYS: int = 30
+    SYNC_CHUNK_SIZE: int = 2000  # characters per chunk
+    SYNC_CHUNK_OVERLAP: int = 200
+    SYNC_QUEUE_SIZE: int = 32  # items buffered between pipeline stages
+    SYNC_FETCH_WORKERS: int = 4
+    SYNC_CLEAN_WORKERS: int = 2
+    SYNC_CLEAN_PROCESSES: int = 2  # process pool for HTML extraction; 0 uses threads
+    SYNC_EMBED_BATCH_SIZE: int = 16  # documents per embedding pass
+    SYNC_UPSERT_WORKERS: int = 2
+    SYNC_UPSERT_BATCH_SIZE: int = 16
+    SYNC_DB_BATCH_SIZE: int = 50
+    SYNC_SHARD_SIZE: int = 500  # pages per shard
+    SYNC_LEASE_SECONDS: int = 300  # a shard whose lease lapses is picked up by another worker
+    SYNC_HEARTBEAT_SECONDS: int = 60  # how often a worker renews its shard lease
+    SYNC_HEARTBEAT_MAX_FAILURES: int = 3  # failed renewals in a row before a worker gives up its shard
+    SYNC_SHARD_MAX_ATTEMPTS: int = 3
+    SYNC_WORKERS: int = 1  # worker processes started by the sync job
+
+    # Near-duplicate detection during sync
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.9  # estimated Jaccard similarity of word shingles
+    DEDUP_SHINGLE_SIZE: int = 5  # words per shingle
+    DEDUP_MIN_SHINGLES: int = 20  # shorter pages are always indexed
+    DEDUP_NUM_PERM: int = 128  # MinHash permutations; changing this, the shingle size or the seed invalidates stored signatures
+    DEDUP_BANDS: int = 16  # LSH bands; pages sharing one band are compared
+    DEDUP_SEED: int = 1
+
+    # Page change webhooks
+    CONFLUENCE_WEBHOOK_SECRET: Optional[str] = None  # webhook endpoint is disabled when unset
+    REINDEX_COALESCE_SECONDS: float = 2.0  # events for a page within this window trigger one reindex
+    REINDEX_WORKERS: int = 2
+    REINDEX_MAX_PENDING: int = 1000
+    REINDEX_RETRY_SECONDS: float = 5.0  # wait before retrying to set up a reindex worker
 
     # External APIs
     WEATHER_API_KEY: Optional[str] = None
     MAPS_API_KEY: Optional[str] = None
+    API_MAX_CANDIDATE_ENDPOINTS: int = 5  # top-ranked endpoints considered per query
+    API_COMPACT_RESPONSES: bool = True  # prune and flatten responses before prompting
+    API_COMPACT_MAX_ROWS: int = 20  # array items shown; the rest are summarised
+    API_COMPACT_MAX_VALUE_CHARS: int = 200
+    PARAM_BINDER_GAZETTEER_PATH: Optional[str] = None  # JSON of known values per parameter name
+
+    # External API response cache
+    API_CACHE_DEFAULT_TTL: int = 300  # seconds, used when upstream sends no Cache-Control
+    API_CACHE_TTL_OVERRIDES: Dict[str, int] = {}  # keyed by operation id, tag, spec id or spec title
+    API_CACHE_STALE_WHILE_REVALIDATE: int = 60
+    API_CACHE_RETAIN_SECONDS: int = 3600  # keep expired entries for ETag revalidation
+    API_CACHE_MAX_ENTRIES: int = 1024
+    API_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    API_CACHE_USE_REDIS: bool = True
+
+    # Query deadlines
+    QUERY_DEFAULT_TIMEOUT: float = 20.0  # seconds, when the client sends none
+    QUERY_MAX_TIMEOUT: float = 60.0
+    QUERY_AGGREGATION_RESERVE: float = 3.0  # seconds kept back to aggregate finished sub-tasks
+    QUERY_RESPONSE_VIEW: str = "lean"  # "full" returns each agent's documents and raw API responses
+
+    # Response compression
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller complete bodies are sent uncompressed
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4  # 0-11; used when brotli is installed and the client accepts it
+    LLM_REQUEST_TIMEOUT: float = 60.0
+
+    # Document retrieval
+    DOCUMENT_VECTOR_TIMEOUT: float = 3.0  # seconds per source; slower sources are skipped
+    DOCUMENT_CONFLUENCE_TIMEOUT: float = 8.0
+    HEDGE_QUANTILE: float = 0.95  # duplicate a vector query once it is slower than this quantile
+    HEDGE_MIN_SAMPLES: int = 20  # latencies observed before hedging starts
+    HEDGE_MAX_ATTEMPTS: int = 2
+
+    # Batch queries
+    BATCH_MAX_QUERIES: int = 1000
+    BATCH_CONCURRENCY: int = 8  # queries of a batch processed at once
+    BATCH_SHARE_SIMILARITY: float = 0.95  # queries at least this similar share retrieval results
+
+    # Query jobs
+    JOB_QUEUE_PREFIX: str = "askverse:jobs"
+    JOB_RESULT_TTL: int = 3600  # seconds a finished job and its result are kept
+    JOB_PENDING_TTL: int = 86400  # unclaimed jobs expire after this
+    JOB_MAX_PENDING: int = 10000  # submissions are refused beyond this queue depth
+    JOB_MAX_RUNTIME: float = 300.0  # running jobs older than this are requeued
+    JOB_MAX_ATTEMPTS: int = 2
+    JOB_RETRY_AFTER: int = 2  # seconds clients are told to wait before polling again
+    JOB_WAIT_SAMPLES: int = 1000  # recent queue waits kept for percentiles
+    JOB_WORKER_CONCURRENCY: int = 4  # jobs run at once per worker process
+    JOB_WORKER_PROCESSES: int = 1
+    JOB_WORKER_METRICS_PORT: int = 9101  # 0 disables the worker metrics endpoint
+
+    # Conversation sessions
+    SESSION_PREFIX: str = "askverse:session"
+    SESSION_TTL: int = 1800  # seconds a session is kept after its last turn
+    SESSION_TOKEN_BUDGET: int = 1500  # recent turns plus summary; older turns are summarised
+    SESSION_MAX_CANDIDATES: int = 50  # retrieved chunks kept for follow-ups
+    SESSION_REUSE_MIN_SIMILARITY: float = 0.5  # cached chunks this close to a follow-up are reused
+    SESSION_REUSE_MIN_CANDIDATES: int = 2  # fewer close chunks than this triggers a fresh search
+    SESSION_MAX_API_RESULTS: int = 5
+    SESSION_API_RESULT_CHARS: int = 2000
+    SESSION_LOCK_TIMEOUT: int = 120  # seconds before a session lock held by a dead worker is released
+    SESSION_LOCK_WAIT: int = 60  # seconds a turn waits for another turn of its session to be recorded
+
+    # Shared retrieval cache, refilled from query history after each sync
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_PREFIX: str = "askverse:retrieval"
+    RETRIEVAL_CACHE_TTL: int = 86400  # seconds; a finished sync starts a new generation regardless
+    RETRIEVAL_CACHE_EMBEDDING_TTL: int = 7 * 86400
+    RETRIEVAL_CACHE_GENERATION_REFRESH: float = 5.0  # seconds between checks for a new generation
+    RETRIEVAL_CACHE_TIMEOUT: float = 0.5  # Redis socket timeout; failed lookups count as misses
+    CACHE_WARMUP_AFTER_SYNC: bool = True
+    CACHE_WARMUP_QUERIES: int = 200  # most frequent recent queries replayed
+    CACHE_WARMUP_HISTORY_DAYS: int = 7
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_WARMUP_FULL_PIPELINE: bool = False  # also run the agents and fill the API response cache; costs LLM calls
+    CACHE_WARMUP_MAX_SECONDS: float = 600.0  # queries not started by then are skipped
+    CACHE_WARMUP_QUERY_TIMEOUT: float = 20.0  # per query, for full replays
+
+    # Query routing
+    QUERY_ROUTER_ENABLED: bool = True
+    QUERY_ROUTER_PATH: str = "data/query_router.npz"
+    QUERY_ROUTER_MIN_SIMILARITY: float = 0.6  # cosine to the closest prototype
+    QUERY_ROUTER_MIN_MARGIN: float = 0.05  # lead over the closest prototype of another route
+    QUERY_ROUTER_PROTOTYPES: int = 4  # prototype vectors per route
+    QUERY_ROUTER_TRAINING_LIMIT: int = 10000  # most recent logged queries used for training
+
+    # Startup
+    WARMUP_ON_STARTUP: bool = True  # build shared models and clients in the background
+    READY_RESOURCES: List[str] = [  # must be built before /ready passes; the rest are reported only
+        "llm",
+        "embedding_model",
+        "vector_index",
+        "endpoint_catalogue",
+    ]
+
+    # Production server (gunicorn.conf.py)
+    SERVER_WORKERS: int = 0  # 0 runs one worker per core
+    SERVER_PRELOAD: List[str] = [  # read-only resources built once before forking workers
+        "embedding_model",
+        "endpoint_catalogue",
+        "query_embedder",
+        "query_router",
+    ]
+    SERVER_GRACEFUL_TIMEOUT: int = 90  # seconds a stopping worker gets to finish in-flight queries
+    SERVER_TIMEOUT: int = 120  # workers silent for longer are killed and replaced
+    SERVER_KEEPALIVE: int = 5
+    SERVER_MAX_REQUESTS: int = 0  # recycle workers after this many requests; 0 never does
+    SERVER_PIDFILE: str = "/tmp/askverse.pid"
+
+    # Profiling
+    PROFILE_HEADER: str = "X-Profile"  # requests carrying it are profiled for authorised users
+    PROFILE_USERS: List[str] = []  # emails allowed to profile, besides superusers
+    PROFILE_INTERVAL_MS: float = 5.0  # stack sampling interval
+    PROFILE_DIR: str = "data/profiles"
+    PROFILE_KEEP: int = 100  # newest profiles kept
+    LOOP_BLOCK_DETECTOR_ENABLED: bool = False
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0  # callbacks holding the event loop longer are logged with their stack
 
     # Monitoring
     PROMETHEUS_MULTIPROC_DIR: str = "/tmp/prometheus"
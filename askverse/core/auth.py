@@ -39,19 +39,22 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
+    user = authenticate_token(token, db)
     if user is None:
         raise credentials_exception
     return user
 
+def authenticate_token(token: str, db: Session) -> Optional[User]:
+    """The user a bearer token was issued to, or None if it is invalid."""
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    return db.query(User).filter(User.id == user_id).first()
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -59,6 +62,17 @@ async def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def can_profile(user: Optional[User]) -> bool:
+    """Whether a user may profile requests: superusers and PROFILE_USERS."""
+    return user is not None and user.is_active and (user.is_superuser or user.email in settings.PROFILE_USERS)
+
+async def get_profiling_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    if not can_profile(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to profile")
+    return current_user
+
 def verify_api_key(client_id: str, client_secret: str, db: Session) -> Optional[APIKey]:
     api_key = db.query(APIKey).filter(
         APIKey.client_id == client_id,
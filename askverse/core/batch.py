@@ -0,0 +1,137 @@
+from typing import Dict, Any, AsyncIterator, List, Optional
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from ..config.settings import settings
+from .registry import get_query_embedder
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Key under which identical queries are deduplicated."""
+    return " ".join(query.split()).casefold()
+
+
+class BatchQueryRunner:
+    """Runs a batch of queries through the orchestrator with shared work.
+
+    Duplicate queries run once. All queries are embedded in bulk up front,
+    queries whose embeddings are nearly identical share one vector and
+    endpoint search, and at most ``concurrency`` queries are in the LLM
+    stages at a time. Results are yielded in completion order.
+    """
+
+    def __init__(self, orchestrator: Any, concurrency: Optional[int] = None, share_similarity: Optional[float] = None):
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency or settings.BATCH_CONCURRENCY
+        self.share_similarity = settings.BATCH_SHARE_SIMILARITY if share_similarity is None else share_similarity
+
+    async def run(
+        self,
+        items: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one result per item as its query completes, then a summary.
+
+        Result lines carry the orchestrator's full result under "result".
+        """
+        started = time.perf_counter()
+
+        # Deduplicate; each unique query remembers the items asking it
+        texts: List[str] = []
+        members: List[List[int]] = []
+        seen: Dict[str, int] = {}
+        for i, item in enumerate(items):
+            key = normalize_query(item["query"])
+            if key not in seen:
+                seen[key] = len(texts)
+                texts.append(item["query"])
+                members.append([])
+            members[seen[key]].append(i)
+
+        # One bulk embedding pass, then group near-identical queries
+        embedder = get_query_embedder()
+        embeddings = np.asarray(await embedder.encode_many(texts), dtype=np.float32)
+        groups = self._group(embeddings)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        shared: Dict[int, Dict[str, asyncio.Future]] = {}
+
+        async def run_one(u: int) -> Any:
+            async with semaphore:
+                # The bulk pass may have been evicted from the query cache by now
+                embedder.prime([texts[u]], embeddings[u:u + 1])
+
+                # The first query of a group starts the group's searches
+                group = groups[u]
+                if group not in shared:
+                    shared[group] = self.orchestrator.speculate(texts[group])
+
+                query_started = time.perf_counter()
+                result = await self.orchestrator.process_query(
+                    texts[u],
+                    context,
+                    timeout=timeout,
+                    prefetched=shared[group]
+                )
+                return u, result, time.perf_counter() - query_started
+
+        tasks = [asyncio.ensure_future(run_one(u)) for u in range(len(texts))]
+        failed = 0
+        try:
+            for completed in asyncio.as_completed(tasks):
+                u, result, seconds = await completed
+                failed += not result["success"]
+                for rank, i in enumerate(members[u]):
+                    yield {
+                        "type": "result",
+                        "index": i,
+                        "id": items[i].get("id"),
+                        "query": items[i]["query"],
+                        "duplicate": rank > 0,
+                        "success": result["success"],
+                        "response": result.get("response"),
+                        "confidence": result.get("confidence", 0.0),
+                        "partial": result.get("partial", False),
+                        "timed_out": result.get("timed_out", []),
+                        "error": result.get("error"),
+                        "processing_time": round(seconds, 3),
+                        "result": result
+                    }
+
+            yield {
+                "type": "summary",
+                "queries": len(items),
+                "unique_queries": len(texts),
+                "retrieval_groups": len(set(groups)),
+                "failed": failed,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            }
+        finally:
+            for task in tasks:
+                task.cancel()
+            for lookups in shared.values():
+                for future in lookups.values():
+                    future.cancel()
+
+    def _group(self, embeddings: np.ndarray) -> List[int]:
+        """Assign each query to the first earlier query it is nearly identical to."""
+        normalized = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        representatives: List[int] = []
+        groups = []
+        for u, embedding in enumerate(normalized):
+            group = u
+            if representatives:
+                similarities = normalized[representatives] @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.share_similarity:
+                    group = representatives[best]
+            if group == u:
+                representatives.append(u)
+            groups.append(group)
+        return groups
\ No newline at end of file
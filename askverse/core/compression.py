@@ -0,0 +1,131 @@
+from typing import Optional
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config.settings import settings
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The preferred encoding we support from an Accept-Encoding header, or None."""
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    # Listed order of `supported` breaks ties, so brotli wins when both are accepted
+    candidates = [
+        (weights.get(coding, weights.get("*", 0.0)), -rank, coding)
+        for rank, coding in enumerate(supported)
+    ]
+    weight, _, coding = max(candidates)
+    return coding if weight > 0 else None
+
+
+class _Encoder:
+    """Incremental brotli or gzip compressor."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.RESPONSE_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.RESPONSE_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        """Compress a chunk; unless finishing, flush so the client can decode what it has."""
+        if self.encoding == "br":
+            return self._compressor.process(data) + (self._compressor.finish() if finish else self._compressor.flush())
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Compresses responses with brotli or gzip, as the client prefers.
+
+    Complete bodies smaller than ``minimum_size`` are sent as they are.
+    Streamed bodies (NDJSON batches) are compressed and flushed chunk by
+    chunk, so clients still receive each line as it is produced. Responses
+    that already carry a Content-Encoding are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.RESPONSE_COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", "")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressingResponder:
+    """Compresses one response, deciding when its first body chunk arrives."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.encoder: Optional[_Encoder] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers depend on the body; hold them until it starts
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if "content-encoding" not in headers and (more_body or len(body) >= self.minimum_size):
+                self.encoder = _Encoder(self.encoding)
+                headers["Content-Encoding"] = self.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                else:
+                    # Complete body: compress it now so the length is known
+                    body = self.encoder.compress(body, finish=True)
+                    headers["Content-Length"] = str(len(body))
+                    await self.send(self.start_message)
+                    await self.send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+            await self.send(self.start_message)
+
+        if self.encoder is None:
+            await self.send(message)
+            return
+        await self.send({
+            "type": "http.response.body",
+            "body": self.encoder.compress(body, finish=not more_body),
+            "more_body": more_body
+        })
\ No newline at end of file
@@ -0,0 +1,69 @@
+from typing import Any, Awaitable, Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import time
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Give the enclosed work (and tasks it creates) a time budget.
+
+    Nested budgets never extend an outer one.
+    """
+    if seconds is None:
+        yield
+        return
+
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires if outer is None else min(outer, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None without one."""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return max(0.0, expires - time.monotonic())
+
+
+def timeout(default: float) -> float:
+    """Timeout for one call: the default, capped by the time left."""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+
+async def within_deadline(awaitable: Awaitable, reserve: float = 0.0) -> Any:
+    """Await, cancelling once the budget (less a reserve kept for later steps) is spent."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+
+    budget = left - reserve
+    if budget <= 0:
+        if asyncio.isfuture(awaitable):
+            awaitable.cancel()
+        elif asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+
+    try:
+        return await asyncio.wait_for(awaitable, budget)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded")
\ No newline at end of file
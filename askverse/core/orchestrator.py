@@ -1,4 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import ast
+import asyncio
+import json
+import logging
+import time
+
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
 
@@ -6,6 +12,23 @@ from ..agents.document import DocumentAgent
 from ..agents.api import APIAgent
 from ..agents.data import DataAgent
 from ..agents.base import AgentResponse
+from ..config.settings import settings
+from ..services.query_router import DIRECT_ROUTES
+from . import deadline
+from .registry import get_llm, get_query_router
+
+logger = logging.getLogger(__name__)
+
+# Speculative lookups on the raw query and the agent that consumes each
+SPECULATIVE_LOOKUPS = {
+    "vector_results": "document",
+    "endpoints": "api",
+}
+
+# Lookups a caller can supply from a session cache, and the search each makes unnecessary
+CACHED_LOOKUPS = {
+    "session_documents": "vector_results",
+}
 
 class QueryOrchestrator:
     def __init__(self):
@@ -30,54 +53,128 @@ class QueryOrchestrator:
                    "\n  ]"
                    "\n}")
         ])
+    
+    @property
+    def llm(self):
+        """Shared LLM client, the same instance the agents use."""
+        return get_llm()
+    
+    async def process_query(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        timeout: Optional[float] = None,
+        prefetched: Optional[Dict[str, asyncio.Future]] = None
+    ) -> Dict[str, Any]:
+        """Process a query by orchestrating multiple agents.
+        
+        Within a deadline (``timeout`` or the caller's), sub-tasks still running
+        when only the aggregation reserve is left are cancelled, and the answer
+        is aggregated from those that finished and flagged as partial.
         
-        self.llm = self.document_agent.llm  # Reuse the same LLM instance
+        ``prefetched`` lookups (see ``speculate``) may be shared with other
+        queries by the caller; they are used in place of speculation and never
+        cancelled here.
+        """
+        with deadline.deadline(timeout):
+            return await self._process_query(query, context, prefetched)
     
-    async def process_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Process a query by orchestrating multiple agents."""
+    async def _process_query(
+        self,
+        query: str,
+        context: Dict[str, Any] = None,
+        shared: Optional[Dict[str, asyncio.Future]] = None
+    ) -> Dict[str, Any]:
+        """Route or decompose, run the agents and aggregate, within the current deadline."""
+        # Shield shared lookups so cancelling ours leaves them running for others
+        prefetched = {key: asyncio.shield(future) for key, future in (shared or {}).items()}
+        timed_out = []
         try:
-            # Decompose query into sub-tasks
-            orchestrate_chain = LLMChain(llm=self.llm, prompt=self.orchestrate_prompt)
-            decomposition = orchestrate_chain.invoke({
-                "query": query,
-                "context": context or {}
-            })
-            
-            # Parse sub-tasks
-            sub_tasks = decomposition["text"]
+            # Simple queries go straight to one agent; the rest are decomposed
+            query_router = get_query_router()
+            routing = await query_router.route(query)
+            if routing["agent"]:
+                sub_tasks = [{"task": query, "agent": routing["agent"], "priority": 1}]
+            else:
+                # Hide retrieval latency behind the decomposition call
+                prefetched = {**self.speculate(query, skip=prefetched), **prefetched}
+                started = time.perf_counter()
+                try:
+                    # Decomposition may use at most half the remaining time
+                    left = deadline.remaining()
+                    reserve = settings.QUERY_AGGREGATION_RESERVE if left is None else max(settings.QUERY_AGGREGATION_RESERVE, left / 2)
+                    sub_tasks = await deadline.within_deadline(self._decompose(query, context), reserve=reserve)
+                    routing["label"] = query_router.record_decomposition(routing, sub_tasks, time.perf_counter() - started)
+                except deadline.DeadlineExceeded:
+                    # Fall back to the router's best guess
+                    timed_out.append("decomposition")
+                    agent_type = routing["route"] if routing["route"] in DIRECT_ROUTES else "document"
+                    sub_tasks = [{"task": query, "agent": agent_type, "priority": 1}]
+                
+                # Drop speculative work no selected agent will use
+                selected = {task["agent"] for task in sub_tasks}
+                for key, agent_type in SPECULATIVE_LOOKUPS.items():
+                    if agent_type not in selected and key in prefetched:
+                        prefetched.pop(key).cancel()
             
             # Sort tasks by priority
             sub_tasks.sort(key=lambda x: x["priority"])
             
-            # Process tasks with each agent
-            results = []
+            # Process tasks with each agent concurrently
+            running = {}
             for task in sub_tasks:
                 agent = self._get_agent(task["agent"])
                 if agent:
-                    response = await agent.process(query, context)
-                    if response.success:
-                        results.append({
-                            "task": task["task"],
-                            "agent": task["agent"],
-                            "response": response.data,
-                            "confidence": response.confidence
-                        })
+                    running[asyncio.ensure_future(agent.process(query, context, prefetched=prefetched))] = task
+            
+            # Keep time back for aggregation; cancel whatever has not finished by then
+            done = set()
+            if running:
+                left = deadline.remaining()
+                budget = None if left is None else max(0.0, left - settings.QUERY_AGGREGATION_RESERVE)
+                done, pending = await asyncio.wait(running, timeout=budget)
+                for future in pending:
+                    future.cancel()
+                    timed_out.append(running[future]["agent"])
+            
+            results = []
+            for future, task in running.items():
+                if future in done and not future.exception() and future.result().success:
+                    response = future.result()
+                    results.append({
+                        "task": task["task"],
+                        "agent": task["agent"],
+                        "response": response.data,
+                        "confidence": response.confidence
+                    })
             
             # Aggregate results
-            final_response = await self.data_agent.process(
-                query,
-                {
-                    "data_sources": results,
-                    "original_query": query,
-                    "context": context or {}
-                }
-            )
+            try:
+                final_response = await deadline.within_deadline(self.data_agent.process(
+                    query,
+                    {
+                        "data_sources": results,
+                        "original_query": query,
+                        "context": context or {}
+                    }
+                ))
+                response_text = final_response.data["response"]
+                confidence = final_response.confidence
+            except deadline.DeadlineExceeded:
+                # No time to aggregate; answer with the most confident sub-task
+                timed_out.append("aggregation")
+                best = max(results, key=lambda result: result["confidence"], default=None)
+                response_text = best["response"].get("response") if best else None
+                confidence = best["confidence"] if best else 0.0
             
             return {
                 "success": True,
-                "response": final_response.data["response"],
-                "confidence": final_response.confidence,
-                "sub_tasks": results
+                "response": response_text,
+                "confidence": confidence,
+                "sub_tasks": results,
+                "routing": routing,
+                "partial": bool(timed_out),
+                "timed_out": timed_out
             }
             
         except Exception as e:
@@ -88,6 +185,51 @@ class QueryOrchestrator:
                 "confidence": 0.0,
                 "sub_tasks": []
             }
+        
+        finally:
+            for future in prefetched.values():
+                future.cancel()
+    
+    def speculate(self, query: str, skip: Optional[Dict[str, Any]] = None) -> Dict[str, asyncio.Future]:
+        """Start cheap lookups on the raw query that the agents are likely to need.
+        
+        Lookups already in ``skip``, or made unnecessary by cached lookups in
+        it, are not started.
+        """
+        skip = set(skip or {})
+        skip.update(CACHED_LOOKUPS[key] for key in list(skip) if key in CACHED_LOOKUPS)
+        
+        loop = asyncio.get_running_loop()
+        prefetched = {}
+        if "vector_results" not in skip:
+            prefetched["vector_results"] = asyncio.ensure_future(self.document_agent.vector_store.asearch(query, top_k=5))
+        if "endpoints" not in skip:
+            # Spec parsing reads from disk; keep it off the event loop
+            prefetched["endpoints"] = loop.run_in_executor(None, self.api_agent.openapi_service.search_endpoints, query)
+        for key, future in prefetched.items():
+            future.add_done_callback(lambda future, key=key: self._log_speculation_error(key, future))
+        return prefetched
+    
+    def _log_speculation_error(self, key: str, future: asyncio.Future) -> None:
+        """Retrieve a failed lookup's exception; its agent repeats the work instead."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Speculative {key} lookup failed: {future.exception()}")
+    
+    async def _decompose(self, query: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Decompose a query into sub-tasks with the LLM."""
+        orchestrate_chain = LLMChain(llm=self.llm, prompt=self.orchestrate_prompt)
+        decomposition = await orchestrate_chain.ainvoke({
+            "query": query,
+            "context": context or {}
+        })
+        
+        # The prompt's example uses single quotes, so accept Python literals too
+        text = decomposition["text"].strip()
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = ast.literal_eval(text[text.index("{"):text.rindex("}") + 1])
+        return parsed["sub_tasks"]
     
     def _get_agent(self, agent_type: str) -> Any:
         """Get the appropriate agent based on type."""
@@ -0,0 +1,246 @@
+from typing import Dict, Any, List, Optional
+from collections import Counter, deque
+from pathlib import Path
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames of threads parked waiting for work; such samples are dropped
+_IDLE_FILES = ("threading.py", "queue.py", "thread.py")
+
+
+def _frame_label(frame: Any) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse_stack(frame: Any, root: str) -> str:
+    """One stack in collapsed form (root;outermost;...;innermost), as flamegraph tools read it."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join([root] + labels[::-1])
+
+
+def format_collapsed(counts: Counter) -> str:
+    """Collapsed stacks, one "stack count" line each."""
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+def _thread_names() -> Dict[int, str]:
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+class SamplingProfiler:
+    """Samples the stacks of every busy thread at a fixed interval.
+
+    The event loop thread is always sampled, so time spent awaiting I/O shows
+    up as its ``select`` frames; other threads (executors running HTML
+    cleaning, embedding or blocking clients) are sampled while they work.
+    Samples cover the whole process, so concurrent requests appear too.
+    """
+
+    def __init__(self, interval_ms: Optional[float] = None, loop_thread_id: Optional[int] = None):
+        self.interval = (interval_ms or settings.PROFILE_INTERVAL_MS) / 1000
+        self.loop_thread_id = loop_thread_id or threading.get_ident()
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> "SamplingProfiler":
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = _thread_names()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id == self.loop_thread_id:
+                    root = "event-loop"
+                elif frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                else:
+                    if thread_id not in names:
+                        names = _thread_names()
+                    root = names.get(thread_id, f"thread-{thread_id}")
+                self.counts[collapse_stack(frame, root)] += 1
+
+    def collapsed(self) -> str:
+        """Samples as collapsed stacks."""
+        return format_collapsed(self.counts)
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Sample totals per thread and the functions most often on top of a busy stack."""
+        threads: Counter = Counter()
+        leaves: Counter = Counter()
+        for stack, count in self.counts.items():
+            frames = stack.split(";")
+            threads[frames[0]] += count
+            leaves[frames[-1]] += count
+        return {
+            "elapsed_seconds": round(self.elapsed, 3),
+            "samples": self.samples,
+            "interval_ms": round(self.interval * 1000, 3),
+            "threads": dict(threads.most_common()),
+            "top_frames": dict(leaves.most_common(top))
+        }
+
+
+class ProfileStore:
+    """Profiles of individual requests, kept as collapsed-stack files.
+
+    Files live in ``PROFILE_DIR`` so any server worker on the host can serve
+    a profile another one recorded. Only the newest ``keep`` are retained.
+    """
+
+    def __init__(self, path: Optional[str] = None, keep: Optional[int] = None):
+        self.path = Path(path or settings.PROFILE_DIR)
+        self.keep = keep or settings.PROFILE_KEEP
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def save(self, profiler: SamplingProfiler) -> str:
+        """Store a profile and return its id."""
+        profile_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        (self.path / f"{profile_id}.collapsed").write_text(profiler.collapsed())
+
+        for stale in self._files()[self.keep:]:
+            stale.unlink(missing_ok=True)
+        return profile_id
+
+    def _files(self) -> List[Path]:
+        """Profile files, newest first."""
+        return sorted(self.path.glob("*.collapsed"), key=lambda path: path.stat().st_mtime, reverse=True)
+
+    def get(self, profile_id: str) -> Optional[str]:
+        """Collapsed stacks of a profile, or None."""
+        path = self.path / f"{profile_id}.collapsed"
+        if path.parent != self.path or not path.exists():
+            return None
+        return path.read_text()
+
+    def list(self) -> List[str]:
+        """Stored profile ids, newest first."""
+        return [path.stem for path in self._files()]
+
+
+class LoopBlockDetector:
+    """Logs the event loop's stack whenever a callback holds it longer than a threshold.
+
+    The loop schedules a heartbeat every ``interval``; a watchdog thread that
+    sees no heartbeat for ``threshold`` captures the loop thread's stack, which
+    points at the blocking call (a synchronous HTTP client, a blocking LLM
+    call, CPU-bound parsing).
+    """
+
+    def __init__(self, threshold_ms: Optional[float] = None, history: int = 50):
+        self.threshold = (threshold_ms or settings.LOOP_BLOCK_THRESHOLD_MS) / 1000
+        self.interval = self.threshold / 4
+        self.counts: Counter = Counter()
+        self.recent: deque = deque(maxlen=history)
+        self.stats = {"stalls": 0, "blocked_seconds": 0.0, "longest_seconds": 0.0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Watch the given (or the running) loop; call from the loop's thread."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        if not self._stop.is_set():
+            self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat
+            if blocked < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame, "event-loop")
+            self.counts[stack] += 1
+            text = "".join(traceback.format_stack(frame))
+
+            # Wait for the loop to recover, so one stall is reported once
+            while self._last_beat == beat and not self._stop.wait(self.interval):
+                pass
+            blocked = max(blocked, self._last_beat - beat - self.interval)
+
+            self.stats["stalls"] += 1
+            self.stats["blocked_seconds"] += blocked
+            self.stats["longest_seconds"] = max(self.stats["longest_seconds"], blocked)
+            self.recent.append({"at": time.time(), "blocked_seconds": round(blocked, 3), "stack": stack})
+            logger.warning(f"Event loop blocked for {blocked * 1000:.0f} ms in:\n{text}")
+
+    def collapsed(self) -> str:
+        """Stacks seen blocking the loop, with how many stalls each caused."""
+        return format_collapsed(self.counts)
+
+    def status(self) -> Dict[str, Any]:
+        """Stall counters and the most recent stalls."""
+        return {
+            **self.stats,
+            "blocked_seconds": round(self.stats["blocked_seconds"], 3),
+            "longest_seconds": round(self.stats["longest_seconds"], 3),
+            "threshold_ms": round(self.threshold * 1000, 3),
+            "running": self._thread is not None and not self._stop.is_set(),
+            "recent": list(self.recent)
+        }
+
+
+_detector: Optional[LoopBlockDetector] = None
+
+
+def start_loop_block_detector() -> Optional[LoopBlockDetector]:
+    """Start this process's detector if enabled; call from the event loop."""
+    global _detector
+    if settings.LOOP_BLOCK_DETECTOR_ENABLED and _detector is None:
+        _detector = LoopBlockDetector()
+        _detector.start()
+        logger.info(f"Watching the event loop for callbacks over {settings.LOOP_BLOCK_THRESHOLD_MS} ms")
+    return _detector
+
+
+def get_loop_block_detector() -> Optional[LoopBlockDetector]:
+    """This process's detector, or None when disabled."""
+    return _detector
\ No newline at end of file
@@ -0,0 +1,291 @@
+from typing import Dict, Any, Callable, List, Optional
+from functools import partial
+import importlib
+import logging
+import sys
+import threading
+import time
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceRegistry:
+    """Process-wide registry of lazily built, shared resources.
+
+    Heavy clients (LLM, embedding model, vector index) are built once per
+    process on first use, or ahead of time by ``warm_up``, and shared by every
+    agent and service.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._status: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register a factory for a shared resource."""
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self._status[name] = "pending"
+
+    def get(self, name: str) -> Any:
+        """Return the shared resource, building it on first use."""
+        if name in self._instances:
+            return self._instances[name]
+
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+
+            self._status[name] = "warming"
+            started = time.perf_counter()
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                self._status[name] = "failed"
+                self._errors[name] = str(e)
+                raise
+
+            self.timings[f"build:{name}"] = time.perf_counter() - started
+            self._instances[name] = instance
+            self._status[name] = "ready"
+            self._errors.pop(name, None)
+            return instance
+
+    def warm_up(self, names: Optional[List[str]] = None) -> None:
+        """Build resources ahead of the first request."""
+        for name in names or list(self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Error warming up {name}: {e}")
+
+        logger.info(f"Startup profile: {self.profile()}")
+
+    def start_background_warm_up(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """Warm up resources in a daemon thread so startup is not blocked."""
+        thread = threading.Thread(target=self.warm_up, args=(names,), name="registry-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def import_module(self, module_name: str) -> Any:
+        """Import a module, recording how long a first import took."""
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        self.timings[f"import:{module_name}"] = time.perf_counter() - started
+        return module
+
+    def is_ready(self, names: Optional[List[str]] = None) -> bool:
+        """Whether the given resources, by default every registered one, have been built."""
+        names = list(self._status) if names is None else names
+        return all(self._status.get(name) == "ready" for name in names)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the resources in ``READY_RESOURCES`` have been built."""
+        return self.is_ready(settings.READY_RESOURCES)
+
+    def status(self) -> Dict[str, Any]:
+        """Warm-up state of every registered resource."""
+        return {
+            name: {"status": status, "error": self._errors.get(name)} if name in self._errors else {"status": status}
+            for name, status in self._status.items()
+        }
+
+    def profile(self) -> Dict[str, float]:
+        """Import and build timings in seconds, slowest first."""
+        return dict(sorted(
+            ((name, round(seconds, 3)) for name, seconds in self.timings.items()),
+            key=lambda item: item[1],
+            reverse=True
+        ))
+
+
+registry = ResourceRegistry()
+
+
+def _build_llm() -> Any:
+    chat_models = registry.import_module("langchain.chat_models")
+    return chat_models.ChatOpenAI(
+        model=settings.OPENAI_MODEL,
+        temperature=0.0,
+        api_key=settings.OPENAI_API_KEY,
+        request_timeout=settings.LLM_REQUEST_TIMEOUT
+    )
+
+
+def _build_embedding_model() -> Any:
+    if settings.EMBEDDING_BACKEND == "onnx":
+        registry.import_module("onnxruntime")
+        from ..services.embeddings import ONNXEmbeddingModel
+        return ONNXEmbeddingModel(settings.EMBEDDING_ONNX_PATH, num_threads=settings.EMBEDDING_ONNX_THREADS)
+
+    sentence_transformers = registry.import_module("sentence_transformers")
+    return sentence_transformers.SentenceTransformer(settings.EMBEDDING_MODEL)
+
+
+def _build_vector_index() -> Any:
+    pinecone = registry.import_module("pinecone")
+
+    # Initialize Pinecone
+    pinecone.init(
+        api_key=settings.PINECONE_API_KEY,
+        environment=settings.PINECONE_ENVIRONMENT
+    )
+
+    # Get or create index
+    if settings.PINECONE_INDEX not in pinecone.list_indexes():
+        pinecone.create_index(
+            name=settings.PINECONE_INDEX,
+            dimension=768,  # Default dimension for sentence-transformers
+            metric="cosine"
+        )
+
+    return pinecone.Index(settings.PINECONE_INDEX)
+
+
+def _build_endpoint_catalogue() -> Any:
+    from ..services.openapi import OpenAPIService
+    catalogue = OpenAPIService()
+    catalogue.load()
+    return catalogue
+
+
+def _build_query_embedder() -> Any:
+    from ..services.embedding_batcher import EmbeddingBatcher
+    shared = get_retrieval_cache() if settings.RETRIEVAL_CACHE_ENABLED else None
+    return EmbeddingBatcher(get_embedding_model, shared=shared)
+
+
+def _build_content_store() -> Any:
+    from ..services.content_store import ContentStore
+    return ContentStore()
+
+
+def _build_query_router() -> Any:
+    from ..services.query_router import QueryRouter
+    router = QueryRouter(get_query_embedder().encode)
+    router.load()
+    return router
+
+
+def _build_orchestrator() -> Any:
+    from .orchestrator import QueryOrchestrator
+    return QueryOrchestrator()
+
+
+def _build_reindex_queue() -> Any:
+    from ..services.document_sync import DocumentSyncService
+    from ..services.reindex_queue import ReindexQueue
+    # Runs in the server's event loop, so database calls go to threads
+    return ReindexQueue(partial(DocumentSyncService, offload_db=True))
+
+
+def _build_job_queue() -> Any:
+    from ..services.job_queue import JobQueue
+    return JobQueue()
+
+
+
+def _build_profile_store() -> Any:
+    from .profiling import ProfileStore
+    return ProfileStore()
+
+
+
+def _build_session_store() -> Any:
+    from ..services.sessions import SessionStore
+    return SessionStore()
+
+
+def _build_retrieval_cache() -> Any:
+    from ..services.retrieval_cache import RetrievalCache
+    return RetrievalCache()
+
+
+registry.register("llm", _build_llm)
+registry.register("embedding_model", _build_embedding_model)
+registry.register("vector_index", _build_vector_index)
+registry.register("endpoint_catalogue", _build_endpoint_catalogue)
+registry.register("query_embedder", _build_query_embedder)
+registry.register("content_store", _build_content_store)
+registry.register("query_router", _build_query_router)
+registry.register("orchestrator", _build_orchestrator)
+registry.register("job_queue", _build_job_queue)
+registry.register("profile_store", _build_profile_store)
+registry.register("session_store", _build_session_store)
+registry.register("reindex_queue", _build_reindex_queue)
+registry.register("retrieval_cache", _build_retrieval_cache)
+
+
+def get_llm() -> Any:
+    """Shared chat model client."""
+    return registry.get("llm")
+
+
+def get_embedding_model() -> Any:
+    """Shared sentence embedding model."""
+    return registry.get("embedding_model")
+
+
+def get_vector_index() -> Any:
+    """Shared vector index client."""
+    return registry.get("vector_index")
+
+
+def get_endpoint_catalogue() -> Any:
+    """Shared parsed OpenAPI endpoint catalogue."""
+    return registry.get("endpoint_catalogue")
+
+
+def get_query_embedder() -> Any:
+    """Shared micro-batcher for query embeddings."""
+    return registry.get("query_embedder")
+
+
+def get_content_store() -> Any:
+    """Shared local document content store."""
+    return registry.get("content_store")
+
+
+def get_query_router() -> Any:
+    """Shared local router deciding which queries need LLM decomposition."""
+    return registry.get("query_router")
+
+
+def get_orchestrator() -> Any:
+    """Shared query orchestrator and its agents."""
+    return registry.get("orchestrator")
+
+
+def get_job_queue() -> Any:
+    """Shared Redis queue of query jobs."""
+    return registry.get("job_queue")
+
+
+def get_profile_store() -> Any:
+    """Shared store of recorded request profiles."""
+    return registry.get("profile_store")
+
+
+def get_session_store() -> Any:
+    """Shared Redis store of conversation sessions."""
+    return registry.get("session_store")
+
+
+def get_reindex_queue() -> Any:
+    """Shared background queue for single-page reindexing."""
+    return registry.get("reindex_queue")
+
+
+def get_retrieval_cache() -> Any:
+    """Shared Redis cache of query embeddings and vector search results."""
+    return registry.get("retrieval_cache")
\ No newline at end of file
@@ -1,10 +1,13 @@
+from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
 import logging
 from datetime import datetime
 import argparse
 
 from ..services.document_sync import DocumentSyncService
-from ..core.config import settings
+from ..config.settings import settings
+from .warm_caches import warm_caches, log_report as log_warmup_report
 
 # Configure logging
 logging.basicConfig(
@@ -13,31 +16,81 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-async def run_sync():
+def sync_worker(worker_index: int) -> Dict[str, Any]:
+    """Run one sync worker until no shards are left to claim."""
+    logger.info(f"Sync worker {worker_index} starting...")
+    return asyncio.run(DocumentSyncService().sync_documents())
+
+def log_result(result: Dict[str, Any]) -> None:
+    """Log a worker's sync report."""
+    if result["status"] != "success":
+        logger.error(f"Sync failed: {result['error']}")
+        return
+    
+    for shard_id, shard_metrics in result["metrics"].items():
+        if shard_metrics.get("lease_lost"):
+            logger.warning(f"Shard {shard_id}: lease lost to another worker")
+        for stage, metrics in shard_metrics.get("stages", {}).items():
+            logger.info(
+                f"Shard {shard_id} stage {stage}: {metrics['processed']} processed, {metrics['errors']} failed, "
+                f"{metrics['items_per_second']}/s, busy {metrics['busy_seconds']}s, "
+                f"max queue depth {metrics['max_queue_depth']}"
+            )
+    
+    duplicates = result["duplicates"]
+    logger.info(
+        f"Near-duplicates: {duplicates['canonical']} indexed, {duplicates['duplicates']} stored as aliases, "
+        f"{duplicates['skipped']} too short to compare, {duplicates['detached']} detached and reindexed"
+    )
+
+def run_sync(workers: int = 1, cleanup: bool = False, warmup: bool = True, warmup_full: Optional[bool] = None):
     """Run document synchronization job."""
     try:
-        sync_service = DocumentSyncService()
+        # Run document sync; workers share the sync's shards through the database
+        logger.info(f"Starting document synchronization with {workers} worker(s)...")
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(sync_worker, range(workers)))
+        else:
+            results = [sync_worker(0)]
         
-        # Run document sync
-        logger.info("Starting document synchronization...")
-        result = await sync_service.sync_documents()
+        for result in results:
+            log_result(result)
         
-        if result["status"] == "success":
+        # Shard totals are shared, so the last report is the merged one
+        completed = [result for result in results if result.get("sync_status") == "completed"]
+        if completed:
+            result = completed[-1]
             logger.info(f"Sync completed successfully. Processed {result['total_documents']} documents.")
             logger.info(f"Successful: {result['successful_documents']}, Failed: {result['failed_documents']}")
-        else:
-            logger.error(f"Sync failed: {result['error']}")
+        elif any(result["status"] == "success" for result in results):
+            logger.info("Sync is still running in other workers.")
         
-        # Run cleanup if configured
-        if settings.CLEANUP_OLD_DOCUMENTS:
+        # Run cleanup if configured, once the sync has finished everywhere
+        if completed and (cleanup or settings.CLEANUP_OLD_DOCUMENTS):
             logger.info("Running document cleanup...")
-            cleanup_result = await sync_service.cleanup_old_documents(days=settings.DOCUMENT_RETENTION_DAYS)
+            cleanup_result = asyncio.run(
+                DocumentSyncService().cleanup_old_documents(days=settings.DOCUMENT_RETENTION_DAYS)
+            )
             
             if cleanup_result["status"] == "success":
                 logger.info(f"Cleanup completed. Removed {cleanup_result['removed_documents']} documents.")
             else:
                 logger.error(f"Cleanup failed: {cleanup_result['error']}")
         
+        # Drop search results from before the sync, then refill with popular queries
+        if completed and settings.RETRIEVAL_CACHE_ENABLED:
+            try:
+                report = asyncio.run(warm_caches(
+                    new_generation=True,
+                    warm=warmup and settings.CACHE_WARMUP_AFTER_SYNC,
+                    full=warmup_full
+                ))
+                if report is not None:
+                    log_warmup_report(report)
+            except Exception as e:
+                logger.error(f"Cache warm-up failed: {str(e)}")
+        
     except Exception as e:
         logger.error(f"Error in sync job: {str(e)}")
         raise
@@ -46,10 +99,18 @@ def main():
     """Main entry point for the sync job."""
     parser = argparse.ArgumentParser(description="Document synchronization job")
     parser.add_argument("--cleanup", action="store_true", help="Run document cleanup")
+    parser.add_argument("--workers", type=int, default=settings.SYNC_WORKERS, help="Sync worker processes")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the cache warm-up after the sync")
+    parser.add_argument("--warmup-full", action="store_true", help="Warm up with the full pipeline, not just retrieval")
     args = parser.parse_args()
     
     # Run the sync job
-    asyncio.run(run_sync())
+    run_sync(
+        workers=max(1, args.workers),
+        cleanup=args.cleanup,
+        warmup=not args.no_warmup,
+        warmup_full=args.warmup_full or None
+    )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,26 @@
+import logging
+import argparse
+
+from ..services.embeddings import export_onnx_model
+from ..config.settings import settings
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Export the embedding model for the ONNX Runtime backend."""
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL, help="sentence-transformers model name")
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_PATH, help="Output directory")
+    parser.add_argument("--no-quantize", action="store_true", help="Keep full-precision weights")
+    args = parser.parse_args()
+    
+    config = export_onnx_model(args.model, args.output, quantize=not args.no_quantize)
+    logger.info(f"Set EMBEDDING_BACKEND=onnx and EMBEDDING_ONNX_PATH={args.output} to use {config['model_file']}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+from typing import Any, Dict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from prometheus_client import start_http_server
+
+from ..config.settings import settings
+from ..core.profiling import start_loop_block_detector
+from ..core.registry import registry, get_job_queue, get_orchestrator
+from ..db.session import SessionLocal
+from ..models.query import Query
+from ..services.job_queue import JobQueue
+from ..services.query_log import query_metadata
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def log_query(job: Dict[str, Any], result: Dict[str, Any], processing_time: float) -> None:
+    """Record a finished job like a synchronous query."""
+    db = SessionLocal()
+    try:
+        db.add(Query(
+            query_text=job["query"],
+            response_text=result.get("response"),
+            confidence_score=result.get("confidence", 0.0),
+            processing_time=processing_time,
+            user_id=job.get("user_id"),
+            query_metadata={**query_metadata(result, job.get("timeout")), "job_id": job["id"]}
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+async def run_job(queue: JobQueue, job: Dict[str, Any]) -> None:
+    """Answer one job and store its result."""
+    started = time.perf_counter()
+    try:
+        result = await get_orchestrator().process_query(job["query"], job["context"], timeout=job.get("timeout"))
+    except Exception as e:
+        logger.error(f"Job {job['id']} failed: {str(e)}")
+        await queue.fail(job["id"], str(e), time.perf_counter() - started)
+        return
+
+    processing_time = time.perf_counter() - started
+    await queue.complete(job["id"], {**result, "processing_time": round(processing_time, 3)}, processing_time)
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, log_query, job, result, processing_time)
+    except Exception as e:
+        logger.error(f"Error logging job {job['id']}: {str(e)}")
+
+async def consume(queue: JobQueue, worker: str) -> None:
+    """Claim and run jobs one at a time, forever."""
+    while True:
+        try:
+            job = await queue.claim(worker)
+        except Exception as e:
+            logger.error(f"Error claiming job: {str(e)}")
+            await asyncio.sleep(1.0)
+            continue
+        if job is None:
+            continue
+        try:
+            await run_job(queue, job)
+        except Exception as e:
+            # The job stays claimed; recover() requeues it once its runtime lapses
+            logger.error(f"Error finishing job {job['id']}: {str(e)}")
+            await asyncio.sleep(1.0)
+
+async def recover(queue: JobQueue) -> None:
+    """Periodically requeue jobs abandoned by crashed workers."""
+    while True:
+        try:
+            await queue.recover()
+        except Exception as e:
+            logger.error(f"Error recovering jobs: {str(e)}")
+        await asyncio.sleep(queue.max_runtime / 2)
+
+async def serve(concurrency: int) -> None:
+    """Run ``concurrency`` jobs at a time in this process."""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = get_job_queue()
+    start_loop_block_detector()
+    logger.info(f"Query worker {worker} running {concurrency} job(s) at a time")
+    await asyncio.gather(recover(queue), *(consume(queue, worker) for _ in range(concurrency)))
+
+def worker_process(index: int, concurrency: int, metrics_port: int) -> None:
+    """Build shared models up front, then serve jobs.
+
+    Each process exposes its own metrics on ``metrics_port + index``.
+    """
+    if metrics_port:
+        start_http_server(metrics_port + index)
+    registry.warm_up()
+    asyncio.run(serve(concurrency))
+
+def main():
+    """Main entry point for query workers."""
+    parser = argparse.ArgumentParser(description="Worker answering queued query jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY, help="Jobs run at once per process")
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES, help="Worker processes")
+    parser.add_argument("--metrics-port", type=int, default=settings.JOB_WORKER_METRICS_PORT, help="Prometheus port, 0 to disable")
+    args = parser.parse_args()
+
+    concurrency = max(1, args.concurrency)
+    processes = max(1, args.processes)
+    if processes > 1:
+        with ProcessPoolExecutor(processes) as pool:
+            list(pool.map(partial(worker_process, concurrency=concurrency, metrics_port=args.metrics_port), range(processes)))
+    else:
+        worker_process(0, concurrency, args.metrics_port)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import logging
+import argparse
+import hashlib
+import hmac
+import json
+import time
+
+import httpx
+
+from ..config.settings import settings
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Send Confluence-style page events to the webhook, standing in for Confluence."""
+    parser = argparse.ArgumentParser(description="Send page change events to the reindex webhook")
+    parser.add_argument("page_ids", nargs="+", help="Confluence page ids")
+    parser.add_argument("--event", default="page_updated", help="page_created, page_updated, page_removed, ...")
+    parser.add_argument("--space", default=settings.CONFLUENCE_SPACE, help="Space key sent with the event")
+    parser.add_argument("--burst", type=int, default=1, help="Events per page, to exercise coalescing")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between events of a burst")
+    parser.add_argument("--url", default=f"http://localhost:{settings.API_PORT}/api/v1/webhooks/confluence")
+    args = parser.parse_args()
+
+    secret = (settings.CONFLUENCE_WEBHOOK_SECRET or "").encode()
+    with httpx.Client(timeout=10) as client:
+        for i in range(args.burst):
+            for page_id in args.page_ids:
+                body = json.dumps({
+                    "event": args.event,
+                    "timestamp": int(time.time() * 1000),
+                    "page": {"id": page_id, "spaceKey": args.space}
+                }).encode()
+                # Signed like Confluence does
+                signature = hmac.new(secret, body, hashlib.sha256).hexdigest()
+                response = client.post(args.url, content=body, headers={
+                    "Content-Type": "application/json",
+                    "X-Hub-Signature": f"sha256={signature}"
+                })
+                logger.info(f"{args.event} {page_id}: {response.status_code} {response.text}")
+            if i + 1 < args.burst:
+                time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
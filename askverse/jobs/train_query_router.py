@@ -0,0 +1,74 @@
+import logging
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+
+from ..config.settings import settings
+from ..core.registry import get_embedding_model, get_query_embedder
+from ..db.session import get_db
+from ..models.query import Query
+from ..services.query_router import QueryRouter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def load_examples(limit: int) -> Tuple[List[str], List[str]]:
+    """Query texts and routes of recent queries that went through LLM decomposition."""
+    db = next(get_db())
+    rows = (
+        db.query(Query.query_text, Query.query_metadata)
+        .order_by(Query.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    texts, labels = [], []
+    for query_text, metadata in rows:
+        # Routed queries were never decomposed, so only LLM decisions are labels
+        routing = (metadata or {}).get("routing") or {}
+        if query_text and routing.get("source") == "llm" and routing.get("label"):
+            texts.append(query_text)
+            labels.append(routing["label"])
+    return texts, labels
+
+def main():
+    """Train the query router from logged queries."""
+    parser = argparse.ArgumentParser(description="Train the local query router")
+    parser.add_argument("--limit", type=int, default=settings.QUERY_ROUTER_TRAINING_LIMIT, help="Logged queries to use")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of examples held out for evaluation")
+    parser.add_argument("--output", default=settings.QUERY_ROUTER_PATH, help="Router file")
+    args = parser.parse_args()
+
+    texts, labels = load_examples(args.limit)
+    if len(set(labels)) < 2:
+        logger.error(f"Need labelled queries for at least two routes, found {len(texts)} queries")
+        return
+    logger.info(f"Training on {len(texts)} queries: " + ", ".join(f"{label}={labels.count(label)}" for label in sorted(set(labels))))
+
+    embeddings = np.asarray(get_embedding_model().encode(texts, batch_size=64), dtype=np.float32)
+
+    # Evaluate on a holdout split, then fit on everything
+    order = np.random.default_rng(0).permutation(len(texts))
+    split = int(len(texts) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+
+    router = QueryRouter(get_query_embedder().encode)
+    router.fit(embeddings[train], [labels[i] for i in train])
+    report = router.evaluate(embeddings[test], [labels[i] for i in test])
+    logger.info(
+        f"Holdout accuracy {report['accuracy']}, direct routing covers {report['routed_coverage']} "
+        f"of queries with precision {report['routed_precision']}"
+    )
+
+    router.fit(embeddings, labels)
+    router.training_report = {"training_examples": len(texts), "holdout": report}
+    router.save(args.output)
+    logger.info(f"Saved {len(router.labels)} prototypes to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
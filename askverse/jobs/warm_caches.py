@@ -0,0 +1,63 @@
+from typing import Dict, Any, Optional
+import argparse
+import asyncio
+import logging
+
+from ..config.settings import settings
+from ..core.registry import get_retrieval_cache
+from ..db.session import SessionLocal
+from ..services.cache_warmer import CacheWarmer
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+async def warm_caches(
+    new_generation: bool = False,
+    warm: bool = True,
+    full: Optional[bool] = None,
+    limit: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Fill the shared caches from query history, first starting a new generation if asked.
+    
+    Returns the warm-up report, or None when only the generation was changed.
+    """
+    if new_generation:
+        generation = await get_retrieval_cache().invalidate()
+        logger.info(f"Retrieval cache generation {generation}")
+    if not warm:
+        return None
+    
+    db = SessionLocal()
+    try:
+        return await CacheWarmer(db, limit=limit, full=full).run()
+    finally:
+        db.close()
+
+def log_report(report: Dict[str, Any]) -> None:
+    """Log a warm-up report."""
+    logger.info(
+        f"Cache warm-up ({report['mode']}): {report['warmed']}/{report['selected']} queries warmed, "
+        f"{report['failed']} failed, {report['skipped']} skipped, {report['already_cached']} already cached, "
+        f"covering {report['coverage']:.1%} of {report['history_queries']} recent queries "
+        f"in {report['elapsed_seconds']}s"
+    )
+
+def main():
+    """Warm the caches after a deploy, or after an index change made outside the sync job."""
+    parser = argparse.ArgumentParser(description="Cache warm-up from query history")
+    parser.add_argument("--full", action="store_true", help="Run the full pipeline, not just retrieval")
+    parser.add_argument("--queries", type=int, default=settings.CACHE_WARMUP_QUERIES, help="Queries to replay")
+    parser.add_argument("--new-generation", action="store_true", help="Drop cached search results first")
+    args = parser.parse_args()
+    
+    if not settings.RETRIEVAL_CACHE_ENABLED:
+        logger.error("The retrieval cache is disabled; nothing to warm")
+        return
+    log_report(asyncio.run(warm_caches(new_generation=args.new_generation, full=args.full or None, limit=args.queries)))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,17 +1,36 @@
-from fastapi import FastAPI
+import time
+_import_started = time.perf_counter()
+
+import logging
+import os
+from typing import Optional
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
 
 from .api.router import router as api_router
-from .core.config import settings
-from .db.session import engine, Base
+from .config.settings import settings
+from .db.session import engine, Base, SessionLocal
+from .api.responses import FastJSONResponse
+from .core.auth import authenticate_token, can_profile
+from .core.compression import CompressionMiddleware
+from .core.profiling import SamplingProfiler, start_loop_block_detector
+from .core.registry import registry, get_job_queue, get_profile_store, get_reindex_queue
+
+registry.timings["import:askverse.main"] = time.perf_counter() - _import_started
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="AskVerse API",
     description="API for natural language querying of internal resources and external APIs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -22,6 +41,54 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+
+def _authorised_to_profile(authorization: Optional[str]) -> bool:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    db = SessionLocal()
+    try:
+        return can_profile(authenticate_token(token, db))
+    finally:
+        db.close()
+
+# Requests being profiled in this process. Samples cover the whole process, concurrent
+# requests included; profiling one request at a time only bounds the overhead
+_active_profiles = 0
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Sample stacks while handling a request that asks for it, for authorised users.
+    
+    The collapsed stacks are stored and their id returned in X-Profile-Id.
+    """
+    global _active_profiles
+    if settings.PROFILE_HEADER not in request.headers or _active_profiles:
+        return await call_next(request)
+    
+    # Claim the slot before awaiting, so concurrent requests cannot both take it
+    _active_profiles += 1
+    profiler = None
+    try:
+        if await run_in_threadpool(_authorised_to_profile, request.headers.get("authorization")):
+            profiler = SamplingProfiler()
+            profiler.start()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.stop()
+    finally:
+        _active_profiles -= 1
+    if profiler is None:
+        return await call_next(request)
+    
+    profile_id = await run_in_threadpool(get_profile_store().save, profiler)
+    summary = profiler.summary()
+    logger.info(f"Profiled {request.method} {request.url.path} as {profile_id}: {summary}")
+    response.headers["X-Profile-Id"] = profile_id
+    response.headers["X-Profile-Samples"] = str(summary["samples"])
+    return response
 
 # Include routers
 app.include_router(api_router, prefix="/api/v1")
@@ -45,8 +112,50 @@ async def pydantic_validation_exception_handler(request, exc):
 async def startup_event():
     """Initialize database tables on startup."""
     Base.metadata.create_all(bind=engine)
+    start_loop_block_detector()
+    
+    # Build shared models and clients without blocking startup
+    if settings.WARMUP_ON_STARTUP:
+        registry.start_background_warm_up()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background reindex workers."""
+    await get_reindex_queue().stop()
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics, including job queue depth and wait times."""
+    try:
+        await get_job_queue().export_metrics()
+    except Exception as e:
+        logger.warning(f"Job queue metrics unavailable: {e}")
+    
+    # Under the production server, aggregate the metrics of every worker
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        collector_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collector_registry)
+        return Response(generate_latest(collector_registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint reporting warm-up state of shared models and clients.
+
+    Only the resources in ``READY_RESOURCES`` gate readiness; the rest are
+    reported in ``components`` and built on first use if still pending.
+    """
+    ready = registry.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "warming",
+            "components": registry.status(),
+            "profile": registry.profile()
+        }
+    ) 
\ No newline at end of file
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, LargeBinary
+
+from .base import Base
+
+class Document(Base):
+    id = Column(String, primary_key=True, index=True)  # e.g. confluence_<page id>
+    title = Column(String)
+    url = Column(String)
+    source_type = Column(String)  # e.g., "confluence"
+    source_id = Column(String, index=True)
+    chunk_count = Column(Integer, default=1)  # vectors stored as <id>#0 .. <id>#<chunk_count - 1>
+    last_updated = Column(DateTime, index=True)
+
+class DocumentSync(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    status = Column(String)  # running, completed, failed
+    total_documents = Column(Integer, default=0)
+    successful_documents = Column(Integer, default=0)
+    failed_documents = Column(Integer, default=0)
+    error_log = Column(Text)
+
+class SyncShard(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    sync_id = Column(Integer, ForeignKey("documentsync.id"), index=True)
+    space = Column(String)
+    first_page_id = Column(String)
+    last_page_id = Column(String)
+    page_ids = Column(JSON)  # sorted page ids in the shard's range
+    checkpoint = Column(Integer, default=0)  # page_ids[:checkpoint] are done
+    status = Column(String, default="pending", index=True)  # pending, running, completed, failed
+    owner = Column(String)  # worker holding the lease
+    lease_expires = Column(DateTime)
+    attempts = Column(Integer, default=0)
+    successful_documents = Column(Integer, default=0)
+    failed_documents = Column(Integer, default=0)
+    error_log = Column(Text)
+
+class DocumentSignature(Base):
+    id = Column(String, primary_key=True)  # document id
+    source_id = Column(String)
+    signature = Column(LargeBinary)  # MinHash of the page's word shingles, uint32 values
+    canonical_id = Column(String, index=True)  # own id when indexed, else the indexed near-duplicate
+
+class SignatureBand(Base):
+    band = Column(String, primary_key=True)  # <band number>:<hash of the band's signature rows>
+    document_id = Column(String, primary_key=True, index=True)  # canonical documents only
\ No newline at end of file
@@ -10,7 +10,7 @@ class Query(Base):
     confidence_score = Column(Float)
     processing_time = Column(Float)  # in seconds
     user_id = Column(Integer, ForeignKey("user.id"))
-    metadata = Column(JSON)  # Store additional query metadata
+    query_metadata = Column("metadata", JSON)  # Store additional query metadata; "metadata" is reserved on models
     
     # Relationships
     user = relationship("User", back_populates="queries")
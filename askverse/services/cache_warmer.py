@@ -0,0 +1,122 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..core.batch import normalize_query
+from ..core.registry import get_orchestrator, get_retrieval_cache
+from ..models.query import Query
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Replays popular queries from the query log so the first users after a sync hit warm caches.
+
+    The most frequent queries of the last ``CACHE_WARMUP_HISTORY_DAYS`` (the
+    most recently asked first among equals) are replayed, ``concurrency`` at
+    a time, until ``limit`` are done or ``max_seconds`` have passed. Retrieval
+    replay fills the shared query embedding and search result caches; a full
+    replay also runs the agents, filling the API response cache at the cost
+    of LLM calls.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        full: Optional[bool] = None,
+        max_seconds: Optional[float] = None
+    ):
+        self.db = db
+        self.limit = limit or settings.CACHE_WARMUP_QUERIES
+        self.concurrency = concurrency or settings.CACHE_WARMUP_CONCURRENCY
+        self.full = settings.CACHE_WARMUP_FULL_PIPELINE if full is None else full
+        self.max_seconds = max_seconds or settings.CACHE_WARMUP_MAX_SECONDS
+        self.vector_store = VectorStore()
+
+    def select_queries(self) -> Tuple[List[Tuple[str, int]], int]:
+        """Queries to replay with how often each was asked, and the total asked in the window."""
+        since = datetime.utcnow() - timedelta(days=settings.CACHE_WARMUP_HISTORY_DAYS)
+        in_window = [Query.created_at >= since, Query.query_text.isnot(None)]
+        total = self.db.query(func.count(Query.id)).filter(*in_window).scalar() or 0
+
+        # Group case- and space-insensitively in SQL, then exactly as the batch runner does
+        key = func.lower(func.trim(Query.query_text))
+        rows = (
+            self.db.query(func.max(Query.query_text), func.count(Query.id), func.max(Query.created_at))
+            .filter(*in_window)
+            .group_by(key)
+            .order_by(func.count(Query.id).desc(), func.max(Query.created_at).desc())
+            .limit(self.limit * 2)
+            .all()
+        )
+
+        counts: Dict[str, List[Any]] = {}
+        for text, count, _ in rows:
+            normalized = normalize_query(text)
+            if not normalized:
+                continue
+            if normalized in counts:
+                counts[normalized][1] += count
+            else:
+                counts[normalized] = [text, count]
+        selected = sorted(counts.values(), key=lambda entry: -entry[1])[:self.limit]
+        return [(text, count) for text, count in selected], total
+
+    async def run(self) -> Dict[str, Any]:
+        """Replay the selected queries and report coverage and time spent."""
+        started = time.perf_counter()
+        queries, total = self.select_queries()
+        cache = get_retrieval_cache()
+        hits_before = cache.stats["hits"]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes: Dict[str, int] = {"warmed": 0, "failed": 0, "skipped": 0}
+        warmed_volume = 0
+
+        async def replay(text: str, count: int) -> None:
+            nonlocal warmed_volume
+            async with semaphore:
+                if time.perf_counter() - started > self.max_seconds:
+                    outcomes["skipped"] += 1
+                    return
+                try:
+                    if self.full:
+                        result = await get_orchestrator().process_query(text, {}, timeout=settings.CACHE_WARMUP_QUERY_TIMEOUT)
+                        if not result["success"]:
+                            raise RuntimeError(result.get("error"))
+                    else:
+                        await self.vector_store.asearch(text, top_k=5)
+                except Exception as e:
+                    outcomes["failed"] += 1
+                    logger.warning(f"Warm-up of {text!r} failed: {e}")
+                    return
+                outcomes["warmed"] += 1
+                warmed_volume += count
+
+        await asyncio.gather(*(replay(text, count) for text, count in queries))
+
+        elapsed = time.perf_counter() - started
+        report = {
+            "finished_at": datetime.utcnow().isoformat(),
+            "mode": "full" if self.full else "retrieval",
+            "generation": await cache.generation(),
+            "selected": len(queries),
+            **outcomes,
+            "already_cached": cache.stats["hits"] - hits_before,
+            "history_queries": total,
+            # Share of the window's traffic whose query is now warm
+            "coverage": round(warmed_volume / total, 3) if total else 0.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "seconds_per_query": round(elapsed / outcomes["warmed"], 3) if outcomes["warmed"] else None
+        }
+        await cache.save_warmup_report(report)
+        return report
\ No newline at end of file
@@ -1,40 +1,30 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 import hashlib
 
 from ..config.settings import settings
+from ..core import deadline
+from .storage_format import storage_to_text
 
 class ConfluenceService:
     def __init__(self):
         self.base_url = str(settings.CONFLUENCE_URL)
         self.space = settings.CONFLUENCE_SPACE
-        self.client = httpx.Client(timeout=30.0)
+        self.timeout = 30.0
+        self.client = httpx.AsyncClient(timeout=self.timeout)
     
     def _generate_doc_id(self, page_id: str) -> str:
         """Generate a unique document ID."""
         return f"confluence_{page_id}"
     
     def _clean_html(self, html: str) -> str:
-        """Clean HTML content and extract text."""
-        soup = BeautifulSoup(html, 'html.parser')
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        # Get text
-        text = soup.get_text()
-        # Break into lines and remove leading/trailing space
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        return text
+        """Clean storage-format HTML and extract structured text."""
+        return storage_to_text(html)
     
-    async def fetch_pages(self) -> List[Dict[str, Any]]:
-        """Fetch all pages from the Confluence space."""
-        pages = []
+    async def list_pages(self, space: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield page stubs from a Confluence space, one result page at a time."""
         start = 0
         limit = 25
         
@@ -43,59 +33,47 @@ class ConfluenceService:
             response = await self.client.get(
                 f"{self.base_url}/rest/api/content",
                 params={
-                    "spaceKey": self.space,
+                    "spaceKey": space or self.space,
                     "start": start,
                     "limit": limit,
                     "expand": "version"
-                }
+                },
+                timeout=deadline.timeout(self.timeout)
             )
             response.raise_for_status()
             data = response.json()
             
-            # Process pages
             for page in data["results"]:
-                # Get page content
-                content_response = await self.client.get(
-                    f"{self.base_url}/rest/api/content/{page['id']}",
-                    params={"expand": "body.storage"}
-                )
-                content_response.raise_for_status()
-                content_data = content_response.json()
-                
-                # Clean and process content
-                content = self._clean_html(content_data["body"]["storage"]["value"])
-                
-                # Create document
-                doc = {
-                    "id": self._generate_doc_id(page["id"]),
-                    "content": content,
-                    "source_type": "confluence",
-                    "source_id": page["id"],
-                    "title": page["title"],
-                    "url": f"{self.base_url}{page['_links']['webui']}",
-                    "last_updated": content_data["version"]["when"]
-                }
-                pages.append(doc)
+                yield page
             
             # Check if there are more pages
             if len(data["results"]) < limit:
                 break
             start += limit
+    
+    async def fetch_pages(self) -> List[Dict[str, Any]]:
+        """Fetch all pages from the Confluence space."""
+        pages = []
+        async for page in self.list_pages():
+            pages.append(await self.fetch_single_page(page["id"]))
         
         return pages
     
-    async def fetch_single_page(self, page_id: str) -> Dict[str, Any]:
-        """Fetch a single page from Confluence."""
-        # Get page content
+    async def fetch_page_storage(self, page_id: str) -> Dict[str, Any]:
+        """Fetch a page's raw storage-format body and version."""
         response = await self.client.get(
             f"{self.base_url}/rest/api/content/{page_id}",
-            params={"expand": "body.storage,version"}
+            params={"expand": "body.storage,version"},
+            timeout=deadline.timeout(self.timeout)
         )
         response.raise_for_status()
-        data = response.json()
-        
+        return response.json()
+    
+    def build_document(self, page_id: str, data: Dict[str, Any], content: Optional[str] = None) -> Dict[str, Any]:
+        """Clean a raw page and build its document; pass content if already extracted."""
         # Clean and process content
-        content = self._clean_html(data["body"]["storage"]["value"])
+        if content is None:
+            content = self._clean_html(data["body"]["storage"]["value"])
         
         # Create document
         doc = {
@@ -110,6 +88,15 @@ class ConfluenceService:
         
         return doc
     
+    async def fetch_single_page(self, page_id: str) -> Dict[str, Any]:
+        """Fetch a single page from Confluence."""
+        data = await self.fetch_page_storage(page_id)
+        # HTML parsing is CPU-bound; keep it off the event loop
+        content = await asyncio.get_running_loop().run_in_executor(
+            None, self._clean_html, data["body"]["storage"]["value"]
+        )
+        return self.build_document(page_id, data, content=content)
+    
     async def search_pages(self, query: str) -> List[Dict[str, Any]]:
         """Search pages in Confluence."""
         response = await self.client.get(
@@ -118,14 +105,11 @@ class ConfluenceService:
                 "spaceKey": self.space,
                 "cql": f"text ~ '{query}'",
                 "expand": "version"
-            }
+            },
+            timeout=deadline.timeout(self.timeout)
         )
         response.raise_for_status()
         data = response.json()
         
-        pages = []
-        for page in data["results"]:
-            doc = await self.fetch_single_page(page["id"])
-            pages.append(doc)
-        
-        return pages 
\ No newline at end of file
+        # Fetch the matching pages concurrently
+        return list(await asyncio.gather(*(self.fetch_single_page(page["id"]) for page in data["results"]))) 
\ No newline at end of file
@@ -0,0 +1,166 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import fcntl
+import json
+import logging
+import mmap
+import os
+import threading
+import zlib
+
+from ..config.settings import settings
+
+try:
+    import zstandard
+except ImportError:  # optional, zlib is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "content.dat"
+INDEX_FILE = "content.idx"
+
+
+class ContentStore:
+    """Local store for document text, kept out of vector metadata.
+
+    Compressed blobs are appended to a single data file and located through an
+    append-only offset index (last entry per id wins, length -1 marks a
+    delete). Reads go through a memory map of the data file and pick up
+    entries appended by other processes, e.g. the sync job.
+
+    Writers in any process serialize on an exclusive ``flock`` of the data
+    file, held from reading its size until the index entries are written,
+    so offsets always point at the writer's own bytes.
+    """
+
+    def __init__(self, path: Optional[str] = None, codec: Optional[str] = None):
+        self.path = Path(path or settings.CONTENT_STORE_PATH)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.path / DATA_FILE
+        self.index_path = self.path / INDEX_FILE
+        self.data_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+
+        codec = codec or settings.CONTENT_STORE_CODEC
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, compressing content with zlib")
+            codec = "zlib"
+        self.codec = codec
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int, str]] = {}
+        self._index_size = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._mmap_size = 0
+
+    def put(self, doc_id: str, text: str) -> None:
+        """Store the text for a document, replacing any previous version."""
+        self.put_many({doc_id: text})
+
+    def put_many(self, documents: Dict[str, str]) -> None:
+        """Store text for several documents with one append per file."""
+        if not documents:
+            return
+
+        blobs = []
+        entries = []
+        for doc_id, text in documents.items():
+            blobs.append(self._compress(text.encode("utf-8")))
+
+        with self._lock, open(self.data_path, "ab") as data_file:
+            fcntl.flock(data_file.fileno(), fcntl.LOCK_EX)
+            # Size under the lock: another process may have appended since we opened
+            offset = os.fstat(data_file.fileno()).st_size
+            for doc_id, blob in zip(documents, blobs):
+                entries.append((doc_id, offset, len(blob), self.codec))
+                offset += len(blob)
+            data_file.write(b"".join(blobs))
+            data_file.flush()
+            os.fsync(data_file.fileno())
+
+            # Index after data so readers never see an entry without its bytes
+            self._append_index(entries)
+            # Closing the file releases the lock
+
+    def delete(self, doc_ids: Iterable[str]) -> None:
+        """Forget documents; their bytes stay in the data file."""
+        entries = [(doc_id, 0, -1, self.codec) for doc_id in doc_ids]
+        with self._lock, open(self.data_path, "ab") as data_file:
+            fcntl.flock(data_file.fileno(), fcntl.LOCK_EX)
+            self._append_index(entries)
+
+    def get(self, doc_id: str) -> Optional[str]:
+        """Return the text for a document, or None if unknown."""
+        return self.get_many([doc_id]).get(doc_id)
+
+    def get_many(self, doc_ids: Iterable[str]) -> Dict[str, str]:
+        """Return text for the known documents among doc_ids."""
+        with self._lock:
+            self._refresh()
+            results = {}
+            for doc_id in doc_ids:
+                entry = self._index.get(doc_id)
+                if entry is None:
+                    continue
+                offset, length, codec = entry
+                blob = self._mmap[offset:offset + length]
+                results[doc_id] = self._decompress(blob, codec).decode("utf-8")
+            return results
+
+    def __contains__(self, doc_id: str) -> bool:
+        """Whether text is stored for a document."""
+        with self._lock:
+            self._refresh()
+            return doc_id in self._index
+
+    def _append_index(self, entries: List[Tuple[str, int, int, str]]) -> None:
+        """Append (id, offset, length, codec) entries to the index file; callers hold the data file lock."""
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        with open(self.index_path, "a", encoding="utf-8") as index_file:
+            fcntl.flock(index_file.fileno(), fcntl.LOCK_EX)
+            index_file.write(lines)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+    def _refresh(self) -> None:
+        """Load index entries and remap data appended since the last read."""
+        index_size = self.index_path.stat().st_size
+        if index_size != self._index_size:
+            if index_size < self._index_size:
+                # Index was rewritten, start over
+                self._index = {}
+                self._index_size = 0
+            with open(self.index_path, "rb") as index_file:
+                index_file.seek(self._index_size)
+                for line in index_file:
+                    if not line.endswith(b"\n"):
+                        break  # partially written by another process
+                    self._index_size += len(line)
+                    doc_id, offset, length, codec = json.loads(line)
+                    if length < 0:
+                        self._index.pop(doc_id, None)
+                    else:
+                        self._index[doc_id] = (offset, length, codec)
+
+        data_size = self.data_path.stat().st_size
+        if data_size != self._mmap_size:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = None
+            if data_size:
+                with open(self.data_path, "rb") as data_file:
+                    self._mmap = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_size = data_size
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress a blob with the configured codec."""
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data, 6)
+
+    def _decompress(self, blob: bytes, codec: str) -> bytes:
+        """Decompress a blob written with the given codec."""
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return zlib.decompress(blob)
\ No newline at end of file
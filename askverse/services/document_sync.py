@@ -1,143 +1,622 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
 from datetime import datetime, timedelta
 import logging
-from pathlib import Path
 import json
+import os
+import socket
 
-from ..core.config import settings
+import httpx
+import numpy as np
+from sqlalchemy import delete, or_, and_, text
+from sqlalchemy.dialects.postgresql import insert
+
+from ..config.settings import settings
 from ..services.confluence import ConfluenceService
-from ..services.vector_store import VectorStoreService
-from ..db.models import Document, DocumentSync
+from ..services.vector_store import VectorStore
+from ..services.pipeline import Stage, StreamingPipeline
+from ..services.storage_format import storage_to_text
+from ..services.near_duplicates import NearDuplicateIndex
+from ..models.document import Document, DocumentSync, SyncShard
 from ..db.session import get_db
 
 logger = logging.getLogger(__name__)
 
+# Advisory lock serialising sync planning across workers
+SYNC_PLAN_LOCK_KEY = 0x61736B76
+
 class DocumentSyncService:
-    def __init__(self):
+    def __init__(self, offload_db: bool = False):
         self.confluence = ConfluenceService()
-        self.vector_store = VectorStoreService()
+        self.vector_store = VectorStore()
         self.db = next(get_db())
+        # Run single-page reindexing's database calls in a thread, off the server's event loop;
+        # the session is then used by one task at a time
+        self.offload_db = offload_db
+        self.duplicates = NearDuplicateIndex(self.db)
+        # Canonical pages decided in this process but not stored yet
+        self._in_flight: Dict[str, np.ndarray] = {}
+        # Pages whose near-duplicate was removed or changed; indexed on their own
+        self.detached: Set[str] = set()
+    
+    def _build_pipeline(
+        self,
+        on_done: Callable[[List[str], Optional[Dict[str, Any]]], None],
+        clean_executor: ProcessPoolExecutor = None
+    ) -> StreamingPipeline:
+        """Build the fetch -> clean -> dedupe -> chunk -> embed -> upsert -> store pipeline.
+        
+        ``on_done(page_ids, error)`` is called as pages leave the pipeline,
+        stored (error None) or failed. Near-duplicates of an indexed page
+        pass through without chunks and are stored as its aliases.
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def fetch(page: Dict[str, Any]) -> Dict[str, Any]:
+            data = await self.confluence.fetch_page_storage(page["id"])
+            return {"page_id": page["id"], "data": data}
+        
+        async def clean(raw: Dict[str, Any]) -> Dict[str, Any]:
+            # HTML parsing is CPU-bound; run it in the process pool when there is one
+            html = raw["data"]["body"]["storage"]["value"]
+            content = await loop.run_in_executor(clean_executor, storage_to_text, html)
+            return self.confluence.build_document(raw["page_id"], raw["data"], content=content)
+        
+        async def dedupe(doc: Dict[str, Any]) -> Dict[str, Any]:
+            return await self._dedupe(doc)
+        
+        async def chunk(doc: Dict[str, Any]) -> Dict[str, Any]:
+            # Aliases are not indexed; search finds their canonical page
+            doc["chunks"] = [] if doc["canonical_id"] else self.vector_store.chunk_document(doc)
+            doc["content"] = None  # chunks carry the text from here on
+            return doc
+        
+        async def embed(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            chunks = [chunk for doc in docs for chunk in doc["chunks"]]
+            if chunks:
+                await loop.run_in_executor(None, self.vector_store.embed_chunks, chunks)
+            return docs
+        
+        async def upsert(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            chunks = [chunk for doc in docs for chunk in doc["chunks"]]
+            if chunks:
+                await loop.run_in_executor(None, self.vector_store.upsert_chunks, chunks)
+            for doc in docs:
+                doc["chunk_count"] = len(doc.pop("chunks"))
+            return docs
+        
+        async def store(docs: List[Dict[str, Any]]) -> None:
+            # Pages that became aliases drop the vectors they had as canonical pages
+            await self._drop_vectors([doc["id"] for doc in docs if doc["canonical_id"]])
+            self._record_duplicates(docs)
+            self.upsert_documents(docs)
+            on_done([doc["source_id"] for doc in docs], None)
+        
+        def on_error(stage: str, items: List[Dict[str, Any]], error: Exception) -> None:
+            if stage == "store":
+                self.db.rollback()
+            for item in items:
+                self._in_flight.pop(item.get("id"), None)
+                # Items carry the page id as "id" (fetch), "page_id" (clean) or "source_id" (later)
+                page_id = item.get("source_id") or item.get("page_id") or item.get("id")
+                on_done([page_id], {
+                    "id": item.get("id") or page_id,
+                    "title": item.get("title"),
+                    "stage": stage,
+                    "status": "error",
+                    "error": str(error)
+                })
+        
+        return StreamingPipeline(
+            [
+                Stage("fetch", fetch, workers=settings.SYNC_FETCH_WORKERS),
+                Stage("clean", clean, workers=settings.SYNC_CLEAN_WORKERS),
+                # One worker, so pages in flight are compared with each other in order
+                Stage("dedupe", dedupe),
+                Stage("chunk", chunk),
+                Stage("embed", embed, batch_size=settings.SYNC_EMBED_BATCH_SIZE),
+                Stage("upsert", upsert, workers=settings.SYNC_UPSERT_WORKERS, batch_size=settings.SYNC_UPSERT_BATCH_SIZE),
+                Stage("store", store, batch_size=settings.SYNC_DB_BATCH_SIZE),
+            ],
+            queue_size=settings.SYNC_QUEUE_SIZE,
+            on_error=on_error
+        )
+    
+    async def _run_db(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking database call, in a thread when ``offload_db`` is set."""
+        if not self.offload_db:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def _dedupe(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Set a document's MinHash signature and, for a near-duplicate, the canonical page's id."""
+        doc["canonical_id"] = None
+        doc["signature"] = None
+        if not settings.DEDUP_ENABLED:
+            return doc
+        
+        loop = asyncio.get_running_loop()
+        doc["signature"] = await loop.run_in_executor(None, self.duplicates.signature, doc["content"])
+        if doc["signature"] is None:
+            return doc
+        
+        match = await self._run_db(self.duplicates.find_canonical, doc["id"], doc["signature"], self._in_flight)
+        if match is None:
+            self._in_flight[doc["id"]] = doc["signature"]
+        else:
+            doc["canonical_id"], score = match
+            logger.debug(f"{doc['id']} is a near-duplicate of {doc['canonical_id']} ({score:.2f})")
+        return doc
+    
+    def _record_duplicates(self, docs: List[Dict[str, Any]]) -> None:
+        """Store signatures of processed documents with the index's other changes; the caller commits."""
+        for doc in docs:
+            self._in_flight.pop(doc["id"], None)
+        if not settings.DEDUP_ENABLED:
+            return
+        # Pages too short to compare leave the index, and their aliases with them
+        self.detached.update(self.duplicates.forget(doc["id"] for doc in docs if doc["signature"] is None))
+        self.detached.update(self.duplicates.record(docs))
     
-    async def process_document(self, doc: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single document and generate embeddings."""
+    async def _drop_vectors(self, doc_ids: List[str]) -> None:
+        """Delete the vectors of documents that are no longer indexed."""
+        if not doc_ids:
+            return
+        indexed = await self._run_db(lambda: self.db.query(Document.id, Document.chunk_count).filter(
+            Document.id.in_(doc_ids),
+            Document.chunk_count > 0
+        ).all())
+        vector_ids = [
+            vector_id
+            for doc_id, chunk_count in indexed
+            for vector_id in self.vector_store.chunk_ids(doc_id, chunk_count)
+        ]
+        if vector_ids:
+            await asyncio.get_running_loop().run_in_executor(None, self.vector_store.delete_documents, vector_ids)
+    
+    async def _reindex_detached(self) -> None:
+        """Index pages on their own after their canonical page was removed or changed."""
+        while self.detached:
+            page_id = self.detached.pop()
+            try:
+                await self.reindex_page(page_id)
+            except Exception as e:
+                logger.error(f"Error reindexing detached page {page_id}: {str(e)}")
+    
+    def upsert_documents(self, docs: List[Dict[str, Any]]) -> None:
+        """Insert or update document rows with one INSERT ... ON CONFLICT statement."""
+        if not docs:
+            return
+        
+        now = datetime.utcnow()
+        rows = {
+            doc["id"]: {
+                "id": doc["id"],
+                "title": doc["title"],
+                "url": doc["url"],
+                "source_type": doc["source_type"],
+                "source_id": doc["source_id"],
+                "chunk_count": doc["chunk_count"],
+                "last_updated": now,
+                "created_at": now,
+                "updated_at": now
+            }
+            for doc in docs
+        }
+        
+        statement = insert(Document).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[Document.id],
+            set_={
+                column: statement.excluded[column]
+                for column in ["title", "url", "source_type", "source_id", "chunk_count", "last_updated", "updated_at"]
+            }
+        )
+        self.db.execute(statement)
+        self.db.commit()
+    
+    async def sync_documents(self, worker_id: Optional[str] = None) -> Dict[str, Any]:
+        """Synchronize documents from Confluence to vector database.
+        
+        Joins the running sync (planning one if there is none) and works
+        through its shards until none are left to claim. Any number of
+        workers, in one or several processes or hosts, can run this at once;
+        a shard abandoned by a dead worker is resumed from its checkpoint once
+        its lease lapses.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
         try:
-            # Extract content and metadata
-            content = doc.get("content", "")
-            title = doc.get("title", "")
-            url = doc.get("url", "")
-            doc_id = doc.get("id", "")
-            
-            # Generate embeddings
-            embeddings = await self.vector_store.generate_embeddings(content)
-            
-            # Create document record
-            document = Document(
-                id=doc_id,
-                title=title,
-                content=content,
-                url=url,
-                embeddings=embeddings,
-                source_type="confluence",
-                last_updated=datetime.utcnow()
-            )
+            sync = await self._get_or_plan_sync()
             
-            # Store in vector database
-            await self.vector_store.store_document(document)
+            metrics = {}
+            clean_executor = ProcessPoolExecutor(settings.SYNC_CLEAN_PROCESSES) if settings.SYNC_CLEAN_PROCESSES else None
+            try:
+                while True:
+                    shard = self._claim_shard(sync.id, worker_id)
+                    if shard is None:
+                        break
+                    metrics[shard.id] = await self._process_shard(shard, clean_executor)
+            finally:
+                if clean_executor:
+                    clean_executor.shutdown()
             
-            # Store in relational database
-            self.db.add(document)
-            self.db.commit()
+            await self._reindex_detached()
             
-            return {
-                "id": doc_id,
-                "title": title,
-                "status": "success"
-            }
+            report = self._finalize_sync(sync.id)
+            report["metrics"] = metrics
+            report["duplicates"] = dict(self.duplicates.stats)
+            return report
             
         except Exception as e:
-            logger.error(f"Error processing document {doc.get('id')}: {str(e)}")
+            logger.error(f"Error in document sync: {str(e)}")
+            self.db.rollback()
+            
             return {
-                "id": doc.get("id"),
-                "title": doc.get("title"),
                 "status": "error",
                 "error": str(e)
             }
     
-    async def sync_documents(self) -> Dict[str, Any]:
-        """Synchronize documents from Confluence to vector database."""
-        try:
-            # Create sync record
-            sync = DocumentSync(
-                start_time=datetime.utcnow(),
-                status="running"
-            )
+    async def _get_or_plan_sync(self) -> DocumentSync:
+        """Return the running sync, planning a new one with its shards if there is none."""
+        # Only one worker plans; the others block here and then join its sync
+        self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SYNC_PLAN_LOCK_KEY})
+        
+        sync = (
+            self.db.query(DocumentSync)
+            .filter(DocumentSync.status == "running")
+            .order_by(DocumentSync.id.desc())
+            .first()
+        )
+        if sync is None:
+            sync = DocumentSync(start_time=datetime.utcnow(), status="running")
             self.db.add(sync)
-            self.db.commit()
+            self.db.flush()
             
-            # Fetch documents from Confluence
-            documents = await self.confluence.fetch_documents()
+            total = 0
+            for space in settings.CONFLUENCE_SPACES or [settings.CONFLUENCE_SPACE]:
+                page_ids = [page["id"] async for page in self.confluence.list_pages(space)]
+                page_ids.sort(key=lambda page_id: (len(page_id), page_id))  # numeric order
+                for i in range(0, len(page_ids), settings.SYNC_SHARD_SIZE):
+                    shard_ids = page_ids[i:i + settings.SYNC_SHARD_SIZE]
+                    self.db.add(SyncShard(
+                        sync_id=sync.id,
+                        space=space,
+                        first_page_id=shard_ids[0],
+                        last_page_id=shard_ids[-1],
+                        page_ids=shard_ids,
+                        checkpoint=0,
+                        status="pending",
+                        attempts=0,
+                        successful_documents=0,
+                        failed_documents=0
+                    ))
+                total += len(page_ids)
             
-            # Process documents
-            tasks = [self.process_document(doc) for doc in documents]
-            results = await asyncio.gather(*tasks)
+            sync.total_documents = total
+            logger.info(f"Planned sync {sync.id}: {total} pages")
+        else:
+            logger.info(f"Joining sync {sync.id}")
+        
+        # Commit releases the planning lock
+        self.db.commit()
+        return sync
+    
+    def _claim_shard(self, sync_id: int, worker_id: str) -> Optional[SyncShard]:
+        """Lease the next pending shard, or one whose owner's lease has lapsed."""
+        while True:
+            now = datetime.utcnow()
+            shard = (
+                self.db.query(SyncShard)
+                .filter(
+                    SyncShard.sync_id == sync_id,
+                    or_(
+                        SyncShard.status == "pending",
+                        and_(SyncShard.status == "running", SyncShard.lease_expires < now)
+                    )
+                )
+                .order_by(SyncShard.id)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if shard is None:
+                self.db.commit()
+                return None
             
-            # Update sync record
-            sync.end_time = datetime.utcnow()
-            sync.status = "completed"
-            sync.total_documents = len(documents)
-            sync.successful_documents = len([r for r in results if r["status"] == "success"])
-            sync.failed_documents = len([r for r in results if r["status"] == "error"])
-            sync.error_log = json.dumps([r for r in results if r["status"] == "error"])
+            if shard.attempts >= settings.SYNC_SHARD_MAX_ATTEMPTS:
+                shard.status = "failed"
+                shard.lease_expires = None
+                self.db.commit()
+                logger.error(f"Giving up on shard {shard.id} after {shard.attempts} attempts")
+                continue
             
+            if shard.status == "running":
+                logger.warning(
+                    f"Resuming shard {shard.id} at {shard.checkpoint}/{len(shard.page_ids)}, "
+                    f"lease of {shard.owner} expired"
+                )
+            shard.status = "running"
+            shard.owner = worker_id
+            shard.attempts += 1
+            shard.lease_expires = now + timedelta(seconds=settings.SYNC_LEASE_SECONDS)
             self.db.commit()
+            return shard
+    
+    def _update_owned_shard(self, shard_id: int, worker_id: str, values: Dict[str, Any]) -> bool:
+        """Update a shard only while this worker still holds it; False once it has been taken over."""
+        updated = self.db.query(SyncShard).filter(
+            SyncShard.id == shard_id,
+            SyncShard.owner == worker_id,
+            SyncShard.status == "running"
+        ).update(values, synchronize_session=False)
+        self.db.commit()
+        return updated == 1
+    
+    async def _process_shard(self, shard: SyncShard, clean_executor: ProcessPoolExecutor = None) -> Dict[str, Any]:
+        """Run a shard's remaining pages through the pipeline, checkpointing as they finish.
+        
+        Every write to the shard is fenced on this worker still owning it, and
+        the lease is renewed on a heartbeat. If another worker has taken the
+        shard over after a lapsed lease, processing stops and the new owner's
+        checkpoint and counters are left alone.
+        """
+        shard_id, worker_id = shard.id, shard.owner
+        page_ids = list(shard.page_ids)
+        errors = json.loads(shard.error_log or "[]")
+        progress = {
+            "checkpoint": shard.checkpoint,
+            "successful_documents": shard.successful_documents or 0,
+            "failed_documents": shard.failed_documents or 0
+        }
+        start = progress["checkpoint"]
+        outcomes: Dict[str, Optional[Dict[str, Any]]] = {}
+        lost = asyncio.Event()
+        
+        def lease() -> datetime:
+            return datetime.utcnow() + timedelta(seconds=settings.SYNC_LEASE_SECONDS)
+        
+        def on_done(done_ids: List[str], error: Optional[Dict[str, Any]]) -> None:
+            if lost.is_set():
+                return
+            for page_id in done_ids:
+                outcomes[page_id] = error
             
-            return {
-                "status": "success",
-                "total_documents": sync.total_documents,
-                "successful_documents": sync.successful_documents,
-                "failed_documents": sync.failed_documents
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in document sync: {str(e)}")
-            
-            # Update sync record with error
-            sync.end_time = datetime.utcnow()
-            sync.status = "failed"
-            sync.error_log = str(e)
-            self.db.commit()
+            # Pages finish out of order; advance the checkpoint over the finished prefix
+            checkpoint = progress["checkpoint"]
+            while checkpoint < len(page_ids) and page_ids[checkpoint] in outcomes:
+                outcome = outcomes.pop(page_ids[checkpoint])
+                if outcome is None:
+                    progress["successful_documents"] += 1
+                else:
+                    progress["failed_documents"] += 1
+                    errors.append(outcome)
+                checkpoint += 1
             
-            return {
-                "status": "error",
-                "error": str(e)
+            if checkpoint != progress["checkpoint"]:
+                progress["checkpoint"] = checkpoint
+                values = {**progress, "error_log": json.dumps(errors), "lease_expires": lease()}
+                if not self._update_owned_shard(shard_id, worker_id, values):
+                    lost.set()
+        
+        async def heartbeat() -> None:
+            # Renew on a timer, so one slow page does not let the lease lapse
+            failures = 0
+            while not lost.is_set():
+                await asyncio.sleep(settings.SYNC_HEARTBEAT_SECONDS)
+                try:
+                    renewed = self._update_owned_shard(shard_id, worker_id, {"lease_expires": lease()})
+                except Exception as e:
+                    # A transient database error; retry on the next beat
+                    self.db.rollback()
+                    failures += 1
+                    logger.warning(f"Error renewing lease on shard {shard_id} ({failures} in a row): {str(e)}")
+                    if failures >= settings.SYNC_HEARTBEAT_MAX_FAILURES:
+                        logger.error(f"Giving up shard {shard_id} after {failures} failed lease renewals")
+                        lost.set()
+                    continue
+                failures = 0
+                if not renewed:
+                    lost.set()
+        
+        async def remaining_pages():
+            for page_id in page_ids[start:]:
+                yield {"id": page_id}
+        
+        logger.info(
+            f"Syncing shard {shard_id} ({shard.space} {shard.first_page_id}..{shard.last_page_id}) "
+            f"from {start}/{len(page_ids)}"
+        )
+        pipeline = asyncio.create_task(self._build_pipeline(on_done, clean_executor).run(remaining_pages()))
+        renewal = asyncio.create_task(heartbeat())
+        takeover = asyncio.create_task(lost.wait())
+        try:
+            await asyncio.wait([pipeline, takeover], return_when=asyncio.FIRST_COMPLETED)
+            if lost.is_set():
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+                self.db.rollback()
+                # Canonical pages of the abandoned pipeline were never stored
+                self._in_flight.clear()
+                logger.warning(
+                    f"Lost the lease on shard {shard_id} at {progress['checkpoint']}/{len(page_ids)}, "
+                    f"another worker owns it"
+                )
+                return {"lease_lost": True, "checkpoint": progress["checkpoint"]}
+            metrics = pipeline.result()
+        except Exception:
+            # Hand the shard back; it is retried from its checkpoint
+            self.db.rollback()
+            self._update_owned_shard(shard_id, worker_id, {"status": "pending", "lease_expires": None})
+            raise
+        finally:
+            for task in [pipeline, renewal, takeover]:
+                task.cancel()
+        
+        if not self._update_owned_shard(shard_id, worker_id, {"status": "completed", "lease_expires": None}):
+            logger.warning(f"Shard {shard_id} was taken over before it completed; its new owner finishes it")
+            metrics["lease_lost"] = True
+        return metrics
+    
+    def _finalize_sync(self, sync_id: int) -> Dict[str, Any]:
+        """Merge shard results into the sync record once every shard is done."""
+        sync = self.db.query(DocumentSync).get(sync_id)
+        shards = self.db.query(SyncShard).filter(SyncShard.sync_id == sync_id).all()
+        
+        successful = sum(shard.successful_documents or 0 for shard in shards)
+        # Pages a failed shard never reached count as failed
+        failed = sum(
+            (shard.failed_documents or 0)
+            + (len(shard.page_ids) - shard.checkpoint if shard.status == "failed" else 0)
+            for shard in shards
+        )
+        statuses = [shard.status for shard in shards]
+        finished = all(status in ["completed", "failed"] for status in statuses)
+        
+        if finished:
+            errors = [error for shard in shards for error in json.loads(shard.error_log or "[]")]
+            # Several workers may finish at once; only the first update applies
+            self.db.query(DocumentSync).filter(
+                DocumentSync.id == sync_id,
+                DocumentSync.status == "running"
+            ).update({
+                "end_time": datetime.utcnow(),
+                "status": "completed",
+                "successful_documents": successful,
+                "failed_documents": failed,
+                "error_log": json.dumps(errors)
+            }, synchronize_session=False)
+        self.db.commit()
+        
+        return {
+            "status": "success",
+            "sync_id": sync_id,
+            "sync_status": "completed" if finished else "running",
+            "total_documents": sync.total_documents,
+            "successful_documents": successful,
+            "failed_documents": failed,
+            "shards": {
+                status: statuses.count(status)
+                for status in ["pending", "running", "completed", "failed"]
             }
+        }
+    
+    async def reindex_page(self, page_id: str) -> Dict[str, Any]:
+        """Fetch one page and replace its vectors and document row.
+        
+        A near-duplicate of an indexed page drops its vectors and is stored
+        as that page's alias.
+        """
+        try:
+            doc = await self.confluence.fetch_single_page(page_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return await self.remove_page(page_id)
+            raise
+        
+        try:
+            await self._dedupe(doc)
+            if doc["canonical_id"]:
+                await self._drop_vectors([doc["id"]])
+                doc["chunk_count"] = 0
+            else:
+                previous_chunk_count = await self._run_db(
+                    lambda: self.db.query(Document.chunk_count).filter(Document.id == doc["id"]).scalar()
+                )
+                metadata = {key: doc[key] for key in ["source_type", "source_id", "title", "url", "last_updated"]}
+                doc["chunk_count"] = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self.vector_store.update_document,
+                    doc["id"],
+                    doc["content"],
+                    metadata,
+                    previous_chunk_count or 0
+                )
+            await self._run_db(self._store_page, doc)
+        except Exception:
+            await self._run_db(self.db.rollback)
+            self._in_flight.pop(doc["id"], None)
+            raise
+        
+        await self._reindex_detached()
+        
+        return {
+            "status": "success",
+            "action": "updated",
+            "id": doc["id"],
+            "chunk_count": doc["chunk_count"],
+            "canonical_id": doc["canonical_id"]
+        }
+    
+    def _store_page(self, doc: Dict[str, Any]) -> None:
+        """Store a reindexed page's signature and document row."""
+        self._record_duplicates([doc])
+        self.upsert_documents([doc])
+    
+    def _forget_page(self, doc_id: str) -> None:
+        """Drop a removed page from the near-duplicate index and commit its removal."""
+        self.detached.update(self.duplicates.forget([doc_id]))
+        self.db.commit()
+    
+    async def remove_page(self, page_id: str) -> Dict[str, Any]:
+        """Remove one page's vectors and document row."""
+        doc_id = self.confluence._generate_doc_id(page_id)
+        try:
+            removed = await self._run_db(lambda: self.db.execute(
+                delete(Document).where(Document.id == doc_id).returning(Document.chunk_count)
+            ).all())
+            chunk_count = (removed[0][0] if removed else None) or 1
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.vector_store.delete_documents,
+                self.vector_store.chunk_ids(doc_id, chunk_count)
+            )
+            await self._run_db(self._forget_page, doc_id)
+        except Exception:
+            await self._run_db(self.db.rollback)
+            raise
+        
+        # Aliases of a removed page are indexed in its place
+        await self._reindex_detached()
+        
+        return {
+            "status": "success",
+            "action": "removed",
+            "id": doc_id,
+            "found": bool(removed)
+        }
     
     async def cleanup_old_documents(self, days: int = 30) -> Dict[str, Any]:
         """Remove documents older than specified days."""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            # Get old documents
-            old_docs = self.db.query(Document).filter(
-                Document.last_updated < cutoff_date
+            # Remove from relational database in one statement; commit only
+            # once the vectors are gone so a failure leaves both stores intact
+            removed = self.db.execute(
+                delete(Document)
+                .where(Document.last_updated < cutoff_date)
+                .returning(Document.id, Document.chunk_count)
             ).all()
             
-            # Remove from vector database
-            for doc in old_docs:
-                await self.vector_store.delete_document(doc.id)
+            # Remove from vector database in id batches
+            vector_ids = [
+                vector_id
+                for doc_id, chunk_count in removed
+                for vector_id in self.vector_store.chunk_ids(doc_id, chunk_count or 1)
+            ]
+            await asyncio.get_running_loop().run_in_executor(None, self.vector_store.delete_documents, vector_ids)
             
-            # Remove from relational database
-            for doc in old_docs:
-                self.db.delete(doc)
+            self.detached.update(self.duplicates.forget(doc_id for doc_id, _ in removed))
             self.db.commit()
+            await self._reindex_detached()
             
             return {
                 "status": "success",
-                "removed_documents": len(old_docs)
+                "removed_documents": len(removed)
             }
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error in document cleanup: {str(e)}")
             return {
                 "status": "error",
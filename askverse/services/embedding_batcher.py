@@ -0,0 +1,158 @@
+from typing import Dict, Any, Callable, List, Optional, Set
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+
+import numpy as np
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Collects concurrent query-encode requests into batched forward passes.
+
+    Requests are held for up to ``max_wait_ms`` or until ``max_batch`` are
+    queued, encoded in one call off the event loop, and each caller's future is
+    resolved with its own embedding. Recent query embeddings are kept in a
+    small LRU, and in the ``shared`` cache (see ``RetrievalCache``) when one is
+    given, so other processes and later runs skip the forward pass.
+    """
+
+    def __init__(
+        self,
+        model_getter: Callable[[], Any],
+        max_batch: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        shared: Optional[Any] = None
+    ):
+        self.model_getter = model_getter
+        self.max_batch = max_batch or settings.QUERY_EMBED_MAX_BATCH
+        self.max_wait = (settings.QUERY_EMBED_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.cache_size = settings.QUERY_EMBED_CACHE_SIZE if cache_size is None else cache_size
+        self.shared = shared
+
+        # One encode at a time; the next batch fills while the current one runs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-embed")
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[str] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks; hold running batches until done
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {"requests": 0, "cache_hits": 0, "shared_hits": 0, "batches": 0, "encoded": 0}
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Return the embedding for a query, batched with concurrent requests."""
+        self.stats["requests"] += 1
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._reset(loop)
+
+        if self.shared is not None and text not in self._inflight:
+            embedding = await self.shared.get_embedding(text)
+            if embedding is not None:
+                self._remember(text, embedding)
+                self.stats["shared_hits"] += 1
+                return embedding
+
+        # Identical queries in flight share one slot in the batch
+        future = self._inflight.get(text)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[text] = future
+            self._pending.append(text)
+
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        # Shield so one caller's cancellation doesn't fail the others
+        return await asyncio.shield(future)
+
+    async def encode_many(self, texts: List[str]) -> np.ndarray:
+        """Encode many texts in bulk forward passes and cache them like single queries."""
+        loop = asyncio.get_running_loop()
+        embeddings = await loop.run_in_executor(
+            self._executor,
+            lambda: self.model_getter().encode(texts, batch_size=self.max_batch)
+        )
+        self.stats["batches"] += 1
+        self.stats["encoded"] += len(texts)
+        self.prime(texts, embeddings)
+        return embeddings
+
+    def prime(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """Put known embeddings in the cache so the next encode of these texts is a hit."""
+        for text, embedding in zip(texts, embeddings):
+            self._remember(text, embedding)
+
+    def _reset(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind to a new event loop, dropping state tied to the old one."""
+        self._loop = loop
+        self._pending = []
+        self._inflight = {}
+        self._flush_handle = None
+        self._tasks = set()
+
+    def _flush(self) -> None:
+        """Send the pending requests as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            futures = [self._inflight.pop(text) for text in batch]
+            task = self._loop.create_task(self._run(batch, futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[str], futures: List[asyncio.Future]) -> None:
+        """Encode a batch off the event loop and resolve its futures."""
+        try:
+            embeddings = await self._loop.run_in_executor(self._executor, self._encode, batch)
+        except Exception as e:
+            logger.error(f"Error encoding query batch of {len(batch)}: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["encoded"] += len(batch)
+
+        for text, future, embedding in zip(batch, futures, embeddings):
+            self._remember(text, embedding)
+            if not future.done():
+                future.set_result(embedding)
+
+        if self.shared is not None:
+            await self.shared.put_embeddings(batch, embeddings)
+
+    def _encode(self, batch: List[str]) -> np.ndarray:
+        """Run the batched forward pass (executor thread)."""
+        return self.model_getter().encode(batch, batch_size=len(batch))
+
+    def _remember(self, text: str, embedding: np.ndarray) -> None:
+        """Keep a recent query embedding, evicting the least recently used."""
+        if self.cache_size <= 0:
+            return
+
+        self._cache[text] = embedding
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
\ No newline at end of file
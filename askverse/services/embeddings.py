@@ -0,0 +1,140 @@
+from typing import List, Dict, Any, Union
+from pathlib import Path
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "embedding_config.json"
+
+
+class ONNXEmbeddingModel:
+    """Sentence embedding model running an int8-quantised ONNX export on CPU.
+
+    Drop-in replacement for ``SentenceTransformer.encode``: mean pooling over
+    the transformer output, normalised when the source model normalises.
+    """
+
+    def __init__(self, model_dir: str, num_threads: int = 0):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        config_path = model_dir / CONFIG_FILE
+        if not config_path.exists():
+            raise FileNotFoundError(
+                f"ONNX embedding model not found in {model_dir}; "
+                f"export it with `python -m askverse.jobs.export_onnx_model`"
+            )
+        self.config = json.loads(config_path.read_text())
+
+        # Fast (Rust) tokenizer saved alongside the model
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.config["max_length"])
+        pad_token = self.config.get("pad_token", "[PAD]")
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token), pad_token=pad_token)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / self.config["model_file"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension of the exported model."""
+        return self.config["dimension"]
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode one sentence or a list of sentences."""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        embeddings = []
+        for i in range(0, len(sentences), batch_size):
+            embeddings.append(self._encode_batch(sentences[i:i + batch_size]))
+
+        if not embeddings:
+            return np.zeros((0, self.config["dimension"]), dtype=np.float32)
+
+        embeddings = np.vstack(embeddings)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, batch: List[str]) -> np.ndarray:
+        """Run one forward pass and pool token embeddings into sentence embeddings."""
+        encodings = self.tokenizer.encode_batch(batch)
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {name: inputs[name] for name in self.input_names})[0]
+
+        # Mean pooling over non-padding tokens
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.config.get("normalize", False):
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+        return pooled.astype(np.float32)
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = True) -> Dict[str, Any]:
+    """Export a sentence-transformers model to ONNX, optionally int8-quantised."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    transformer.config.return_dict = False  # export a plain tensor output
+    tokenizer = model[0].tokenizer
+    tokenizer.save_pretrained(str(output_dir))
+
+    # Positional order of the transformer's forward()
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ["input_ids", "attention_mask", "token_type_ids"] if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = output_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+    model_file = fp32_path.name
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantize_dynamic(str(fp32_path), str(output_dir / "model_int8.onnx"), weight_type=QuantType.QInt8)
+        model_file = "model_int8.onnx"
+
+    config = {
+        "model_name": model_name,
+        "model_file": model_file,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "max_length": model.max_seq_length,
+        "pad_token": tokenizer.pad_token,
+        "normalize": any(isinstance(module, Normalize) for module in model),
+    }
+    (output_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2))
+
+    logger.info(f"Exported {model_name} to {output_dir / model_file}")
+    return config
\ No newline at end of file
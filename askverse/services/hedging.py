@@ -0,0 +1,87 @@
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+from collections import deque
+import asyncio
+import logging
+import time
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies for one upstream."""
+
+    def __init__(self, window: int = 500, min_samples: Optional[int] = None):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = settings.HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+
+    def record(self, seconds: float) -> None:
+        """Add one call's latency."""
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile q, or None until enough calls were seen."""
+        if len(self.samples) < max(1, self.min_samples):
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def hedged(
+    call: Callable[[], Awaitable[Any]],
+    tracker: LatencyTracker,
+    quantile: Optional[float] = None,
+    max_hedges: Optional[int] = None
+) -> Any:
+    """Run a call, starting a duplicate if it is slower than the tracked quantile.
+
+    Whichever attempt finishes first wins and the others are cancelled. Only
+    use for idempotent reads.
+    """
+    quantile = settings.HEDGE_QUANTILE if quantile is None else quantile
+    max_hedges = settings.HEDGE_MAX_ATTEMPTS - 1 if max_hedges is None else max_hedges
+    hedge_after = tracker.percentile(quantile)
+    tracker.stats["calls"] += 1
+
+    attempts: List[asyncio.Future] = []
+    started: List[float] = []
+
+    def launch() -> None:
+        attempts.append(asyncio.ensure_future(call()))
+        started.append(time.perf_counter())
+
+    launch()
+    try:
+        while True:
+            can_hedge = hedge_after is not None and len(attempts) <= max_hedges
+            pending = [attempt for attempt in attempts if not attempt.done()]
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_after if can_hedge else None,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # Slower than usual; race a second attempt against the first
+                tracker.stats["hedged"] += 1
+                launch()
+                continue
+
+            for attempt in done:
+                if attempt.exception() is None:
+                    index = attempts.index(attempt)
+                    tracker.record(time.perf_counter() - started[index])
+                    if index > 0:
+                        tracker.stats["hedge_wins"] += 1
+                    return attempt.result()
+
+            # Every attempt failed: retry while hedging allows, else give up
+            if all(attempt.done() for attempt in attempts):
+                if not can_hedge:
+                    raise next(iter(done)).exception()
+                launch()
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
\ No newline at end of file
@@ -0,0 +1,344 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging
+import threading
+import time
+
+import httpx
+import redis
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_METHODS = {"GET"}
+
+
+def parse_cache_control(header: Optional[str]) -> Dict[str, Any]:
+    """Parse a Cache-Control header into a directive dict."""
+    directives = {}
+    if not header:
+        return directives
+
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        value = value.strip().strip('"')
+        if value.isdigit():
+            directives[name] = int(value)
+        else:
+            directives[name] = value or True
+
+    return directives
+
+
+class HTTPResponseCache:
+    """Two-tier (memory + Redis) cache for outbound API responses.
+
+    Entries are keyed by method, URL and normalised params and follow HTTP
+    caching semantics: ``Cache-Control`` freshness, ``ETag`` revalidation and
+    ``stale-while-revalidate``.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.max_entries = settings.API_CACHE_MAX_ENTRIES
+        self.max_bytes = settings.API_CACHE_MAX_BYTES
+        self.default_ttl = settings.API_CACHE_DEFAULT_TTL
+        self.ttl_overrides = settings.API_CACHE_TTL_OVERRIDES
+        self.stale_while_revalidate = settings.API_CACHE_STALE_WHILE_REVALIDATE
+        self.retain_seconds = settings.API_CACHE_RETAIN_SECONDS
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Background revalidation for stale-while-revalidate hits
+        self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-cache")
+        self._revalidating = set()
+
+        # Shared tier is optional; the memory tier works without it
+        self._redis = None
+        redis_url = redis_url or (str(settings.REDIS_URL) if settings.API_CACHE_USE_REDIS else None)
+        if redis_url:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.warning(f"API response cache running without Redis: {e}")
+
+        self.stats = {"hits": 0, "stale_hits": 0, "revalidated": 0, "misses": 0, "bypassed": 0}
+
+    def make_key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Build a cache key from method, URL, normalised params and request headers."""
+        normalised = sorted(
+            (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+        )
+        # Credentials do not change the response, header parameters may
+        varying = sorted(
+            (k.lower(), v) for k, v in (headers or {}).items() if k.lower() != "authorization"
+        )
+        raw = json.dumps([method.upper(), url.rstrip("/"), normalised, varying])
+        return f"askverse:api_cache:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def ttl_for(self, endpoint_info: Optional[Dict[str, Any]]) -> int:
+        """Resolve the default TTL for an endpoint from spec or tag overrides."""
+        if not endpoint_info:
+            return self.default_ttl
+
+        endpoint = endpoint_info.get("endpoint", {})
+        candidates = [
+            endpoint.get("operation_id", ""),
+            *endpoint.get("tags", []),
+            endpoint_info.get("spec_id", ""),
+            endpoint_info.get("spec_title", ""),
+        ]
+        for candidate in candidates:
+            if candidate and candidate in self.ttl_overrides:
+                return self.ttl_overrides[candidate]
+
+        return self.default_ttl
+
+    def request(
+        self,
+        client: httpx.Client,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json_body: Any = None,
+        default_ttl: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Make a request through the cache and return the decoded JSON body.
+
+        ``timeout`` overrides the client's timeout for upstream calls made on
+        behalf of this request.
+        """
+        method = method.upper()
+        headers = dict(headers or {})
+        default_ttl = self.default_ttl if default_ttl is None else default_ttl
+
+        if method not in CACHEABLE_METHODS or json_body is not None or default_ttl <= 0:
+            self.stats["bypassed"] += 1
+            response = client.request(
+                method=method, url=url, params=params, headers=headers, json=json_body,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+            )
+            response.raise_for_status()
+            return response.json()
+
+        key = self.make_key(method, url, params, headers)
+        entry = self._get(key)
+        state = self._freshness(entry)
+
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return entry["body"]
+
+        if state == "stale":
+            # Serve stale and refresh in the background
+            self.stats["stale_hits"] += 1
+            self._schedule_revalidation(key, entry, client, method, url, params, headers, default_ttl)
+            return entry["body"]
+
+        self.stats["misses"] += 1
+        return self._fetch(key, entry, client, method, url, params, headers, default_ttl, timeout)
+
+    def _fetch(
+        self,
+        key: str,
+        entry: Optional[Dict[str, Any]],
+        client: httpx.Client,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        default_ttl: int,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Fetch from upstream, revalidating a previous entry when possible."""
+        request_headers = dict(headers)
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = client.request(
+            method=method, url=url, params=params, headers=request_headers,
+            timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        )
+
+        if response.status_code == 304 and entry:
+            self.stats["revalidated"] += 1
+            refreshed = self._build_entry(response, entry["body"], default_ttl, entry)
+            if refreshed:
+                self._set(key, refreshed)
+            return entry["body"]
+
+        response.raise_for_status()
+        body = response.json()
+
+        new_entry = self._build_entry(response, body, default_ttl)
+        if new_entry:
+            self._set(key, new_entry)
+        else:
+            self._delete(key)
+
+        return body
+
+    def _build_entry(
+        self,
+        response: httpx.Response,
+        body: Any,
+        default_ttl: int,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Build a cache entry from response headers, or None if uncacheable."""
+        directives = parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in directives:
+            return None
+
+        if "no-cache" in directives:
+            max_age = 0
+        elif isinstance(directives.get("s-maxage"), int):
+            max_age = directives["s-maxage"]
+        elif isinstance(directives.get("max-age"), int):
+            max_age = directives["max-age"]
+        else:
+            max_age = default_ttl
+
+        swr = directives.get("stale-while-revalidate")
+        if "no-cache" in directives or "must-revalidate" in directives:
+            # A stale entry must be revalidated before it is used, never served as is
+            swr = 0
+        elif not isinstance(swr, int):
+            swr = self.stale_while_revalidate
+
+        etag = response.headers.get("etag") or (previous or {}).get("etag")
+        last_modified = response.headers.get("last-modified") or (previous or {}).get("last_modified")
+
+        # Without freshness or a validator there is nothing worth keeping
+        if max_age <= 0 and not etag and not last_modified:
+            return None
+
+        return {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "max_age": max_age,
+            "swr": swr,
+        }
+
+    def _freshness(self, entry: Optional[Dict[str, Any]]) -> str:
+        """Classify an entry as fresh, stale (servable) or expired."""
+        if not entry:
+            return "missing"
+
+        age = time.time() - entry["stored_at"]
+        if age < entry["max_age"]:
+            return "fresh"
+        if age < entry["max_age"] + entry["swr"]:
+            return "stale"
+        return "expired"
+
+    def _schedule_revalidation(self, key, entry, client, method, url, params, headers, default_ttl) -> None:
+        """Revalidate a stale entry once in the background."""
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def revalidate():
+            try:
+                self._fetch(key, entry, client, method, url, params, headers, default_ttl)
+            except Exception as e:
+                logger.warning(f"Background revalidation failed for {url}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._revalidator.submit(revalidate)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry in memory, falling back to Redis."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self._redis is None:
+            return None
+
+        try:
+            raw = self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"API response cache Redis read failed: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        self._set_memory(key, entry, len(raw))
+        return entry
+
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry in both tiers."""
+        raw = json.dumps(entry)
+        self._set_memory(key, entry, len(raw))
+
+        if self._redis is None:
+            return
+
+        # Keep entries around after expiry so they can still be revalidated
+        ttl = entry["max_age"] + entry["swr"] + self.retain_seconds
+        try:
+            self._redis.set(key, raw, ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning(f"API response cache Redis write failed: {e}")
+
+    def _set_memory(self, key: str, entry: Dict[str, Any], size: int) -> None:
+        """Store an entry in the memory tier, evicting least recently used."""
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(evicted)
+
+    def _delete(self, key: str) -> None:
+        """Remove an entry from both tiers."""
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._total_bytes -= self._sizes.pop(key)
+
+        if self._redis is not None:
+            try:
+                self._redis.delete(key)
+            except Exception as e:
+                logger.warning(f"API response cache Redis delete failed: {e}")
\ No newline at end of file
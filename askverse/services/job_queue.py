@@ -0,0 +1,265 @@
+from typing import Dict, Any, List, Optional
+import json
+import logging
+import time
+import uuid
+
+import redis.asyncio as aioredis
+from prometheus_client import Counter, Gauge, Histogram
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Queue gauges are read from Redis, so any one server worker's latest value is right
+QUEUE_DEPTH = Gauge("askverse_job_queue_depth", "Jobs waiting for a worker", multiprocess_mode="livemostrecent")
+JOBS_RUNNING = Gauge(
+    "askverse_jobs_running",
+    "Jobs claimed by a worker and not yet finished",
+    multiprocess_mode="livemostrecent"
+)
+OLDEST_WAIT = Gauge(
+    "askverse_job_oldest_wait_seconds",
+    "How long the oldest waiting job has been queued",
+    multiprocess_mode="livemostrecent"
+)
+RECENT_WAIT = Gauge(
+    "askverse_job_recent_wait_seconds",
+    "Queue wait of recently started jobs",
+    ["quantile"],
+    multiprocess_mode="livemostrecent"
+)
+JOB_WAIT = Histogram(
+    "askverse_job_wait_seconds",
+    "Time from submission until a worker started the job",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+JOB_RUN = Histogram(
+    "askverse_job_run_seconds",
+    "Time a worker spent processing a job",
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+JOBS_FINISHED = Counter("askverse_jobs_finished_total", "Jobs finished by workers", ["status"])
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting for a worker."""
+
+
+class JobQueue:
+    """Redis-backed queue of queries answered by separate worker processes.
+
+    A job is a hash under ``{prefix}:job:{id}``. Waiting job ids sit in the
+    ``{prefix}:pending`` list and move atomically to ``{prefix}:running`` when
+    a worker claims one, so jobs of a crashed worker can be requeued. Finished
+    jobs, with their result, expire ``result_ttl`` seconds after completion.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        prefix: Optional[str] = None,
+        result_ttl: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_runtime: Optional[float] = None
+    ):
+        self.redis = aioredis.Redis.from_url(redis_url or str(settings.REDIS_URL), decode_responses=True)
+        self.prefix = prefix or settings.JOB_QUEUE_PREFIX
+        self.result_ttl = result_ttl or settings.JOB_RESULT_TTL
+        self.max_pending = max_pending or settings.JOB_MAX_PENDING
+        self.max_runtime = max_runtime or settings.JOB_MAX_RUNTIME
+
+        self.pending_key = f"{self.prefix}:pending"
+        self.running_key = f"{self.prefix}:running"
+        self.waits_key = f"{self.prefix}:waits"
+        self.counts_key = f"{self.prefix}:counts"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    async def submit(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        user_id: Optional[int] = None
+    ) -> str:
+        """Queue a query and return its job id."""
+        if await self.redis.llen(self.pending_key) >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} jobs are already waiting")
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": PENDING,
+            "query": query,
+            "context": json.dumps(context or {}),
+            "submitted_at": time.time(),
+            "attempts": 0
+        }
+        if timeout is not None:
+            job["timeout"] = timeout
+        if user_id is not None:
+            job["user_id"] = user_id
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # Unclaimed jobs must not linger forever if no worker is running
+            pipe.hset(self._job_key(job_id), mapping=job)
+            pipe.expire(self._job_key(job_id), settings.JOB_PENDING_TTL)
+            pipe.lpush(self.pending_key, job_id)
+            pipe.hincrby(self.counts_key, "submitted", 1)
+            await pipe.execute()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's state and, once finished, its result; None when unknown or expired."""
+        job = await self.redis.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+
+        job["context"] = json.loads(job.get("context") or "{}")
+        if "result" in job:
+            job["result"] = json.loads(job["result"])
+        for key in ("timeout", "submitted_at", "started_at", "finished_at", "wait_seconds", "run_seconds"):
+            if key in job:
+                job[key] = float(job[key])
+        for key in ("user_id", "attempts"):
+            if key in job:
+                job[key] = int(job[key])
+        return job
+
+    async def claim(self, worker: str, block_seconds: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Take the oldest waiting job, or None when none arrives within ``block_seconds``."""
+        job_id = await self.redis.blmove(self.pending_key, self.running_key, block_seconds, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+
+        started = time.time()
+        submitted_at = await self.redis.hget(self._job_key(job_id), "submitted_at")
+        if submitted_at is None:
+            # Expired while waiting
+            await self.redis.lrem(self.running_key, 1, job_id)
+            return None
+
+        wait_seconds = max(0.0, started - float(submitted_at))
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "status": RUNNING,
+                "worker": worker,
+                "started_at": started,
+                "wait_seconds": wait_seconds
+            })
+            pipe.hincrby(self._job_key(job_id), "attempts", 1)
+            pipe.lpush(self.waits_key, wait_seconds)
+            pipe.ltrim(self.waits_key, 0, settings.JOB_WAIT_SAMPLES - 1)
+            await pipe.execute()
+        JOB_WAIT.observe(wait_seconds)
+        return await self.get(job_id)
+
+    async def complete(self, job_id: str, result: Dict[str, Any], run_seconds: float) -> None:
+        """Store a job's result and start its expiry."""
+        await self._finish(job_id, COMPLETED, run_seconds, result=json.dumps(result, default=str))
+
+    async def fail(self, job_id: str, error: str, run_seconds: float = 0.0) -> None:
+        """Mark a job failed and start its expiry."""
+        await self._finish(job_id, FAILED, run_seconds, error=error)
+
+    async def _finish(self, job_id: str, job_status: str, run_seconds: float, **fields: Any) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "status": job_status,
+                "finished_at": time.time(),
+                "run_seconds": run_seconds,
+                **fields
+            })
+            pipe.expire(self._job_key(job_id), self.result_ttl)
+            pipe.lrem(self.running_key, 1, job_id)
+            pipe.hincrby(self.counts_key, job_status, 1)
+            await pipe.execute()
+        JOB_RUN.observe(run_seconds)
+        JOBS_FINISHED.labels(status=job_status).inc()
+
+    async def recover(self) -> int:
+        """Requeue jobs running longer than ``max_runtime``; their worker is presumed dead.
+
+        Jobs that already used up their attempts are failed instead.
+        """
+        requeued = 0
+        now = time.time()
+        for job_id in await self.redis.lrange(self.running_key, 0, -1):
+            job = await self.redis.hmget(self._job_key(job_id), "started_at", "attempts")
+            started_at, attempts = job
+            if started_at is None:
+                # Expired, or claimed and not yet marked running
+                if not await self.redis.exists(self._job_key(job_id)):
+                    await self.redis.lrem(self.running_key, 1, job_id)
+                continue
+            if now - float(started_at) < self.max_runtime:
+                continue
+
+            if int(attempts or 0) >= settings.JOB_MAX_ATTEMPTS:
+                logger.warning(f"Job {job_id} failed after {attempts} attempts")
+                await self.fail(job_id, "Job exceeded its maximum runtime")
+                continue
+
+            # Only the worker that removes it from the running list requeues it
+            if await self.redis.lrem(self.running_key, 1, job_id):
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(self._job_key(job_id), "status", PENDING)
+                    pipe.hdel(self._job_key(job_id), "started_at", "worker")
+                    pipe.rpush(self.pending_key, job_id)
+                    await pipe.execute()
+                requeued += 1
+
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs of unresponsive workers")
+        return requeued
+
+    async def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs, recent wait times and totals."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(self.pending_key)
+            pipe.llen(self.running_key)
+            pipe.lindex(self.pending_key, -1)
+            pipe.lrange(self.waits_key, 0, -1)
+            pipe.hgetall(self.counts_key)
+            depth, running, oldest_id, waits, counts = await pipe.execute()
+
+        oldest_wait = 0.0
+        if oldest_id is not None:
+            submitted_at = await self.redis.hget(self._job_key(oldest_id), "submitted_at")
+            if submitted_at is not None:
+                oldest_wait = max(0.0, time.time() - float(submitted_at))
+
+        waits = sorted(float(wait) for wait in waits)
+        return {
+            "pending": depth,
+            "running": running,
+            "oldest_wait_seconds": round(oldest_wait, 3),
+            "wait_seconds": {
+                f"p{int(q * 100)}": round(_percentile(waits, q), 3) for q in (0.5, 0.95, 0.99)
+            },
+            "wait_samples": len(waits),
+            "totals": {key: int(value) for key, value in counts.items()}
+        }
+
+    async def export_metrics(self) -> Dict[str, Any]:
+        """Refresh the queue gauges from Redis; returns the stats used."""
+        stats = await self.stats()
+        QUEUE_DEPTH.set(stats["pending"])
+        JOBS_RUNNING.set(stats["running"])
+        OLDEST_WAIT.set(stats["oldest_wait_seconds"])
+        for quantile, seconds in stats["wait_seconds"].items():
+            RECENT_WAIT.labels(quantile=quantile).set(seconds)
+        return stats
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
\ No newline at end of file
@@ -0,0 +1,221 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import logging
+import re
+import zlib
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..models.document import DocumentSignature, SignatureBand
+
+logger = logging.getLogger(__name__)
+
+# Shingle hashes are permuted modulo a Mersenne prime, so a * x + b fits in 64 bits
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+
+def _order(doc_id: str) -> Tuple[int, str]:
+    """Sort key putting documents in page id (creation) order."""
+    return len(doc_id), doc_id
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if a.shape != b.shape:
+        return 0.0
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of page signatures, kept in Postgres across syncs.
+
+    A page's signature is the MinHash of its word shingles; its ``bands``
+    slices are hashed into band keys, and pages sharing a band key with a
+    page are its candidate near-duplicates. Candidates are confirmed by the
+    estimated Jaccard similarity reaching ``threshold``.
+
+    Within a group of near-duplicates the page with the lowest id is the
+    canonical one: only it is embedded and indexed, the others are recorded
+    as its aliases. Only canonical pages are banded, so lookups touch
+    nothing but indexed pages. Every sync re-decides each page it fetches,
+    so groups heal themselves when pages change.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None
+    ):
+        self.db = db
+        self.num_perm = num_perm or settings.DEDUP_NUM_PERM
+        self.bands = bands or settings.DEDUP_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError(f"DEDUP_NUM_PERM ({self.num_perm}) must be a multiple of DEDUP_BANDS ({self.bands})")
+        self.rows = self.num_perm // self.bands
+        self.threshold = threshold or settings.DEDUP_THRESHOLD
+
+        # Fixed seed: signatures must stay comparable across runs and processes
+        rng = np.random.RandomState(settings.DEDUP_SEED)
+        self._a = rng.randint(1, _PRIME, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=self.num_perm, dtype=np.uint64)
+
+        self.stats = {"canonical": 0, "duplicates": 0, "skipped": 0, "rehomed": 0, "detached": 0}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None when it is too short to compare."""
+        words = _WORD.findall((text or "").lower())
+        size = settings.DEDUP_SHINGLE_SIZE
+        shingles = {" ".join(words[i:i + size]) for i in range(max(0, len(words) - size + 1))}
+        if len(shingles) < settings.DEDUP_MIN_SHINGLES:
+            return None
+
+        hashes = np.fromiter((zlib.crc32(shingle.encode()) % _PRIME for shingle in shingles), dtype=np.uint64)
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        # Bound the (shingles x permutations) matrix for long pages
+        for i in range(0, len(hashes), 4096):
+            permuted = (hashes[i:i + 4096, None] * self._a + self._b) % _PRIME
+            np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        """LSH keys of a signature, one per band."""
+        return [
+            f"{band}:{hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(self.bands)
+        ]
+
+    def find_canonical(
+        self,
+        doc_id: str,
+        signature: np.ndarray,
+        in_flight: Optional[Dict[str, np.ndarray]] = None
+    ) -> Optional[Tuple[str, float]]:
+        """The indexed page this one is a near-duplicate of, with the similarity, or None.
+
+        ``in_flight`` holds canonical pages decided but not yet stored, so
+        duplicates processed close together in one run are caught too.
+        """
+        candidates = {
+            row.id: np.frombuffer(row.signature, dtype=np.uint32)
+            for row in self.db.query(DocumentSignature).filter(
+                DocumentSignature.id.in_(
+                    select(SignatureBand.document_id).where(SignatureBand.band.in_(self.band_keys(signature)))
+                ),
+                DocumentSignature.canonical_id == DocumentSignature.id
+            )
+        }
+        candidates.update(in_flight or {})
+
+        # Only earlier pages qualify, so concurrent workers never alias two pages to each other
+        matches = [
+            (score, candidate_id)
+            for candidate_id, candidate in candidates.items()
+            if _order(candidate_id) < _order(doc_id)
+            for score in [similarity(signature, candidate)]
+            if score >= self.threshold
+        ]
+        if not matches:
+            return None
+        # Most similar first, then the earliest page
+        score, canonical_id = min(matches, key=lambda match: (-match[0], _order(match[1])))
+        return canonical_id, score
+
+    def record(self, docs: List[Dict[str, Any]]) -> List[str]:
+        """Store the signatures and canonical ids of processed documents; the caller commits.
+
+        Aliases of a document that changed are moved to its new canonical
+        page while still similar to it, and detached otherwise. Returns the
+        page ids of detached aliases, which need indexing in their own right.
+        """
+        compared = [doc for doc in docs if doc.get("signature") is not None]
+        self.stats["skipped"] += len(docs) - len(compared)
+        docs = compared
+        if not docs:
+            return []
+
+        canonical = {doc["id"]: doc.get("canonical_id") or doc["id"] for doc in docs}
+        signatures = {doc["id"]: doc["signature"] for doc in docs}
+
+        now = datetime.utcnow()
+        statement = insert(DocumentSignature).values([
+            {
+                "id": doc["id"],
+                "source_id": doc["source_id"],
+                "signature": doc["signature"].tobytes(),
+                "canonical_id": canonical[doc["id"]],
+                "created_at": now,
+                "updated_at": now
+            }
+            for doc in docs
+        ])
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[DocumentSignature.id],
+            set_={column: statement.excluded[column] for column in ["source_id", "signature", "canonical_id", "updated_at"]}
+        ))
+
+        self.db.execute(delete(SignatureBand).where(SignatureBand.document_id.in_(list(signatures))))
+        bands = [
+            {"band": band, "document_id": doc_id}
+            for doc_id, signature in signatures.items()
+            if canonical[doc_id] == doc_id
+            for band in self.band_keys(signature)
+        ]
+        if bands:
+            self.db.execute(insert(SignatureBand).values(bands).on_conflict_do_nothing())
+
+        self.stats["canonical"] += sum(1 for doc_id in canonical if canonical[doc_id] == doc_id)
+        self.stats["duplicates"] += sum(1 for doc_id in canonical if canonical[doc_id] != doc_id)
+        return self._rehome_aliases(canonical, signatures)
+
+    def _rehome_aliases(self, canonical: Dict[str, str], signatures: Dict[str, np.ndarray]) -> List[str]:
+        """Point aliases of the given documents at their current canonical page."""
+        aliases = self.db.query(DocumentSignature).filter(
+            DocumentSignature.canonical_id.in_(list(canonical)),
+            DocumentSignature.id.notin_(list(canonical))
+        ).all()
+
+        detached = []
+        for alias in aliases:
+            target = canonical[alias.canonical_id]
+            target_signature = signatures.get(target)
+            if target_signature is None:
+                row = self.db.query(DocumentSignature.signature).filter(DocumentSignature.id == target).scalar()
+                target_signature = np.frombuffer(row, dtype=np.uint32) if row is not None else None
+
+            if target_signature is not None and similarity(np.frombuffer(alias.signature, dtype=np.uint32), target_signature) >= self.threshold:
+                if target != alias.canonical_id:
+                    alias.canonical_id = target
+                    self.stats["rehomed"] += 1
+            else:
+                detached.append(alias.source_id)
+                self.db.delete(alias)
+
+        self.stats["detached"] += len(detached)
+        return detached
+
+    def forget(self, doc_ids: Iterable[str]) -> List[str]:
+        """Drop documents from the index; the caller commits.
+
+        Returns the page ids of their aliases, which are detached and need
+        indexing in their own right.
+        """
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return []
+        self.db.execute(delete(SignatureBand).where(SignatureBand.document_id.in_(doc_ids)))
+        self.db.execute(delete(DocumentSignature).where(DocumentSignature.id.in_(doc_ids)))
+        detached = self.db.execute(
+            delete(DocumentSignature)
+            .where(DocumentSignature.canonical_id.in_(doc_ids))
+            .returning(DocumentSignature.source_id)
+        ).scalars().all()
+        self.stats["detached"] += len(detached)
+        return list(detached)
\ No newline at end of file
@@ -1,13 +1,38 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import json
+import re
 import yaml
 from pathlib import Path
 import hashlib
 
+SPEC_SUFFIXES = {".json", ".yaml", ".yml"}
+
 class OpenAPIService:
     def __init__(self, specs_dir: str = "specs"):
         self.specs_dir = Path(specs_dir)
         self.specs_dir.mkdir(exist_ok=True)
+        self._catalogue: Dict[str, Dict[str, Any]] = {}  # spec path -> processed spec
+    
+    def _spec_paths(self) -> List[Path]:
+        """Spec files in the specs directory."""
+        return sorted(path for path in self.specs_dir.glob("**/*") if path.suffix in SPEC_SUFFIXES)
+    
+    def load(self) -> List[Dict[str, Any]]:
+        """Parse every spec once, re-parsing only specs changed on disk since."""
+        catalogue = {}
+        for spec_path in self._spec_paths():
+            key = str(spec_path)
+            cached = self._catalogue.get(key)
+            try:
+                if cached is not None and cached["last_updated"] == spec_path.stat().st_mtime:
+                    catalogue[key] = cached
+                else:
+                    catalogue[key] = self.process_spec(key)
+            except Exception as e:
+                print(f"Error processing spec {spec_path}: {e}")
+        
+        self._catalogue = catalogue
+        return list(catalogue.values())
     
     def _generate_spec_id(self, spec_path: str) -> str:
         """Generate a unique spec ID."""
@@ -47,7 +72,7 @@ class OpenAPIService:
                     "description": operation.get("description", ""),
                     "parameters": operation.get("parameters", []),
                     "request_body": operation.get("requestBody", {}),
-                    "responses": operation.get("responses", {}),
+                    "responses": self._resolve_refs(operation.get("responses", {}), spec),
                     "tags": operation.get("tags", []),
                     "operation_id": operation.get("operationId", ""),
                     "url": f"{base_url}{path}"
@@ -56,6 +81,23 @@ class OpenAPIService:
         
         return endpoints
     
+    def _resolve_refs(self, node: Any, spec: Dict[str, Any], seen: Tuple[str, ...] = ()) -> Any:
+        """Inline local $refs, leaving recursive references empty."""
+        if isinstance(node, list):
+            return [self._resolve_refs(item, spec, seen) for item in node]
+        if not isinstance(node, dict):
+            return node
+        
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/"):
+            if ref in seen:
+                return {}
+            target = spec
+            for part in ref[2:].split("/"):
+                target = target.get(part.replace("~1", "/").replace("~0", "~"), {}) if isinstance(target, dict) else {}
+            return self._resolve_refs(target, spec, seen + (ref,))
+        return {key: self._resolve_refs(value, spec, seen) for key, value in node.items()}
+    
     def process_spec(self, spec_path: str) -> Dict[str, Any]:
         """Process a single OpenAPI spec file."""
         spec_path = Path(spec_path)
@@ -84,39 +126,144 @@ class OpenAPIService:
     
     def process_all_specs(self) -> List[Dict[str, Any]]:
         """Process all OpenAPI spec files in the specs directory."""
-        specs = []
-        for spec_path in self.specs_dir.glob("**/*.{json,yaml,yml}"):
-            try:
-                spec = self.process_spec(str(spec_path))
-                specs.append(spec)
-            except Exception as e:
-                print(f"Error processing spec {spec_path}: {e}")
-        
-        return specs
+        return self.load()
     
     def search_endpoints(self, query: str) -> List[Dict[str, Any]]:
         """Search for endpoints matching the query."""
         matching_endpoints = []
         
-        for spec_path in self.specs_dir.glob("**/*.{json,yaml,yml}"):
+        for spec in self.load():
+            # Search in endpoints
+            for endpoint in spec["endpoints"]:
+                # Check if query matches endpoint details
+                score = sum(
+                    query.lower() in endpoint[field].lower()
+                    for field in ["summary", "description", "path", "operation_id"]
+                )
+                if score:
+                    matching_endpoints.append({
+                        "spec_id": spec["id"],
+                        "spec_title": spec["title"],
+                        "endpoint": endpoint,
+                        "score": score
+                    })
+        
+        # Rank endpoints matching on more fields first
+        matching_endpoints.sort(key=lambda x: x["score"], reverse=True)
+        
+        return matching_endpoints
+    
+    def response_schema(self, endpoint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """JSON schema of an endpoint's success response, if the spec declares one."""
+        responses = endpoint.get("responses", {})
+        codes = sorted(code for code in responses if str(code).startswith("2")) + ["default"]
+        for code in codes:
+            response = responses.get(code) or {}
+            # Swagger 2 keeps the schema on the response, OpenAPI 3 per media type
+            if "schema" in response:
+                return response["schema"]
+            for media_type, content in (response.get("content") or {}).items():
+                if "json" in media_type and "schema" in content:
+                    return content["schema"]
+        return None
+    
+    def build_parameter_schema(self, endpoint: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a JSON schema for an endpoint's parameters and request body."""
+        properties = {}
+        required = []
+        
+        for param in endpoint.get("parameters", []):
+            if param.get("in") not in ["query", "path", "header"]:
+                continue
+            
+            # OpenAPI 3 nests the schema, Swagger 2 keeps it on the parameter
+            schema = dict(param.get("schema") or {
+                key: param[key] for key in ["type", "format", "enum", "pattern", "items"] if key in param
+            })
+            if param.get("description"):
+                schema["description"] = param["description"]
+            
+            properties[param["name"]] = schema
+            if param.get("required") or param.get("in") == "path":
+                required.append(param["name"])
+        
+        # Only JSON request bodies can be bound from a query
+        request_body = endpoint.get("request_body", {})
+        body_schema = request_body.get("content", {}).get("application/json", {}).get("schema")
+        if body_schema:
+            properties["body"] = body_schema
+            if request_body.get("required"):
+                required.append("body")
+        
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": required
+        }
+    
+    def validate_parameters(self, schema: Dict[str, Any], params: Any) -> Tuple[Dict[str, Any], List[str]]:
+        """Validate and coerce extracted parameters against a parameter schema.
+        
+        Returns the cleaned parameters and a list of validation errors.
+        Parameters that are not an object, such as a null or a string from the
+        LLM, are treated as empty and reported as an error.
+        """
+        cleaned = {}
+        errors = []
+        
+        if not isinstance(params, dict):
+            errors.append(f"expected an object of parameters, got {params!r}")
+            params = {}
+        
+        for name, value in params.items():
+            if name not in schema["properties"] or value is None or value == "":
+                continue
             try:
-                spec = self.process_spec(str(spec_path))
-                
-                # Search in endpoints
-                for endpoint in spec["endpoints"]:
-                    # Check if query matches endpoint details
-                    if (
-                        query.lower() in endpoint["summary"].lower() or
-                        query.lower() in endpoint["description"].lower() or
-                        query.lower() in endpoint["path"].lower() or
-                        query.lower() in endpoint["operation_id"].lower()
-                    ):
-                        matching_endpoints.append({
-                            "spec_id": spec["id"],
-                            "spec_title": spec["title"],
-                            "endpoint": endpoint
-                        })
-            except Exception as e:
-                print(f"Error searching spec {spec_path}: {e}")
+                cleaned[name] = self._coerce_value(value, schema["properties"][name])
+            except ValueError as e:
+                errors.append(f"{name}: {e}")
+        
+        for name in schema.get("required", []):
+            if name not in cleaned:
+                errors.append(f"{name}: required parameter missing")
+        
+        return cleaned, errors
+    
+    def _coerce_value(self, value: Any, schema: Dict[str, Any]) -> Any:
+        """Coerce a single value to its schema type, raising ValueError if invalid."""
+        schema_type = schema.get("type")
+        
+        try:
+            if schema_type == "integer":
+                # int() would truncate 2.5 and accept True
+                if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                    raise ValueError(f"expected integer, got {value!r}")
+                value = int(value)
+            elif schema_type == "number":
+                value = float(value)
+            elif schema_type == "boolean" and not isinstance(value, bool):
+                if str(value).lower() not in ["true", "false"]:
+                    raise ValueError(f"expected boolean, got {value!r}")
+                value = str(value).lower() == "true"
+            elif schema_type == "string":
+                value = str(value)
+            elif schema_type == "array":
+                items = value if isinstance(value, list) else [value]
+                value = [self._coerce_value(item, schema.get("items", {})) for item in items]
+            elif schema_type == "object":
+                if not isinstance(value, dict):
+                    raise ValueError(f"expected object, got {value!r}")
+                properties = schema.get("properties", {})
+                value = {
+                    key: self._coerce_value(item, properties[key]) if key in properties else item
+                    for key, item in value.items()
+                }
+        except (TypeError, ValueError) as e:
+            raise ValueError(str(e) or f"expected {schema_type}, got {value!r}")
+        
+        if "enum" in schema and value not in schema["enum"]:
+            raise ValueError(f"{value!r} is not one of {schema['enum']}")
+        if "pattern" in schema and isinstance(value, str) and not re.search(schema["pattern"], value):
+            raise ValueError(f"{value!r} does not match pattern {schema['pattern']}")
         
-        return matching_endpoints 
\ No newline at end of file
+        return value 
\ No newline at end of file
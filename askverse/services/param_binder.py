@@ -0,0 +1,235 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import json
+import logging
+import re
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    name: i + 1 for i, name in enumerate([
+        "january", "february", "march", "april", "may", "june", "july",
+        "august", "september", "october", "november", "december"
+    ])
+}
+MONTHS.update({name[:3]: number for name, number in MONTHS.items()})
+
+RELATIVE_DAYS = {"today": 0, "tonight": 0, "tomorrow": 1, "yesterday": -1}
+
+# Parameter names that usually hold a place name; generic ones like "q" do not count
+LOCATION_NAMES = {"city", "location", "place", "address", "destination", "origin", "town"}
+
+NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+ISO_DATE_PATTERN = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+MONTH_DATE_PATTERN = re.compile(
+    r"\b(" + "|".join(MONTHS) + r")\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?\b", re.IGNORECASE
+)
+DAY_MONTH_PATTERN = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(" + "|".join(MONTHS) + r")\.?(?:,?\s+(\d{4}))?\b", re.IGNORECASE
+)
+IN_DAYS_PATTERN = re.compile(r"\bin\s+(\d+)\s+days?\b", re.IGNORECASE)
+PLACE_PATTERN = re.compile(r"\b(?:in|for|at|near|to|from)\s+((?:[A-Z][\w'-]*)(?:\s+[A-Z][\w'-]*)*)")
+
+
+class ParameterBinder:
+    """Binds simple OpenAPI parameters directly from the query text.
+
+    Uses each parameter's schema (``type``, ``format``, ``enum``, ``pattern``)
+    to pick a fast extractor, so the LLM is only needed when required
+    parameters remain unbound. Optional parameters are bound only when the
+    query names them ("limit 10") or mentions a known value for them, so
+    guesses never fill parameters the user did not ask for.
+    """
+
+    def __init__(self, gazetteer_path: Optional[str] = None):
+        self.gazetteer = self._load_gazetteer(gazetteer_path or settings.PARAM_BINDER_GAZETTEER_PATH)
+        self.stats = {"endpoints": 0, "fast_path": 0, "llm_fallback": 0, "params_bound": 0, "params_unbound": 0}
+
+    def _load_gazetteer(self, path: Optional[str]) -> Dict[str, List[str]]:
+        """Load known values per parameter name (e.g. cities, country codes)."""
+        if not path or not Path(path).exists():
+            return {}
+
+        try:
+            gazetteer = json.loads(Path(path).read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Error loading parameter gazetteer {path}: {e}")
+            return {}
+
+        return {name.lower(): values for name, values in gazetteer.items()}
+
+    def bind(self, query: str, schema: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Bind what can be bound locally.
+
+        Returns the bound parameters and the names of required parameters that
+        are still unbound.
+        """
+        properties = schema.get("properties", {})
+        required = [name for name in schema.get("required", []) if name in properties]
+        # A lone number in the query can only be meant for a lone numeric parameter
+        numeric = [name for name in required if properties[name].get("type") in ["integer", "number"]]
+
+        bound = {}
+        for name, param_schema in properties.items():
+            if name in required:
+                value = self._extract(query, name, param_schema, sole_number=len(numeric) == 1)
+            else:
+                value = self._extract_named(query, name, param_schema)
+            if value is not None:
+                bound[name] = value
+
+        unbound = [name for name in required if name not in bound]
+
+        self.stats["endpoints"] += 1
+        self.stats["params_bound"] += len(bound)
+        self.stats["params_unbound"] += len(unbound)
+        if unbound:
+            self.stats["llm_fallback"] += 1
+        else:
+            self.stats["fast_path"] += 1
+
+        return bound, unbound
+
+    @property
+    def fast_path_rate(self) -> float:
+        """Share of endpoints whose required parameters were bound without the LLM."""
+        if not self.stats["endpoints"]:
+            return 0.0
+        return self.stats["fast_path"] / self.stats["endpoints"]
+
+    def status(self) -> Dict[str, Any]:
+        """Counters and the share of endpoints bound without the LLM."""
+        return {**self.stats, "fast_path_rate": round(self.fast_path_rate, 3)}
+
+    def _extract_named(self, query: str, name: str, schema: Dict[str, Any]) -> Any:
+        """Bind an optional parameter only from a known value or a mention of its name."""
+        if name.lower() in self.gazetteer:
+            return self._match_enum(query, self.gazetteer[name.lower()])
+
+        schema_type = schema.get("type")
+        if schema_type in ["integer", "number"] and "enum" not in schema:
+            return self._extract_number(query, name, schema_type, sole_number=False)
+
+        return None
+
+    def _extract(self, query: str, name: str, schema: Dict[str, Any], sole_number: bool = False) -> Any:
+        """Pick an extractor based on the parameter schema."""
+        schema_type = schema.get("type")
+        schema_format = schema.get("format", "")
+
+        if "enum" in schema:
+            return self._match_enum(query, schema["enum"])
+
+        if name.lower() in self.gazetteer:
+            match = self._match_enum(query, self.gazetteer[name.lower()])
+            if match is not None:
+                return match
+
+        if schema_format in ["date", "date-time"]:
+            value = self._extract_date(query)
+            if value is None:
+                return None
+            return value.isoformat() if schema_format == "date" else datetime.combine(value, datetime.min.time()).isoformat()
+
+        if "pattern" in schema:
+            return self._match_pattern(query, schema["pattern"])
+
+        if schema_type in ["integer", "number"]:
+            return self._extract_number(query, name, schema_type, sole_number)
+
+        if schema_type in ["string", None] and name.lower() in LOCATION_NAMES:
+            return self._extract_place(query)
+
+        return None
+
+    def _match_enum(self, query: str, values: List[Any]) -> Any:
+        """Match a known value mentioned in the query, preferring the longest."""
+        lowered = query.lower()
+        matches = [
+            value for value in values
+            if re.search(rf"\b{re.escape(str(value).lower())}\b", lowered)
+        ]
+        if not matches:
+            return None
+        return max(matches, key=lambda value: len(str(value)))
+
+    def _match_pattern(self, query: str, pattern: str) -> Optional[str]:
+        """Return the single query token matching the pattern, if unambiguous."""
+        try:
+            compiled = re.compile(pattern)
+        except re.error:
+            return None
+
+        tokens = re.findall(r"[\w.:/@+-]+", query)
+        matches = {token for token in tokens if compiled.fullmatch(token)}
+        return matches.pop() if len(matches) == 1 else None
+
+    def _extract_date(self, query: str) -> Optional[date]:
+        """Extract an ISO, month-name or relative date."""
+        today = date.today()
+
+        match = ISO_DATE_PATTERN.search(query)
+        if match:
+            try:
+                return date(*(int(group) for group in match.groups()))
+            except ValueError:
+                return None
+
+        for pattern, month_group, day_group in [(MONTH_DATE_PATTERN, 1, 2), (DAY_MONTH_PATTERN, 2, 1)]:
+            match = pattern.search(query)
+            if match:
+                year = int(match.group(3)) if match.group(3) else today.year
+                try:
+                    return date(year, MONTHS[match.group(month_group).lower()], int(match.group(day_group)))
+                except ValueError:
+                    return None
+
+        match = IN_DAYS_PATTERN.search(query)
+        if match:
+            return today + timedelta(days=int(match.group(1)))
+
+        for word, offset in RELATIVE_DAYS.items():
+            if re.search(rf"\b{word}\b", query, re.IGNORECASE):
+                return today + timedelta(days=offset)
+
+        return None
+
+    def _extract_number(self, query: str, name: str, schema_type: str, sole_number: bool = False) -> Any:
+        """Extract the number next to the parameter name, or with ``sole_number`` the only number in the query."""
+        cast = int if schema_type == "integer" else float
+
+        # Dates contain numbers too; don't mistake them for counts
+        text = ISO_DATE_PATTERN.sub(" ", query)
+
+        # Prefer "limit 10" / "10 days" style mentions of the parameter itself
+        words = re.escape(name.lower()).replace("_", "[ _]")
+        near = re.search(
+            rf"\b{words}\s*(?:of|=|:|is)?\s*(-?\d+(?:\.\d+)?)\b|(?<![\w.-])(-?\d+(?:\.\d+)?)\s*{words}\b",
+            text,
+            re.IGNORECASE
+        )
+        if near:
+            return cast(float(near.group(1) or near.group(2)))
+
+        if not sole_number:
+            return None
+        numbers = NUMBER_PATTERN.findall(text)
+        if len(numbers) == 1:
+            return cast(float(numbers[0]))
+        return None
+
+    def _extract_place(self, query: str) -> Optional[str]:
+        """Extract a capitalised place name following a preposition."""
+        match = PLACE_PATTERN.search(query)
+        if not match:
+            return None
+
+        # Drop a trailing month or relative day ("in Paris Tomorrow")
+        words = [
+            word for word in match.group(1).split()
+            if word.lower() not in MONTHS and word.lower() not in RELATIVE_DAYS
+        ]
+        return " ".join(words) or None
\ No newline at end of file
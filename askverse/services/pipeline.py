@@ -0,0 +1,143 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class Stage:
+    """One step of a streaming pipeline.
+
+    ``func`` receives a single item, or a list of up to ``batch_size`` items
+    when ``batch_size`` > 1, and returns the item(s) to pass on. Returning
+    None drops the item(s).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        batch_size: int = 1
+    ):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.metrics = {"processed": 0, "errors": 0, "batches": 0, "busy_seconds": 0.0, "max_queue_depth": 0}
+
+
+class StreamingPipeline:
+    """Runs items through stages connected by bounded queues.
+
+    Each stage has its own worker count; a full queue blocks the stage
+    feeding it, so memory stays constant regardless of how many items the
+    source yields.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 32,
+        on_error: Optional[Callable[[str, List[Any], Exception], None]] = None
+    ):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+
+    async def run(self, source: AsyncIterator[Any]) -> Dict[str, Any]:
+        """Drain the source through every stage and return per-stage metrics."""
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        started = time.perf_counter()
+
+        tasks = [asyncio.create_task(self._feed(source, queues[0]))]
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            tasks.append(asyncio.create_task(self._run_stage(stage, queues[i], outbox)))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": {
+                stage.name: {
+                    **stage.metrics,
+                    "busy_seconds": round(stage.metrics["busy_seconds"], 3),
+                    "items_per_second": round(stage.metrics["processed"] / elapsed, 2) if elapsed else 0.0,
+                    "workers": stage.workers,
+                }
+                for stage in self.stages
+            }
+        }
+
+    async def _feed(self, source: AsyncIterator[Any], outbox: asyncio.Queue) -> None:
+        """Push source items into the first queue, then signal completion."""
+        async for item in source:
+            await outbox.put(item)
+        await outbox.put(_DONE)
+
+    async def _run_stage(self, stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]) -> None:
+        """Run a stage's workers and signal the next stage once all have finished."""
+        await asyncio.gather(*(self._worker(stage, inbox, outbox) for _ in range(stage.workers)))
+        if outbox is not None:
+            await outbox.put(_DONE)
+
+    async def _worker(self, stage: Stage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]) -> None:
+        """Take items (or batches) from the inbox until the source is exhausted."""
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                # Leave the marker for sibling workers
+                inbox.put_nowait(_DONE)
+                return
+
+            stage.metrics["max_queue_depth"] = max(stage.metrics["max_queue_depth"], inbox.qsize() + 1)
+
+            # Batch whatever is already queued, without waiting for more
+            batch = [item]
+            finished = False
+            while len(batch) < stage.batch_size:
+                try:
+                    queued = inbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if queued is _DONE:
+                    inbox.put_nowait(_DONE)
+                    finished = True
+                    break
+                batch.append(queued)
+
+            await self._process(stage, batch, outbox)
+            if finished:
+                return
+
+    async def _process(self, stage: Stage, batch: List[Any], outbox: Optional[asyncio.Queue]) -> None:
+        """Apply the stage function and forward its output."""
+        started = time.perf_counter()
+        try:
+            result = await stage.func(batch if stage.batch_size > 1 else batch[0])
+        except Exception as e:
+            stage.metrics["errors"] += len(batch)
+            logger.error(f"Error in {stage.name} stage: {e}")
+            if self.on_error:
+                self.on_error(stage.name, batch, e)
+            return
+        finally:
+            stage.metrics["busy_seconds"] += time.perf_counter() - started
+
+        stage.metrics["processed"] += len(batch)
+        stage.metrics["batches"] += 1
+
+        if outbox is None or result is None:
+            return
+
+        for output in (result if stage.batch_size > 1 else [result]):
+            await outbox.put(output)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from typing import Dict, Any, Optional
+
+
+def query_metadata(result: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    """What to log with a query, including the routing label the query router trains on."""
+    return {
+        "routing": result.get("routing", {}),
+        "agents": [sub_task["agent"] for sub_task in result.get("sub_tasks", [])],
+        "timeout": timeout,
+        "partial": result.get("partial", False),
+        "timed_out": result.get("timed_out", []),
+        "error": result.get("error")
+    }
\ No newline at end of file
@@ -0,0 +1,203 @@
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from pathlib import Path
+import json
+import logging
+
+import numpy as np
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Routes that go straight to one agent; everything else is decomposed by the LLM
+DIRECT_ROUTES = ["document", "api"]
+DECOMPOSE = "decompose"
+
+
+def route_label(sub_tasks: List[Dict[str, Any]]) -> str:
+    """Label a decomposition: the single retrieval agent it used, or decompose."""
+    agents = {task.get("agent") for task in sub_tasks} - {"data"}
+    if len(agents) == 1 and len(sub_tasks) == 1:
+        agent = agents.pop()
+        if agent in DIRECT_ROUTES:
+            return agent
+    return DECOMPOSE
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length."""
+    return vectors / np.clip(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12, None)
+
+
+class QueryRouter:
+    """Embedding classifier deciding whether a query needs LLM decomposition.
+
+    Each route has a few prototype vectors (k-means centroids of logged
+    queries with that route). A query is sent straight to a single agent when
+    its best prototype is close enough and clearly ahead of the other routes;
+    compound or ambiguous queries fall through to decomposition.
+    """
+
+    def __init__(
+        self,
+        encoder: Callable[[str], Awaitable[np.ndarray]],
+        prototypes: Optional[np.ndarray] = None,
+        labels: Optional[List[str]] = None,
+        min_similarity: Optional[float] = None,
+        min_margin: Optional[float] = None
+    ):
+        self.encoder = encoder
+        self.prototypes = prototypes
+        self.labels = labels or []
+        self.min_similarity = settings.QUERY_ROUTER_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self.min_margin = settings.QUERY_ROUTER_MIN_MARGIN if min_margin is None else min_margin
+        self.training_report: Dict[str, Any] = {}
+
+        self._decomposition_seconds: Optional[float] = None
+        self.stats = {
+            "routed": 0,
+            "decomposed": 0,
+            "checked": 0,  # decomposed queries with a router prediction
+            "agreed": 0,  # ... where the prediction matched the LLM
+            "latency_saved_seconds": 0.0
+        }
+
+    @property
+    def trained(self) -> bool:
+        """Whether prototypes are loaded."""
+        return self.prototypes is not None and len(self.labels) > 0
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        """Share of decomposed queries whose route the router predicted correctly."""
+        if not self.stats["checked"]:
+            return None
+        return self.stats["agreed"] / self.stats["checked"]
+
+    async def route(self, query: str) -> Dict[str, Any]:
+        """Pick a direct agent for the query, or None to decompose it."""
+        decision = {"agent": None, "route": DECOMPOSE, "score": 0.0, "margin": 0.0, "source": "llm"}
+        if not settings.QUERY_ROUTER_ENABLED or not self.trained:
+            return decision
+
+        embedding = _normalize(np.asarray(await self.encoder(query), dtype=np.float32))
+        route, score, margin = self.classify(embedding)
+        decision.update({"route": route, "score": round(score, 4), "margin": round(margin, 4)})
+
+        # Several questions in one query always need decomposition
+        compound = query.count("?") > 1
+        if route in DIRECT_ROUTES and not compound and score >= self.min_similarity and margin >= self.min_margin:
+            decision.update({"agent": route, "source": "router"})
+            self.stats["routed"] += 1
+            if self._decomposition_seconds is not None:
+                self.stats["latency_saved_seconds"] += self._decomposition_seconds
+        else:
+            self.stats["decomposed"] += 1
+
+        return decision
+
+    def classify(self, embedding: np.ndarray) -> Tuple[str, float, float]:
+        """Best route, its similarity, and its lead over the best other route."""
+        similarities = self.prototypes @ embedding
+        best: Dict[str, float] = {}
+        for label, similarity in zip(self.labels, similarities):
+            best[label] = max(best.get(label, -1.0), float(similarity))
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        route, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        return route, score, score - runner_up
+
+    def record_decomposition(self, decision: Dict[str, Any], sub_tasks: List[Dict[str, Any]], seconds: float) -> str:
+        """Track decomposition latency and check the router's prediction against the LLM."""
+        # Exponential moving average, used to estimate the time each routed query saves
+        if self._decomposition_seconds is None:
+            self._decomposition_seconds = seconds
+        else:
+            self._decomposition_seconds = 0.9 * self._decomposition_seconds + 0.1 * seconds
+
+        label = route_label(sub_tasks)
+        if self.trained and decision.get("score"):
+            self.stats["checked"] += 1
+            if decision["route"] == label:
+                self.stats["agreed"] += 1
+        return label
+
+    def status(self) -> Dict[str, Any]:
+        """Routing counters, online accuracy and the last training report."""
+        return {
+            **self.stats,
+            "latency_saved_seconds": round(self.stats["latency_saved_seconds"], 3),
+            "decomposition_seconds": round(self._decomposition_seconds, 3) if self._decomposition_seconds else None,
+            "accuracy": round(self.accuracy, 4) if self.accuracy is not None else None,
+            "prototypes": len(self.labels),
+            "training": self.training_report
+        }
+
+    def fit(self, embeddings: np.ndarray, labels: List[str], prototypes_per_route: Optional[int] = None) -> None:
+        """Build prototypes per route with spherical k-means."""
+        prototypes_per_route = prototypes_per_route or settings.QUERY_ROUTER_PROTOTYPES
+        embeddings = _normalize(np.asarray(embeddings, dtype=np.float32))
+        labels = np.asarray(labels)
+        rng = np.random.default_rng(0)
+
+        prototypes, prototype_labels = [], []
+        for route in sorted(set(labels.tolist())):
+            members = embeddings[labels == route]
+            k = min(prototypes_per_route, len(members))
+            centroids = members[rng.choice(len(members), size=k, replace=False)]
+            for _ in range(10):
+                assignment = np.argmax(members @ centroids.T, axis=1)
+                for i in range(k):
+                    assigned = members[assignment == i]
+                    if len(assigned):
+                        centroids[i] = _normalize(assigned.mean(axis=0))
+            prototypes.append(centroids)
+            prototype_labels.extend([route] * k)
+
+        self.prototypes = np.vstack(prototypes)
+        self.labels = prototype_labels
+
+    def evaluate(self, embeddings: np.ndarray, labels: List[str]) -> Dict[str, Any]:
+        """Accuracy over labelled queries, and precision/coverage of direct routing."""
+        embeddings = _normalize(np.asarray(embeddings, dtype=np.float32))
+        correct = routed = routed_correct = 0
+        for embedding, label in zip(embeddings, labels):
+            route, score, margin = self.classify(embedding)
+            correct += route == label
+            if route in DIRECT_ROUTES and score >= self.min_similarity and margin >= self.min_margin:
+                routed += 1
+                routed_correct += route == label
+
+        total = len(labels)
+        return {
+            "examples": total,
+            "accuracy": round(correct / total, 4) if total else None,
+            "routed_coverage": round(routed / total, 4) if total else None,
+            "routed_precision": round(routed_correct / routed, 4) if routed else None
+        }
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write prototypes and the training report to an .npz file."""
+        path = Path(path or settings.QUERY_ROUTER_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as router_file:
+            np.savez(
+                router_file,
+                prototypes=self.prototypes,
+                labels=np.asarray(self.labels),
+                report=np.asarray(json.dumps(self.training_report))
+            )
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """Load prototypes saved by the training job; False if there are none."""
+        path = Path(path or settings.QUERY_ROUTER_PATH)
+        if not path.exists():
+            logger.info(f"No query router at {path}, every query will be decomposed")
+            return False
+
+        with np.load(path) as data:
+            self.prototypes = data["prototypes"].astype(np.float32)
+            self.labels = data["labels"].tolist()
+            self.training_report = json.loads(str(data["report"]))
+        return True
\ No newline at end of file
@@ -0,0 +1,155 @@
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+UPDATE = "update"
+REMOVE = "remove"
+
+
+class ReindexQueue:
+    """Background queue reindexing single pages as change events arrive.
+
+    Events for a page are held for ``coalesce_seconds`` after the first one,
+    so a burst of edits costs one fetch; the latest action wins. A page is
+    never processed by two workers at once: events arriving while it is being
+    reindexed queue up one more pass.
+    """
+
+    def __init__(
+        self,
+        indexer_factory: Callable[[], Any],
+        coalesce_seconds: Optional[float] = None,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.indexer_factory = indexer_factory
+        self.coalesce_seconds = settings.REINDEX_COALESCE_SECONDS if coalesce_seconds is None else coalesce_seconds
+        self.workers = workers or settings.REINDEX_WORKERS
+        self.max_pending = max_pending or settings.REINDEX_MAX_PENDING
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # page id -> (action, due time, first event time)
+        self._pending: Dict[str, Tuple[str, float, float]] = {}
+        self._active: Set[str] = set()
+
+        self.stats = {
+            "received": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "processed": 0,
+            "failed": 0,
+            "indexer_errors": 0,
+            "last_latency_seconds": None
+        }
+
+    def submit(self, page_id: str, action: str = UPDATE) -> bool:
+        """Queue a page change; returns False when the queue is full."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._start(loop)
+
+        self.stats["received"] += 1
+        now = loop.time()
+
+        queued = self._pending.get(page_id)
+        if queued is not None:
+            _, due, first_seen = queued
+            self._pending[page_id] = (action, due, first_seen)
+            self.stats["coalesced"] += 1
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.stats["rejected"] += 1
+            return False
+
+        self._pending[page_id] = (action, now + self.coalesce_seconds, now)
+        self._wakeup.set()
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth and counters."""
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "active": len(self._active),
+            "workers": self.workers
+        }
+
+    async def stop(self) -> None:
+        """Cancel the workers; pending events are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind to the running event loop and start the workers."""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._pending = {}
+        self._active = set()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _next_due(self) -> Tuple[Optional[str], Optional[float]]:
+        """Return the page due first, or the seconds until the next one is due."""
+        now = self._loop.time()
+        page_id, due = None, None
+        for candidate, (_, candidate_due, _) in self._pending.items():
+            if candidate in self._active:
+                continue
+            if due is None or candidate_due < due:
+                page_id, due = candidate, candidate_due
+
+        if page_id is None:
+            return None, None
+        if due <= now:
+            return page_id, None
+        return None, due - now
+
+    async def _worker(self) -> None:
+        """Reindex due pages until cancelled."""
+        indexer = None
+        while True:
+            if indexer is None:
+                # Each worker gets its own indexer, and with it its own DB session
+                try:
+                    indexer = await self._loop.run_in_executor(None, self.indexer_factory)
+                except Exception as e:
+                    self.stats["indexer_errors"] += 1
+                    logger.error(f"Error creating page indexer, retrying in {settings.REINDEX_RETRY_SECONDS}s: {e}")
+                    await asyncio.sleep(settings.REINDEX_RETRY_SECONDS)
+                    continue
+
+            page_id, wait = self._next_due()
+            if page_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            action, _, first_seen = self._pending.pop(page_id)
+            self._active.add(page_id)
+            try:
+                if action == REMOVE:
+                    result = await indexer.remove_page(page_id)
+                else:
+                    result = await indexer.reindex_page(page_id)
+                self.stats["processed"] += 1
+                self.stats["last_latency_seconds"] = round(self._loop.time() - first_seen, 3)
+                logger.info(f"Reindexed page {page_id}: {result}")
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Error reindexing page {page_id}: {e}")
+            finally:
+                self._active.discard(page_id)
+                # A page that changed meanwhile may now be due
+                self._wakeup.set()
\ No newline at end of file
@@ -0,0 +1,195 @@
+from typing import Dict, Any, List, Optional, Set, Tuple
+import json
+import logging
+import re
+
+from ..config.settings import settings
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Fields kept in every object, so pruned rows still say what they describe
+IDENTITY_FIELDS = {"id", "name", "title", "label", "text", "type", "status", "date", "time", "timestamp", "dt", "key", "code"}
+
+STOPWORDS = {
+    "the", "and", "for", "with", "what", "which", "when", "where", "who", "how", "are", "was", "were",
+    "will", "can", "could", "would", "should", "does", "did", "has", "have", "this", "that", "these",
+    "those", "from", "into", "about", "there", "their", "tell", "show", "give", "get", "please", "any",
+    "all", "some", "its", "our", "your", "you", "me", "is", "in", "of", "to", "a", "an", "on", "at", "by"
+}
+
+WORD_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+def _terms(text: str) -> Set[str]:
+    """Lowercased word stems, splitting camelCase and snake_case."""
+    return {
+        word.lower()[:4]
+        for word in WORD_PATTERN.findall(text or "")
+        if len(word) > 2 and word.lower() not in STOPWORDS
+    }
+
+
+class ResponseCompactor:
+    """Shrinks API responses before they are put in a prompt.
+
+    Fields are pruned to those matching the query by name, by the
+    description in the endpoint's response schema or by their text value
+    (identity fields such as ``id`` and ``name`` are always kept, also of
+    objects with no match); nested objects are flattened to
+    dotted keys, arrays of objects become pipe-separated tables, and arrays
+    longer than ``max_rows`` are cut with a summary of what was dropped. When
+    nothing matches the query, the whole response is kept, flattened.
+    """
+
+    def __init__(self, max_rows: Optional[int] = None, max_value_chars: Optional[int] = None):
+        self.max_rows = max_rows or settings.API_COMPACT_MAX_ROWS
+        self.max_value_chars = max_value_chars or settings.API_COMPACT_MAX_VALUE_CHARS
+        self.stats = {"responses": 0, "tokens_before": 0, "tokens_after": 0}
+
+    def compact(
+        self,
+        query: str,
+        response: Any,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Compact text for a response and a report of the token reduction."""
+        query_terms = _terms(query)
+        pruned = self._prune(response, schema or {}, query_terms)
+        if pruned is None:
+            pruned = response
+
+        lines: List[str] = []
+        self._flatten(pruned, "", lines)
+        text = "\n".join(lines)
+
+        tokens_before = count_tokens(json.dumps(response, default=str))
+        tokens_after = count_tokens(text)
+        self.stats["responses"] += 1
+        self.stats["tokens_before"] += tokens_before
+        self.stats["tokens_after"] += tokens_after
+
+        report = {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "reduction": round(1 - tokens_after / tokens_before, 3) if tokens_before else 0.0,
+            "pruned": pruned is not response
+        }
+        return text, report
+
+    def _relevant(self, name: str, value: Any, schema: Dict[str, Any], query_terms: Set[str]) -> bool:
+        field_terms = _terms(name) | _terms(schema.get("title", "")) | _terms(schema.get("description", ""))
+        if isinstance(value, str):
+            # "New York" in location.name answers "temperature in New York"
+            field_terms |= _terms(value)
+        return bool(field_terms & query_terms)
+
+    def _prune(self, value: Any, schema: Dict[str, Any], query_terms: Set[str]) -> Optional[Any]:
+        """The parts of a value relevant to the query, or None when nothing is."""
+        if isinstance(value, list):
+            item_schema = schema.get("items") or {}
+            items = [self._prune(item, item_schema, query_terms) for item in value]
+            if all(item is None for item in items):
+                return None
+            # Keep row positions so tables stay aligned; rows without matches keep their identity fields
+            return [item if item is not None else self._identity(raw) for item, raw in zip(items, value)]
+
+        if not isinstance(value, dict):
+            return None
+
+        properties = schema.get("properties") or {}
+        kept = {}
+        relevant = False
+        for name, child in value.items():
+            child_schema = properties.get(name) or {}
+            if self._relevant(name, child, child_schema, query_terms):
+                kept[name] = child
+                relevant = True
+                continue
+            pruned = self._prune(child, child_schema, query_terms)
+            if pruned is not None:
+                kept[name] = pruned
+                relevant = True
+            elif isinstance(child, dict):
+                # An object with no match still says what it is about
+                identity = self._identity(child)
+                if identity:
+                    kept[name] = identity
+            elif name.lower() in IDENTITY_FIELDS and not isinstance(child, list):
+                kept[name] = child
+
+        return kept if relevant else None
+
+    def _identity(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                name: child for name, child in value.items()
+                if name.lower() in IDENTITY_FIELDS and not isinstance(child, (dict, list))
+            }
+        return value
+
+    def _scalar(self, value: Any) -> str:
+        text = value if isinstance(value, str) else json.dumps(value, default=str)
+        if len(text) > self.max_value_chars:
+            text = text[:self.max_value_chars] + "..."
+        return text.replace("\n", " ")
+
+    def _flatten(self, value: Any, prefix: str, lines: List[str]) -> None:
+        """Append "key: value" lines, with tables for arrays of objects."""
+        if isinstance(value, dict):
+            for name, child in value.items():
+                self._flatten(child, f"{prefix}.{name}" if prefix else name, lines)
+        elif isinstance(value, list):
+            self._flatten_list(value, prefix or "items", lines)
+        else:
+            lines.append(f"{prefix or 'value'}: {self._scalar(value)}")
+
+    def _flatten_list(self, items: List[Any], name: str, lines: List[str]) -> None:
+        shown = items[:self.max_rows]
+        if not any(isinstance(item, dict) for item in shown):
+            values = ", ".join(self._scalar(item) for item in shown)
+            more = f" (+{len(items) - len(shown)} more)" if len(items) > len(shown) else ""
+            lines.append(f"{name}: [{values}]{more}")
+            return
+
+        # One row per object, columns from the flattened fields of all shown rows
+        rows = []
+        for item in shown:
+            row: Dict[str, str] = {}
+            self._row_fields(item, "", row)
+            rows.append(row)
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+
+        lines.append(f"{name} ({len(items)} rows):")
+        lines.append(" | ".join(columns))
+        lines.extend(" | ".join(row.get(column, "") for column in columns) for row in rows)
+        if len(items) > len(shown):
+            lines.append(self._summarize_rest(items[len(shown):], columns))
+
+    def _row_fields(self, value: Any, prefix: str, row: Dict[str, str]) -> None:
+        """Flatten an object into one table row; nested arrays stay inline."""
+        if isinstance(value, dict):
+            for name, child in value.items():
+                self._row_fields(child, f"{prefix}.{name}" if prefix else name, row)
+        else:
+            row[prefix or "value"] = self._scalar(value)
+
+    def _summarize_rest(self, rest: List[Any], columns: List[str]) -> str:
+        """One line on the rows left out: count and the range of numeric columns."""
+        ranges = []
+        for column in columns:
+            if "." in column:
+                continue
+            numbers = [
+                item[column] for item in rest
+                if isinstance(item, dict) and isinstance(item.get(column), (int, float)) and not isinstance(item.get(column), bool)
+            ]
+            if numbers:
+                ranges.append(f"{column} {min(numbers):g}..{max(numbers):g}")
+        summary = f"... {len(rest)} more rows"
+        return f"{summary} ({', '.join(ranges)})" if ranges else summary
+
+    def status(self) -> Dict[str, Any]:
+        """Totals across compacted responses."""
+        before, after = self.stats["tokens_before"], self.stats["tokens_after"]
+        return {**self.stats, "reduction": round(1 - after / before, 3) if before else 0.0}
\ No newline at end of file
@@ -0,0 +1,133 @@
+from typing import Dict, Any, List, Optional
+import base64
+import hashlib
+import json
+import logging
+import time
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class RetrievalCache:
+    """Query embeddings and vector search results shared by every process, in Redis.
+
+    Search results are keyed by the index generation, which the sync job
+    bumps when a sync finishes, so results from before a sync are never
+    served after it. Pages reindexed from webhooks in between do not bump it:
+    cached rankings may miss them until the entry expires, while document
+    text is always read fresh from the content store. Embeddings depend only
+    on the model and are kept across generations.
+
+    Redis errors are logged and treated as misses.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: Optional[int] = None):
+        self.redis = aioredis.Redis.from_url(
+            redis_url or str(settings.REDIS_URL),
+            socket_timeout=settings.RETRIEVAL_CACHE_TIMEOUT
+        )
+        self.prefix = settings.RETRIEVAL_CACHE_PREFIX
+        self.ttl = ttl or settings.RETRIEVAL_CACHE_TTL
+
+        self._generation: Optional[int] = None
+        self._generation_checked = 0.0
+
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "embedding_hits": 0, "embedding_misses": 0, "errors": 0}
+
+    async def generation(self) -> int:
+        """Current index generation, re-read at most every RETRIEVAL_CACHE_GENERATION_REFRESH seconds."""
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked > settings.RETRIEVAL_CACHE_GENERATION_REFRESH:
+            self._generation = int(await self.redis.get(f"{self.prefix}:generation") or 0)
+            self._generation_checked = now
+        return self._generation
+
+    async def invalidate(self) -> int:
+        """Start a new generation, orphaning every cached search result."""
+        self._generation = await self.redis.incr(f"{self.prefix}:generation")
+        self._generation_checked = time.monotonic()
+        return self._generation
+
+    async def _results_key(self, query: str, top_k: int) -> str:
+        return f"{self.prefix}:results:{await self.generation()}:{top_k}:{_digest(query)}"
+
+    def _embedding_key(self, text: str) -> str:
+        return f"{self.prefix}:embedding:{settings.EMBEDDING_MODEL}:{_digest(text)}"
+
+    async def get_results(self, query: str, top_k: int) -> Optional[List[Dict[str, Any]]]:
+        """Cached search results for a query, or None."""
+        try:
+            blob = await self.redis.get(await self._results_key(query, top_k))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Retrieval cache read failed: {e}")
+            return None
+
+        if blob is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return json.loads(blob)
+
+    async def put_results(self, query: str, top_k: int, results: List[Dict[str, Any]]) -> None:
+        """Cache search results for the current generation."""
+        try:
+            blob = json.dumps(results, default=str, separators=(",", ":"))
+            await self.redis.set(await self._results_key(query, top_k), blob, ex=self.ttl)
+            self.stats["stored"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Retrieval cache write failed: {e}")
+
+    async def get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """A cached query embedding, or None."""
+        try:
+            blob = await self.redis.get(self._embedding_key(text))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+
+        if blob is None:
+            self.stats["embedding_misses"] += 1
+            return None
+        self.stats["embedding_hits"] += 1
+        # Copy: callers may modify it, and buffers from Redis are read-only
+        return np.frombuffer(base64.b64decode(blob), dtype=np.float32).copy()
+
+    async def put_embeddings(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """Cache query embeddings in one round trip."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for text, embedding in zip(texts, embeddings):
+                pipe.set(
+                    self._embedding_key(text),
+                    base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()),
+                    ex=settings.RETRIEVAL_CACHE_EMBEDDING_TTL
+                )
+            await pipe.execute()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    async def save_warmup_report(self, report: Dict[str, Any]) -> None:
+        """Keep the latest warm-up report for the status endpoint."""
+        await self.redis.set(f"{self.prefix}:warmup", json.dumps(report, default=str))
+
+    async def status(self) -> Dict[str, Any]:
+        """This process's counters, the current generation and the latest warm-up report."""
+        report = await self.redis.get(f"{self.prefix}:warmup")
+        return {
+            **self.stats,
+            "generation": await self.generation(),
+            "last_warmup": json.loads(report) if report else None
+        }
\ No newline at end of file
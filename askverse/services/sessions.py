@@ -0,0 +1,238 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+import zlib
+
+import numpy as np
+import redis.asyncio as aioredis
+from redis.exceptions import LockError
+from langchain.prompts import ChatPromptTemplate
+
+from ..config.settings import settings
+from ..core.registry import get_embedding_model, get_llm, get_query_embedder
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def _pack_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode()
+
+
+def _unpack_vectors(packed: List[str]) -> np.ndarray:
+    return np.stack([np.frombuffer(base64.b64decode(vector), dtype=np.float16) for vector in packed]).astype(np.float32)
+
+
+class SessionStore:
+    """Server-side conversation sessions in Redis.
+
+    A session keeps the latest turns verbatim and folds older ones into a
+    running summary once the turns exceed ``token_budget``. Document chunks
+    retrieved for earlier answers are kept with their embeddings, so a
+    follow-up is answered from re-ranked cached candidates when enough of them
+    are close to it; recent API results are kept for the prompt. Sessions are
+    stored as compressed JSON and expire ``ttl`` seconds after the last turn.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: Optional[int] = None, token_budget: Optional[int] = None):
+        self.redis = aioredis.Redis.from_url(redis_url or str(settings.REDIS_URL))
+        self.ttl = ttl or settings.SESSION_TTL
+        self.token_budget = token_budget or settings.SESSION_TOKEN_BUDGET
+
+        self.summary_prompt = ChatPromptTemplate.from_messages([
+            ("system", "You maintain a running summary of a conversation between a user and an assistant."),
+            ("user", "Update the summary with the new exchanges. Keep names, systems, environments and "
+                     "decisions the user may refer back to. Stay under {max_tokens} tokens."
+                     "\n\nCurrent summary: {summary}"
+                     "\n\nNew exchanges:\n{turns}"
+                     "\n\nUpdated summary:")
+        ])
+
+        self.stats = {"reused": 0, "searched": 0, "summaries": 0}
+
+    def _key(self, session_id: str) -> str:
+        return f"{settings.SESSION_PREFIX}:{session_id}"
+
+    async def create(self, user_id: int) -> Dict[str, Any]:
+        """Start an empty session."""
+        now = time.time()
+        session = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+            "summary": "",
+            "turns": [],
+            "candidates": [],
+            "api_results": []
+        }
+        await self.save(session)
+        return session
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """A session, or None when unknown or expired."""
+        blob = await self.redis.get(self._key(session_id))
+        if blob is None:
+            return None
+        return json.loads(zlib.decompress(blob))
+
+    async def save(self, session: Dict[str, Any]) -> None:
+        """Store a session and restart its expiry."""
+        blob = zlib.compress(json.dumps(session, default=str, separators=(",", ":")).encode())
+        await self.redis.set(self._key(session["id"]), blob, ex=self.ttl)
+
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+        await self.redis.delete(self._key(session_id))
+
+    def context(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Conversation state to pass to the orchestrator, bounded by the token budget."""
+        return {
+            "conversation": {
+                "summary": session["summary"],
+                "recent_turns": [{"query": turn["query"], "response": turn["response"]} for turn in session["turns"]]
+            },
+            "previous_api_results": session["api_results"]
+        }
+
+    async def reuse(self, session: Dict[str, Any], query: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached document chunks relevant to a follow-up, as vector search results.
+
+        Candidates are re-ranked against the follow-up together with the
+        previous question, since follow-ups often leave the subject implicit.
+        Returns None, meaning a fresh search is needed, unless at least
+        ``SESSION_REUSE_MIN_CANDIDATES`` reach ``SESSION_REUSE_MIN_SIMILARITY``.
+        """
+        candidates = session["candidates"]
+        if not candidates:
+            return None
+
+        previous = session["turns"][-1]["query"] if session["turns"] else ""
+        query_embedding = await get_query_embedder().encode(f"{previous} {query}".strip())
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+        # Not in place: the array is the query embedder's cached copy
+        query_embedding = query_embedding / max(float(np.linalg.norm(query_embedding)), 1e-12)
+
+        embeddings = _unpack_vectors([candidate["embedding"] for candidate in candidates])
+        embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        scores = embeddings @ query_embedding
+
+        ranked = [
+            (float(scores[i]), candidates[i])
+            for i in np.argsort(-scores)
+            if scores[i] >= settings.SESSION_REUSE_MIN_SIMILARITY
+        ][:settings.DOCUMENT_CONTEXT_LIMIT]
+        if len(ranked) < min(settings.SESSION_REUSE_MIN_CANDIDATES, len(candidates)):
+            self.stats["searched"] += 1
+            return None
+
+        self.stats["reused"] += 1
+        return [
+            {"id": candidate["id"], "score": score, "metadata": candidate["metadata"]}
+            for score, candidate in ranked
+        ]
+
+    async def record_turn(self, session_id: str, query: str, result: Dict[str, Any]) -> None:
+        """Add a finished turn and what it retrieved, summarising older turns when over budget.
+
+        Runs under a per-session Redis lock, so turns of concurrent queries in
+        one session, possibly in different server workers, are all kept.
+        """
+        lock = self.redis.lock(
+            f"{self._key(session_id)}:lock",
+            timeout=settings.SESSION_LOCK_TIMEOUT,
+            blocking_timeout=settings.SESSION_LOCK_WAIT
+        )
+        try:
+            async with lock:
+                await self._record_turn(session_id, query, result)
+        except LockError as e:
+            logger.warning(f"Error locking session {session_id} to record a turn: {e}")
+
+    async def _record_turn(self, session_id: str, query: str, result: Dict[str, Any]) -> None:
+        """Load, extend and save a session; the caller holds its lock."""
+        session = await self.get(session_id)
+        if session is None:
+            return
+
+        session["turns"].append({"query": query, "response": result.get("response") or "", "at": time.time()})
+        documents, api_results = [], []
+        for sub_task in result.get("sub_tasks", []):
+            documents.extend(sub_task["response"].get("documents", []))
+            api_results.extend(sub_task["response"].get("api_responses", []))
+
+        await self._add_candidates(session, documents)
+        self._add_api_results(session, api_results)
+        await self._compact(session)
+        session["updated_at"] = time.time()
+        await self.save(session)
+
+    async def _add_candidates(self, session: Dict[str, Any], documents: List[Dict[str, Any]]) -> None:
+        """Keep indexed chunks used for an answer, with embeddings for re-ranking."""
+        known = {candidate["id"] for candidate in session["candidates"]}
+        new = [doc for doc in documents if doc.get("id") and doc.get("content") and doc["id"] not in known]
+        if new:
+            loop = asyncio.get_running_loop()
+            embeddings = await loop.run_in_executor(
+                None,
+                lambda: get_embedding_model().encode([doc["content"] for doc in new], batch_size=32)
+            )
+            for doc, embedding in zip(new, embeddings):
+                session["candidates"].append({
+                    "id": doc["id"],
+                    "metadata": {"title": doc.get("title", ""), "url": doc.get("url", "")},
+                    "embedding": _pack_vector(embedding)
+                })
+
+        # Oldest candidates go first
+        del session["candidates"][:-settings.SESSION_MAX_CANDIDATES]
+
+    def _add_api_results(self, session: Dict[str, Any], api_results: List[Dict[str, Any]]) -> None:
+        """Keep the latest API results, truncated, for follow-up prompts."""
+        for api_result in api_results:
+            endpoint = api_result["endpoint"]
+            session["api_results"].append({
+                "endpoint": f"{endpoint['method']} {endpoint['url']}",
+                "response": json.dumps(api_result["response"], default=str)[:settings.SESSION_API_RESULT_CHARS],
+                "at": time.time()
+            })
+        del session["api_results"][:-settings.SESSION_MAX_API_RESULTS]
+
+    async def _compact(self, session: Dict[str, Any]) -> None:
+        """Fold the oldest turns into the summary until the rest fit half the token budget.
+
+        The summary gets the other half.
+        """
+        turns = session["turns"]
+        sizes = [count_tokens(turn["query"]) + count_tokens(turn["response"]) for turn in turns]
+        if sum(sizes) + count_tokens(session["summary"]) <= self.token_budget:
+            return
+
+        # Always keep the latest turn verbatim
+        folded = 0
+        while folded < len(turns) - 1 and sum(sizes[folded:]) > self.token_budget // 2:
+            folded += 1
+        if not folded:
+            return
+
+        exchanges = "\n".join(f"User: {turn['query']}\nAssistant: {turn['response']}" for turn in turns[:folded])
+        try:
+            summary = await (self.summary_prompt | get_llm()).ainvoke({
+                "summary": session["summary"] or "(none)",
+                "turns": exchanges,
+                "max_tokens": self.token_budget // 2
+            })
+            session["summary"] = summary.content.strip()
+            self.stats["summaries"] += 1
+        except Exception as e:
+            # Keep the budget regardless; the folded turns are lost from the summary
+            logger.warning(f"Error summarising session {session['id']}: {e}")
+        del turns[:folded]
+
+    def status(self) -> Dict[str, Any]:
+        """Reuse and summarisation counters."""
+        return dict(self.stats)
\ No newline at end of file
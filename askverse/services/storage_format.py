@@ -0,0 +1,133 @@
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+# Tags whose content is never text
+SKIPPED_TAGS = {"script", "style", "ac:parameter", "ri:attachment", "ac:image"}
+
+# Macros rendering navigation or external content rather than page text
+DROPPED_MACROS = {
+    "toc", "children", "jira", "jiraissues", "attachments", "recently-updated", "contentbylabel",
+    "pagetree", "pagetreesearch", "livesearch", "gallery", "include", "excerpt-include",
+    "blog-posts", "create-from-template", "profile", "roadmap", "status", "anchor"
+}
+
+BLOCK_TAGS = {
+    "p", "div", "br", "pre", "blockquote", "hr", "ul", "ol", "table", "tbody", "thead",
+    "section", "ac:rich-text-body", "ac:plain-text-body", "ac:task", "ac:layout-cell"
+}
+# Tags separating text inside a table cell, which is kept on one line
+CELL_BREAK_TAGS = {"p", "br", "li", "div"}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+MACRO_TAG = "ac:structured-macro"
+
+
+class StorageFormatExtractor(HTMLParser):
+    """Streaming text extractor for Confluence storage format.
+
+    Keeps headings as ``#`` lines, list items as ``-`` lines and table rows as
+    ``|``-separated cells so chunking can follow the page structure; drops
+    scripts, styles and navigation macros.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._current: List[str] = []
+        self._prefix = ""
+        self._skip: List[str] = []
+        # Open rows and cells, innermost last, so nested tables keep the outer ones intact
+        self._rows: List[List[str]] = []
+        self._cells: List[List[str]] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._skip:
+            if tag == self._skip[-1]:
+                self._skip.append(tag)
+            return
+
+        if tag in SKIPPED_TAGS:
+            self._skip.append(tag)
+        elif tag == MACRO_TAG:
+            if dict(attrs).get("ac:name", "") in DROPPED_MACROS:
+                self._skip.append(tag)
+            else:
+                self._flush()
+        elif tag == "tr":
+            self._flush()
+            self._rows.append([])
+        elif tag in ["td", "th"]:
+            self._cells.append([])
+        elif self._cells and tag in CELL_BREAK_TAGS:
+            self._cells[-1].append(" ")
+        elif tag in HEADING_TAGS:
+            self._flush()
+            self._prefix = "#" * HEADING_TAGS[tag] + " "
+        elif tag == "li":
+            self._flush()
+            self._prefix = "- "
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip:
+            if tag == self._skip[-1]:
+                self._skip.pop()
+            return
+
+        if tag in ["td", "th"] and self._cells:
+            cell = " ".join("".join(self._cells.pop()).split())
+            if self._rows:
+                self._rows[-1].append(cell)
+        elif tag == "tr" and self._rows:
+            row = self._rows.pop()
+            if any(row):
+                self.lines.append(" | ".join(row))
+        elif self._cells and tag in CELL_BREAK_TAGS:
+            self._cells[-1].append(" ")
+        elif tag in HEADING_TAGS or tag == "li" or tag in BLOCK_TAGS or tag == MACRO_TAG:
+            self._flush()
+            if tag in HEADING_TAGS or tag == "li":
+                self._prefix = ""
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._cells:
+            self._cells[-1].append(data)
+        else:
+            self._current.append(data)
+
+    def unknown_decl(self, data: str) -> None:
+        # Code macros wrap their body in CDATA
+        if data.startswith("CDATA["):
+            self.handle_data(data[len("CDATA["):])
+
+    def _flush(self) -> None:
+        """Finish the current line, collapsing whitespace."""
+        text = " ".join("".join(self._current).split())
+        self._current = []
+        if text:
+            self.lines.append(self._prefix + text)
+            self._prefix = ""
+
+    def text(self) -> str:
+        """Extracted text, one structural line per line."""
+        self._flush()
+        return "\n".join(self.lines)
+
+
+def storage_to_text(html: str) -> str:
+    """Extract structured text from a Confluence storage-format page."""
+    extractor = StorageFormatExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+def extract_texts(pages: List[str], executor: Optional[ProcessPoolExecutor] = None, chunksize: int = 8) -> List[str]:
+    """Extract text from many pages, in a process pool when one is given."""
+    if executor is None or len(pages) < 2:
+        return [storage_to_text(page) for page in pages]
+    return list(executor.map(storage_to_text, pages, chunksize=chunksize))
\ No newline at end of file
@@ -0,0 +1,12 @@
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken missing or its encoding files unavailable
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in a text, estimated from its length when tiktoken is unavailable."""
+    if _encoding is None:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text))
\ No newline at end of file
@@ -1,53 +1,85 @@
 from typing import List, Dict, Any
-import pinecone
-from sentence_transformers import SentenceTransformer
+import asyncio
 import numpy as np
 
 from ..config.settings import settings
+from ..core.registry import get_embedding_model, get_vector_index, get_query_embedder, get_content_store, get_retrieval_cache
+from .hedging import LatencyTracker, hedged
 
 class VectorStore:
     def __init__(self):
-        # Initialize Pinecone
-        pinecone.init(
-            api_key=settings.PINECONE_API_KEY,
-            environment=settings.PINECONE_ENVIRONMENT
-        )
+        # Index query latencies, for hedging slow queries
+        self.query_latency = LatencyTracker()
+    
+    @property
+    def index(self):
+        """Shared Pinecone index, connected on first use."""
+        return get_vector_index()
+    
+    @property
+    def model(self):
+        """Shared sentence transformer, loaded on first use."""
+        return get_embedding_model()
+    
+    @property
+    def content_store(self):
+        """Shared local store holding document text."""
+        return get_content_store()
+    
+    def chunk_ids(self, document_id: str, chunk_count: int) -> List[str]:
+        """Vector ids of a document's chunks."""
+        return [f"{document_id}#{i}" for i in range(chunk_count)]
+    
+    def chunk_document(self, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split a document into overlapping chunks, one vector each."""
+        content = doc.get("content", "")
+        size = settings.SYNC_CHUNK_SIZE
+        overlap = settings.SYNC_CHUNK_OVERLAP
         
-        # Get or create index
-        if settings.PINECONE_INDEX not in pinecone.list_indexes():
-            pinecone.create_index(
-                name=settings.PINECONE_INDEX,
-                dimension=768,  # Default dimension for sentence-transformers
-                metric="cosine"
-            )
+        # Cut at line breaks (headings, table rows, paragraphs) where possible
+        texts = []
+        start = 0
+        while True:
+            end = min(start + size, len(content))
+            if end < len(content):
+                newline = content.rfind("\n", start + overlap + 1, end)
+                if newline != -1:
+                    end = newline
+            texts.append(content[start:end])
+            if end >= len(content):
+                break
+            start = max(end - overlap, start + 1)
         
-        self.index = pinecone.Index(settings.PINECONE_INDEX)
+        # Prepare metadata; text lives in the content store
+        metadata = {
+            "doc_id": doc["id"],
+            "source_type": doc.get("source_type", ""),
+            "source_id": doc.get("source_id", ""),
+            "title": doc.get("title", ""),
+            "url": doc.get("url", ""),
+            "last_updated": doc.get("last_updated", "")
+        }
         
-        # Initialize sentence transformer
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        return [
+            {"id": chunk_id, "content": text, "metadata": {**metadata, "chunk": i}}
+            for i, (chunk_id, text) in enumerate(zip(self.chunk_ids(doc["id"], len(texts)), texts))
+        ]
     
-    def upsert_documents(self, documents: List[Dict[str, Any]]) -> None:
-        """Upsert documents to the vector store."""
-        vectors = []
-        for doc in documents:
-            # Generate embedding
-            embedding = self.model.encode(doc["content"]).tolist()
-            
-            # Prepare metadata
-            metadata = {
-                "content": doc["content"],
-                "source_type": doc["source_type"],
-                "source_id": doc["source_id"],
-                "title": doc.get("title", ""),
-                "url": doc.get("url", ""),
-                "last_updated": doc.get("last_updated", "")
-            }
-            
-            vectors.append({
-                "id": doc["id"],
-                "values": embedding,
-                "metadata": metadata
-            })
+    def embed_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+        """Embed chunks in one batched pass, setting their vector values."""
+        embeddings = self.model.encode([chunk["content"] for chunk in chunks], batch_size=32)
+        for chunk, embedding in zip(chunks, embeddings):
+            chunk["values"] = embedding.tolist()
+    
+    def upsert_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+        """Store embedded chunks: text in the content store, vectors in Pinecone."""
+        # Store text before vectors so search hits always resolve
+        self.content_store.put_many({chunk["id"]: chunk["content"] for chunk in chunks})
+        
+        vectors = [
+            {"id": chunk["id"], "values": chunk["values"], "metadata": chunk["metadata"]}
+            for chunk in chunks
+        ]
         
         # Upsert in batches
         batch_size = 100
@@ -55,12 +87,49 @@ class VectorStore:
             batch = vectors[i:i + batch_size]
             self.index.upsert(vectors=batch)
     
+    def upsert_documents(self, documents: List[Dict[str, Any]]) -> None:
+        """Upsert documents to the vector store."""
+        chunks = [chunk for doc in documents for chunk in self.chunk_document(doc)]
+        if not chunks:
+            return
+        
+        self.embed_chunks(chunks)
+        self.upsert_chunks(chunks)
+    
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar documents."""
         # Generate query embedding
         query_embedding = self.model.encode(query).tolist()
         
-        # Search in Pinecone
+        return self._query_index(query_embedding, top_k)
+    
+    async def asearch(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Search for similar documents, batching the query embedding with concurrent searches.
+        
+        Index queries slower than the usual tail are hedged with a second
+        request. Results are shared through the retrieval cache until the
+        next sync.
+        """
+        cache = get_retrieval_cache() if settings.RETRIEVAL_CACHE_ENABLED else None
+        if cache is not None:
+            cached = await cache.get_results(query, top_k)
+            if cached is not None:
+                return cached
+        
+        query_embedding = (await get_query_embedder().encode(query)).tolist()
+        
+        # Pinecone's client is blocking; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        results = await hedged(
+            lambda: loop.run_in_executor(None, self._query_index, query_embedding, top_k),
+            self.query_latency
+        )
+        if cache is not None:
+            await cache.put_results(query, top_k, results)
+        return results
+    
+    def _query_index(self, query_embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+        """Query Pinecone with an embedding and format the matches."""
         results = self.index.query(
             vector=query_embedding,
             top_k=top_k,
@@ -78,18 +147,39 @@ class VectorStore:
         
         return formatted_results
     
+    def fetch_contents(self, results: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Fetch document text for search results by id."""
+        contents = self.content_store.get_many([result["id"] for result in results])
+        
+        # Vectors written before the content store kept text in metadata
+        for result in results:
+            if result["id"] not in contents and "content" in (result["metadata"] or {}):
+                contents[result["id"]] = result["metadata"]["content"]
+        
+        return contents
+    
     def delete_documents(self, document_ids: List[str]) -> None:
-        """Delete documents from the vector store."""
-        self.index.delete(ids=document_ids)
+        """Delete documents from the vector store, in batches of ids."""
+        batch_size = settings.VECTOR_DELETE_BATCH_SIZE
+        for i in range(0, len(document_ids), batch_size):
+            self.index.delete(ids=document_ids[i:i + batch_size])
+        self.content_store.delete(document_ids)
     
-    def update_document(self, document_id: str, content: str, metadata: Dict[str, Any]) -> None:
-        """Update a document in the vector store."""
-        # Generate new embedding
-        embedding = self.model.encode(content).tolist()
-        
-        # Update in Pinecone
-        self.index.upsert(vectors=[{
-            "id": document_id,
-            "values": embedding,
-            "metadata": metadata
-        }]) 
\ No newline at end of file
+    def update_document(
+        self,
+        document_id: str,
+        content: str,
+        metadata: Dict[str, Any],
+        previous_chunk_count: int = 0
+    ) -> int:
+        """Update a document in the vector store, returning its new chunk count."""
+        chunks = self.chunk_document({**metadata, "id": document_id, "content": content})
+        self.embed_chunks(chunks)
+        self.upsert_chunks(chunks)
+        
+        # Drop chunks left over from a longer previous version
+        stale_ids = self.chunk_ids(document_id, previous_chunk_count)[len(chunks):]
+        if stale_ids:
+            self.delete_documents(stale_ids)
+        
+        return len(chunks) 
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Production server: gunicorn pre-forking uvicorn workers after preloading shared models.
+
+    gunicorn -c gunicorn.conf.py askverse.main:app    (or: python run.py --production)
+
+The app and the read-only resources in SERVER_PRELOAD are built once in the
+master, so forked workers share their memory pages copy-on-write. ONNX Runtime
+is not fork-safe, so with EMBEDDING_BACKEND=onnx each worker builds its own
+embedding model after the fork instead.
+
+Signals to the master (pid in SERVER_PIDFILE):
+    HUP   replace workers one set at a time; in-flight queries finish first
+    USR2  start a new master on new code next to the old one; then send
+          WINCH to the old master to drain its workers and QUIT to stop it
+    TERM  graceful shutdown
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+import sys
+
+from askverse.config.settings import settings
+
+# Must be set before prometheus_client is first imported (by the preloaded app).
+# The directory is cleared once per master, not again on HUP.
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    shutil.rmtree(settings.PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.PROMETHEUS_MULTIPROC_DIR
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+bind = f"{settings.API_HOST}:{settings.API_PORT}"
+workers = settings.SERVER_WORKERS or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+timeout = settings.SERVER_TIMEOUT
+keepalive = settings.SERVER_KEEPALIVE
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS // 10
+pidfile = settings.SERVER_PIDFILE
+accesslog = "-"
+
+
+# Resources that must not be built before forking, per embedding backend
+FORK_UNSAFE = {"onnx": ["embedding_model"]}
+
+
+def _preloaded():
+    """SERVER_PRELOAD without the resources that are unsafe to fork for the configured backend."""
+    unsafe = FORK_UNSAFE.get(settings.EMBEDDING_BACKEND, [])
+    return [name for name in settings.SERVER_PRELOAD if name not in unsafe]
+
+
+def on_starting(server):
+    """Build shared read-only resources in the master, after the app is preloaded."""
+    from askverse.core.registry import registry
+    registry.warm_up(_preloaded())
+
+    # Keep the collector from touching (and so copying) preloaded objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Split CPU threads between workers and build the resources unsafe to fork.
+
+    ONNX sessions (and their thread pools) are created here, in each worker;
+    size them with EMBEDDING_ONNX_THREADS.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(max(1, multiprocessing.cpu_count() // server.num_workers))
+
+    unsafe = [name for name in settings.SERVER_PRELOAD if name not in _preloaded()]
+    if unsafe:
+        from askverse.core.registry import registry
+        registry.warm_up(unsafe)
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the shared metrics."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
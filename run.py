@@ -1,10 +1,27 @@
+import argparse
+import os
+
 import uvicorn
-from askverse.main import app
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Run the AskVerse API")
+    parser.add_argument("--production", action="store_true", help="Pre-forked workers with preloaded models (gunicorn.conf.py)")
+    parser.add_argument("--workers", type=int, help="Worker processes in production mode")
+    args = parser.parse_args()
+
+    if args.production:
+        # Exec so gunicorn is the process receiving HUP/USR2/TERM for graceful restarts
+        argv = ["gunicorn", "-c", os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")]
+        if args.workers:
+            argv += ["--workers", str(args.workers)]
+        os.execvp("gunicorn", argv + ["askverse.main:app"])
+
     uvicorn.run(
         "askverse.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True
-    ) 
\ No newline at end of file
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import multiprocessing
+
+from askverse.services.content_store import ContentStore
+
+WRITERS = 2
+BATCHES = 50
+BATCH_SIZE = 20
+
+
+def _text(writer: int, batch: int, item: int) -> str:
+    # Varying lengths, so misplaced offsets cannot decode by accident
+    return f"writer {writer} batch {batch} item {item} " * (1 + (batch * 7 + item) % 40)
+
+
+def _write(path: str, writer: int, barrier) -> None:
+    store = ContentStore(path, codec="zlib")
+    barrier.wait()
+    for batch in range(BATCHES):
+        store.put_many({
+            f"{writer}-{batch}-{item}": _text(writer, batch, item)
+            for item in range(BATCH_SIZE)
+        })
+
+
+def test_put_many_round_trip(tmp_path):
+    store = ContentStore(str(tmp_path), codec="zlib")
+    store.put_many({"a": "first", "b": "second"})
+    store.put("a", "replaced")
+    store.delete(["b"])
+
+    assert store.get_many(["a", "b", "c"]) == {"a": "replaced"}
+    assert "b" not in store
+
+
+def test_concurrent_put_many_from_two_processes(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(WRITERS)
+    processes = [
+        context.Process(target=_write, args=(str(tmp_path), writer, barrier))
+        for writer in range(WRITERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    store = ContentStore(str(tmp_path), codec="zlib")
+    expected = {
+        f"{writer}-{batch}-{item}": _text(writer, batch, item)
+        for writer in range(WRITERS)
+        for batch in range(BATCHES)
+        for item in range(BATCH_SIZE)
+    }
+    assert store.get_many(expected) == expected
\ No newline at end of file
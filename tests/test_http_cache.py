@@ -0,0 +1,69 @@
+import httpx
+
+from askverse.services.http_cache import HTTPResponseCache
+
+URL = "https://api.example.com/items"
+
+
+def _client(cache_control: str, requests: list) -> httpx.Client:
+    """A client whose upstream answers 304 to a matching If-None-Match."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        headers = {"Cache-Control": cache_control, "ETag": '"v1"'}
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, json={"items": [1, 2]})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def _cache() -> HTTPResponseCache:
+    cache = HTTPResponseCache()
+    cache._redis = None  # memory tier only
+    return cache
+
+
+def _age(cache: HTTPResponseCache, seconds: float) -> None:
+    entry = cache._entries[cache.make_key("GET", URL, None)]
+    entry["stored_at"] -= seconds
+
+
+def test_no_cache_revalidates_every_hit():
+    cache, requests = _cache(), []
+    client = _client("no-cache", requests)
+
+    assert cache.request(client, "GET", URL) == {"items": [1, 2]}
+    assert cache.request(client, "GET", URL) == {"items": [1, 2]}
+
+    assert len(requests) == 2
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    assert cache.stats["stale_hits"] == 0
+    assert cache.stats["revalidated"] == 1
+
+
+def test_must_revalidate_is_not_served_stale():
+    cache, requests = _cache(), []
+    client = _client("max-age=60, must-revalidate", requests)
+
+    cache.request(client, "GET", URL)
+    cache.request(client, "GET", URL)
+    assert len(requests) == 1  # fresh hit
+
+    _age(cache, 61)
+    assert cache.request(client, "GET", URL) == {"items": [1, 2]}
+
+    assert len(requests) == 2
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    assert cache.stats["stale_hits"] == 0
+    assert cache.stats["revalidated"] == 1
+
+
+def test_stale_while_revalidate_serves_stale_without_directives():
+    cache, requests = _cache(), []
+    client = _client("max-age=60", requests)
+
+    cache.request(client, "GET", URL)
+    _age(cache, 61)
+    assert cache.request(client, "GET", URL) == {"items": [1, 2]}
+
+    assert cache.stats["stale_hits"] == 1
\ No newline at end of file
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from askverse.api import webhooks
+from askverse.config.settings import settings
+from askverse.services.reindex_queue import ReindexQueue, REMOVE, UPDATE
+
+SECRET = "webhook-secret"
+
+
+class FakeIndexer:
+    """Records calls and tracks how many passes run on each page at once."""
+
+    def __init__(self):
+        self.calls = []
+        self.running = {}
+        self.max_running = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def _run(self, action: str, page_id: str) -> dict:
+        self.running[page_id] = self.running.get(page_id, 0) + 1
+        self.max_running = max(self.max_running, self.running[page_id])
+        try:
+            await self.release.wait()
+            self.calls.append((action, page_id))
+            return {"page_id": page_id}
+        finally:
+            self.running[page_id] -= 1
+
+    async def reindex_page(self, page_id: str) -> dict:
+        return await self._run(UPDATE, page_id)
+
+    async def remove_page(self, page_id: str) -> dict:
+        return await self._run(REMOVE, page_id)
+
+
+async def _until(condition, timeout: float = 2.0) -> None:
+    """Yield to the workers until the condition holds."""
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_is_reindexed_once():
+    indexer = FakeIndexer()
+    queue = ReindexQueue(lambda: indexer, coalesce_seconds=0, workers=2)
+    try:
+        for _ in range(3):
+            assert queue.submit("1")
+        await _until(lambda: queue.stats["processed"] == 1)
+        await asyncio.sleep(0.05)
+
+        assert indexer.calls == [(UPDATE, "1")]
+        assert queue.stats["coalesced"] == 2
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_latest_action_wins():
+    indexer = FakeIndexer()
+    queue = ReindexQueue(lambda: indexer, coalesce_seconds=0, workers=1)
+    try:
+        queue.submit("1", UPDATE)
+        queue.submit("1", REMOVE)
+        await _until(lambda: queue.stats["processed"] == 1)
+
+        assert indexer.calls == [(REMOVE, "1")]
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_page_is_never_reindexed_by_two_workers_at_once():
+    indexer = FakeIndexer()
+    indexer.release.clear()
+    queue = ReindexQueue(lambda: indexer, coalesce_seconds=0, workers=2)
+    try:
+        queue.submit("1")
+        await _until(lambda: indexer.running.get("1") == 1)
+
+        # Changed while being reindexed: one more pass, after the first one
+        queue.submit("1")
+        await asyncio.sleep(0.05)
+        assert indexer.max_running == 1
+        assert queue.status()["pending"] == 1
+
+        indexer.release.set()
+        await _until(lambda: queue.stats["processed"] == 2)
+        assert indexer.calls == [(UPDATE, "1"), (UPDATE, "1")]
+        assert indexer.max_running == 1
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_when_indexer_factory_fails(monkeypatch):
+    monkeypatch.setattr(settings, "REINDEX_RETRY_SECONDS", 0)
+    indexer = FakeIndexer()
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return indexer
+
+    queue = ReindexQueue(factory, coalesce_seconds=0, workers=1)
+    try:
+        queue.submit("1")
+        await _until(lambda: queue.stats["processed"] == 1)
+
+        assert queue.stats["indexer_errors"] == 1
+        assert indexer.calls == [(UPDATE, "1")]
+    finally:
+        await queue.stop()
+
+
+class FakeQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, page_id: str, action: str = UPDATE) -> bool:
+        self.submitted.append((page_id, action))
+        return True
+
+
+@pytest.fixture
+def webhook_client(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_WEBHOOK_SECRET", SECRET)
+    queue = FakeQueue()
+    monkeypatch.setattr(webhooks, "get_reindex_queue", lambda: queue)
+
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    return TestClient(app), queue
+
+
+def _body(event: str = "page_updated") -> bytes:
+    return json.dumps({"event": event, "page": {"id": 42}}).encode()
+
+
+def _signature(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_signed_event_is_queued(webhook_client):
+    client, queue = webhook_client
+    body = _body()
+
+    response = client.post(
+        "/webhooks/confluence",
+        content=body,
+        headers={"Content-Type": "application/json", "X-Hub-Signature": _signature(body)}
+    )
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert queue.submitted == [("42", UPDATE)]
+
+
+def test_signature_over_another_body_is_rejected(webhook_client):
+    client, queue = webhook_client
+
+    response = client.post(
+        "/webhooks/confluence",
+        content=_body("page_removed"),
+        headers={"Content-Type": "application/json", "X-Hub-Signature": _signature(_body())}
+    )
+
+    assert response.status_code == 401
+    assert queue.submitted == []
+
+
+def test_signature_with_wrong_secret_is_rejected(webhook_client):
+    client, queue = webhook_client
+    body = _body()
+
+    response = client.post(
+        "/webhooks/confluence",
+        content=body,
+        headers={"Content-Type": "application/json", "X-Hub-Signature": _signature(body, "other")}
+    )
+
+    assert response.status_code == 401
+    assert queue.submitted == []
+
+
+def test_unsigned_event_is_rejected(webhook_client):
+    client, queue = webhook_client
+
+    response = client.post("/webhooks/confluence", content=_body(), headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 401
+    assert queue.submitted == []
+
+
+def test_shared_secret_header_is_accepted(webhook_client):
+    client, queue = webhook_client
+
+    response = client.post(
+        "/webhooks/confluence",
+        content=_body(),
+        headers={"Content-Type": "application/json", "X-Webhook-Secret": SECRET}
+    )
+
+    assert response.status_code == 202
+    assert queue.submitted == [("42", UPDATE)]
+
+
+def test_webhook_is_disabled_without_secret(webhook_client, monkeypatch):
+    client, queue = webhook_client
+    monkeypatch.setattr(settings, "CONFLUENCE_WEBHOOK_SECRET", None)
+    body = _body()
+
+    response = client.post(
+        "/webhooks/confluence",
+        content=body,
+        headers={"Content-Type": "application/json", "X-Hub-Signature": _signature(body)}
+    )
+
+    assert response.status_code == 503
+    assert queue.submitted == []
\ No newline at end of file
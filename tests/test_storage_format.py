@@ -0,0 +1,14 @@
+import pytest
+
+from askverse.benchmarks.html_extraction import FIXTURES
+from askverse.services.storage_format import storage_to_text
+
+
+@pytest.mark.parametrize("html, expected", FIXTURES)
+def test_fixtures(html, expected):
+    assert storage_to_text(html) == expected
+
+
+def test_link_text_is_kept():
+    html = '<p>See <ac:link><ri:page ri:content-title="Setup"/><ac:link-body>the setup guide</ac:link-body></ac:link>.</p>'
+    assert storage_to_text(html) == "See the setup guide."
\ No newline at end of file